@@ -0,0 +1,65 @@
+# ============================================================================
+# AUTOSAVE - Penulis data di background thread
+# ============================================================================
+# Perintah di REPL cuma menandai pet sebagai "dirty". Thread ini yang nulis
+# ke disk: setiap AUTOSAVE_INTERVAL detik, atau lebih cepat kalau jumlah pet
+# dirty sudah mencapai AUTOSAVE_THRESHOLD. Jadi latency perintah nggak
+# tergantung kecepatan disk, dan kalau crash paling banyak hilang satu interval.
+
+import os
+import threading
+
+# Default bisa diubah lewat env PET_AUTOSAVE_INTERVAL / PET_AUTOSAVE_THRESHOLD.
+# Interval 0 = autosave background mati (simpan langsung tiap perintah seperti dulu).
+AUTOSAVE_INTERVAL = float(os.environ.get("PET_AUTOSAVE_INTERVAL", "2.0"))
+AUTOSAVE_THRESHOLD = int(os.environ.get("PET_AUTOSAVE_THRESHOLD", "100"))
+
+
+class AutoSaver:
+    """
+    Thread yang memanggil manager.save_data() secara berkala.
+    """
+
+    def __init__(self, manager, interval=AUTOSAVE_INTERVAL, threshold=AUTOSAVE_THRESHOLD):
+        self.manager = manager
+        self.interval = interval
+        self.threshold = threshold
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="pet-autosave", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def notify(self, dirty_count):
+        """
+        Dipanggil setelah ada perubahan; bangunkan writer kalau dirty sudah banyak.
+        """
+        if dirty_count >= self.threshold:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stop:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if self._stop:
+                break
+            self._flush()
+
+    def _flush(self):
+        try:
+            self.manager.save_data()
+        except Exception as e:
+            # Perubahan yang gagal ditulis tetap dirty, dicoba lagi di interval berikutnya
+            self.manager.ui.say(f"Autosave failed: {e}", "red")
+
+    def stop(self):
+        """
+        Hentikan thread lalu flush terakhir (dipanggil saat exit / Ctrl+C).
+        """
+        self._stop = True
+        self._wake.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.manager.save_data()
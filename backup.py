@@ -0,0 +1,310 @@
+# ============================================================================
+# BACKUP - Backup incremental (content-addressed) + cek integritas
+# ============================================================================
+# Backup store pet_data.json disimpan di folder pet_data.json.backups/:
+#
+#   chunks/ab/abcd...          isi satu bucket pet (zlib), nama file = sha256 isinya
+#   manifests/00000012.json    satu backup: hash chunk tiap bucket + info
+#
+# Pet dibagi ke bucket berdasarkan crc32(nama) % jumlah bucket (sekitar
+# BUCKET_PETS pet per bucket). Backup incremental cuma menulis ulang bucket
+# yang isinya berubah sejak backup terakhir (PetManager mencatat nama pet yang
+# berubah), bucket lain dipakai ulang dari manifest sebelumnya. Chunk yang
+# isinya sama persis punya hash sama, jadi nggak pernah ditulis dua kali.
+# Biaya backup ikut jumlah pet yang berubah, bukan besar roster.
+#
+# Satu baris chunk = satu pet: "crc32<TAB>nama JSON<TAB>stat JSON\n", urut nama.
+# sha256 per chunk + crc32 per record -> verify cukup hitung checksum, tanpa
+# parse JSON sama sekali.
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections import Counter
+
+import formats
+from locking import FileLock
+
+# Detik antar backup otomatis (dicek setiap selesai save), 0 = mati.
+# Backup juga dibuat saat program ditutup kalau ada yang berubah.
+BACKUP_INTERVAL = float(os.environ.get("PET_BACKUP_INTERVAL", 300))
+
+# Jumlah backup (manifest) yang disimpan; chunk yang nggak dipakai lagi ikut dihapus
+BACKUP_KEEP = int(os.environ.get("PET_BACKUP_KEEP", 10))
+
+# Target jumlah pet per bucket. Kalau roster tumbuh / menyusut jauh dari target
+# (lebih dari REBUCKET_RATIO kali), backup berikutnya dibuat penuh dengan
+# jumlah bucket baru.
+BUCKET_PETS = 256
+MIN_BUCKETS = 16
+REBUCKET_RATIO = 4
+
+
+class BackupError(RuntimeError):
+    """
+    Backup nggak bisa dibaca: manifest / chunk hilang atau checksum-nya salah.
+    """
+
+
+def backup_dir(path):
+    # pet_data.json -> pet_data.json.backups (pet_data.db punya folder sendiri)
+    return path + ".backups"
+
+
+def encode_records(rows):
+    """
+    {key: record} bytes untuk BackupStore.write dari (nama, attrs). attrs None = pet dihapus.
+    """
+    dumps = formats.dumps_json
+    return {
+        dumps(name): None if attrs is None else dumps(attrs if type(attrs) is dict else dict(attrs))
+        for name, attrs in rows
+    }
+
+
+def bucket_count(pets):
+    # Pangkat dua terkecil yang bikin isi bucket <= BUCKET_PETS
+    count = MIN_BUCKETS
+    while count * BUCKET_PETS < pets:
+        count *= 2
+    return count
+
+
+def wants_full(manifest):
+    """
+    True kalau jumlah bucket manifest ini sudah jauh dari ukuran roster-nya
+    (backup berikutnya sebaiknya penuh biar bucket dibagi ulang).
+    """
+    best = bucket_count(manifest["pets"])
+    return max(best, manifest["buckets"]) > REBUCKET_RATIO * min(best, manifest["buckets"])
+
+
+def _bucket(key, buckets):
+    return zlib.crc32(key) % buckets
+
+
+class BackupStore:
+    """
+    Satu folder backup (lihat atas). Penulisan dikunci FileLock, jadi beberapa
+    proses yang pakai store yang sama boleh backup ke folder yang sama.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.chunk_dir = os.path.join(folder, "chunks")
+        self.manifest_dir = os.path.join(folder, "manifests")
+        self.lock = FileLock(os.path.join(folder, "backup.lock"))
+
+    # ========================================================================
+    # MANIFEST
+    # ========================================================================
+
+    def sequences(self):
+        # Nomor semua manifest, urut dari yang paling lama
+        try:
+            names = os.listdir(self.manifest_dir)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[:-5]) for name in names if name.endswith(".json") and name[:-5].isdigit())
+
+    def _manifest_path(self, seq):
+        return os.path.join(self.manifest_dir, f"{seq:08d}.json")
+
+    def manifest(self, seq):
+        try:
+            with open(self._manifest_path(seq), "rb") as f:
+                manifest = json.loads(f.read())
+        except (OSError, ValueError) as e:
+            raise BackupError(f"backup #{seq} is unreadable: {e}") from None
+        if len(manifest.get("chunks", ())) != manifest.get("buckets"):
+            raise BackupError(f"backup #{seq} is incomplete")
+        return manifest
+
+    def latest(self):
+        """
+        Manifest terbaru, atau None kalau belum ada backup.
+        """
+        sequences = self.sequences()
+        return self.manifest(sequences[-1]) if sequences else None
+
+    # ========================================================================
+    # CHUNK
+    # ========================================================================
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def _put(self, group, rewritten=None):
+        """
+        Tulis isi satu bucket {key: record} sebagai chunk. Return (hash, ditulis?):
+        chunk yang sudah ada (isi sama persis) nggak ditulis lagi. Backup penuh
+        kasih set `rewritten`: chunk lama tetap ditulis ulang sekali (yang rusak
+        ikut diganti), hash-nya dicatat di set itu.
+        """
+        crc32 = zlib.crc32
+        bodies = [key + b"\t" + record for key, record in sorted(group.items())]
+        content = b"".join([b"%08x\t%s\n" % (crc32(body), body) for body in bodies])
+        digest = hashlib.sha256(content).hexdigest()
+        path = self._chunk_path(digest)
+        if (rewritten is None or digest in rewritten) and os.path.exists(path):
+            return digest, False
+        if rewritten is not None:
+            rewritten.add(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Tanpa fsync per chunk (ribuan file di backup penuh). Kalau chunk hilang
+        # karena crash, manifest-nya gagal verify & restore pakai backup sebelumnya.
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(zlib.compress(content, 1))
+        os.replace(tmp, path)
+        return digest, True
+
+    def read_chunk(self, digest):
+        """
+        Isi chunk {key: record} setelah sha256 & crc32 tiap record dicek.
+        Lempar BackupError kalau chunk hilang / rusak.
+        """
+        try:
+            with open(self._chunk_path(digest), "rb") as f:
+                content = zlib.decompress(f.read())
+        except (OSError, zlib.error) as e:
+            raise BackupError(f"chunk {digest[:12]} is unreadable: {e}") from None
+        if hashlib.sha256(content).hexdigest() != digest:
+            raise BackupError(f"chunk {digest[:12]} does not match its checksum")
+        group = {}
+        for number, line in enumerate(content.splitlines(), 1):
+            parts = line.split(b"\t", 2)
+            if len(parts) != 3 or parts[0] != b"%08x" % zlib.crc32(parts[1] + b"\t" + parts[2]):
+                raise BackupError(f"chunk {digest[:12]} record {number} is corrupt")
+            group[parts[1]] = parts[2]
+        return group
+
+    # ========================================================================
+    # BACKUP, VERIFY, RESTORE
+    # ========================================================================
+
+    def write(self, records, full):
+        """
+        Buat backup baru. records: {key: record / None} dari encode_records.
+        full=True -> records = seluruh roster (bucket dibagi ulang, semua chunk ditulis ulang).
+        full=False -> records = pet yang berubah sejak backup terakhir, ditumpuk
+        di atas manifest terbaru; lempar BackupError kalau manifest / chunk
+        dasarnya rusak (backup berikutnya harus penuh).
+        Return manifest baru, dengan "written" = jumlah chunk yang benar-benar ditulis.
+        """
+        os.makedirs(self.manifest_dir, exist_ok=True)
+        with self.lock:
+            sequences = self.sequences()
+            if full:
+                buckets = bucket_count(len(records))
+                groups = [{} for _ in range(buckets)]
+                for key, record in records.items():
+                    if record is not None:
+                        groups[_bucket(key, buckets)][key] = record
+                pets = sum(map(len, groups))
+                chunks = [None] * buckets
+                touched = dict(enumerate(groups))
+            else:
+                if not sequences:
+                    raise BackupError("no previous backup")
+                base = self.manifest(sequences[-1])
+                buckets, pets, chunks = base["buckets"], base["pets"], list(base["chunks"])
+                touched = {}
+                for key, record in records.items():
+                    touched.setdefault(_bucket(key, buckets), {})[key] = record
+
+            written = 0
+            rewritten = set() if full else None
+            for bucket, changes in touched.items():
+                if full:
+                    group = changes
+                else:
+                    group = self.read_chunk(chunks[bucket])
+                    pets -= len(group)
+                    for key, record in changes.items():
+                        if record is None:
+                            group.pop(key, None)
+                        else:
+                            group[key] = record
+                    pets += len(group)
+                chunks[bucket], new = self._put(group, rewritten)
+                written += new
+
+            seq = sequences[-1] + 1 if sequences else 1
+            manifest = {
+                "seq": seq, "created": time.time(), "full": full,
+                "pets": pets, "buckets": buckets, "written": written, "chunks": chunks,
+            }
+            path = self._manifest_path(seq)
+            with open(path + ".tmp", "wb") as f:
+                f.write(json.dumps(manifest).encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(path + ".tmp", path)
+            self._prune(sequences + [seq])
+        return manifest
+
+    def _prune(self, sequences):
+        # Buang manifest lama (lebih dari BACKUP_KEEP) & chunk yang sudah nggak dipakai
+        old = sequences[:-BACKUP_KEEP] if BACKUP_KEEP > 0 else []
+        if not old:
+            return
+        for seq in old:
+            os.remove(self._manifest_path(seq))
+        used = set()
+        for seq in sequences[len(old):]:
+            try:
+                used.update(self.manifest(seq)["chunks"])
+            except BackupError:
+                return  # nggak tahu chunk mana yang dipakai -> jangan hapus apa pun
+        for prefix in os.listdir(self.chunk_dir):
+            folder = os.path.join(self.chunk_dir, prefix)
+            for digest in os.listdir(folder):
+                if digest not in used:
+                    os.remove(os.path.join(folder, digest))
+
+    def verify(self, seq=None):
+        """
+        Cek satu backup (default terbaru) tanpa parse JSON: manifest, sha256 tiap
+        chunk & crc32 tiap record. Return (manifest, list masalah).
+        Lempar BackupError kalau manifest-nya sendiri nggak bisa dibaca.
+        """
+        manifest = self.manifest(self.sequences()[-1] if seq is None else seq)
+        problems = []
+        pets = 0
+        # Bucket kosong semua menunjuk chunk (kosong) yang sama -> tiap chunk dicek sekali
+        for digest, uses in Counter(manifest["chunks"]).items():
+            try:
+                pets += len(self.read_chunk(digest)) * uses
+            except BackupError as e:
+                problems.append(str(e))
+        if not problems and pets != manifest["pets"]:
+            problems.append(f"backup #{manifest['seq']} holds {pets:,} pets, expected {manifest['pets']:,}")
+        return manifest, problems
+
+    def load(self, manifest):
+        """
+        Isi roster {nama: attrs} dari satu backup. Lempar BackupError kalau rusak.
+        """
+        data = {}
+        for digest in dict.fromkeys(manifest["chunks"]):
+            for key, record in self.read_chunk(digest).items():
+                data[formats.loads_json(key)] = formats.loads_json(record)
+        if len(data) != manifest["pets"]:
+            raise BackupError(f"backup #{manifest['seq']} holds {len(data):,} pets, expected {manifest['pets']:,}")
+        return data
+
+    def restore_latest(self):
+        """
+        Backup terbaru yang masih utuh: (manifest, data), atau None kalau nggak ada.
+        Backup yang rusak dilewati (dicoba yang lebih lama).
+        """
+        for seq in reversed(self.sequences()):
+            try:
+                manifest = self.manifest(seq)
+                return manifest, self.load(manifest)
+            except (BackupError, ValueError):
+                continue
+        return None
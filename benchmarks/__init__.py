@@ -0,0 +1,4 @@
+"""
+Kumpulan benchmark Virtual Pet CLI.
+Jalankan dari root project, misal: python -m benchmarks.bench_memory
+"""
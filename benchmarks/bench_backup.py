@@ -0,0 +1,75 @@
+# ============================================================================
+# BENCHMARK BACKUP - backup penuh vs incremental, verify & restore
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_backup [--pets 1000000] [--changes 1,100,10000]
+# Roster sintetis di-backup penuh sekali, lalu untuk tiap jumlah perubahan N:
+# N pet diubah, backup incremental diukur (durasi & chunk yang ditulis).
+# Backup incremental harusnya ikut N, bukan besar roster. Terakhir diukur
+# verify (checksum semua chunk) & restore (baca + parse backup terbaru).
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from backup import BackupStore
+from benchmarks.bench_memory import make_pet
+from data_handler import JsonStorage
+from pet_manager import PetManager
+from ui import HeadlessUI
+
+DEFAULT_PETS = 1_000_000
+DEFAULT_CHANGES = "1,100,10000"
+
+
+def folder_size(path):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure full vs incremental backups, verify and restore.")
+    parser.add_argument("--pets", type=int, default=DEFAULT_PETS)
+    parser.add_argument("--changes", default=DEFAULT_CHANGES, help="comma-separated pet counts to change")
+    args = parser.parse_args(argv)
+    changes = [int(count) for count in args.changes.split(",")]
+
+    folder = tempfile.mkdtemp(prefix="pet-backup-")
+    try:
+        manager = PetManager(storage=JsonStorage(os.path.join(folder, "pets.json")), ui=HeadlessUI(sys.stdout))
+        manager.autosave = False
+        manager.data.update((f"pet{i}", make_pet(i)) for i in range(args.pets))
+
+        elapsed, manifest = timed(lambda: manager.backup_data(full=True))
+        backups = manager.backups
+        print(f"{args.pets:,} pets | full backup {elapsed:6.2f} s | {manifest['buckets']:,} chunks | "
+              f"{folder_size(backups.folder) / 2**20:.1f} MB")
+
+        names = list(manager.data)
+        for count in changes:
+            for name in names[:count]:
+                manager.apply_action("feed", name)
+            before = folder_size(backups.folder)
+            elapsed, manifest = timed(manager.backup_data)
+            print(f"{count:>9,} changed | incremental {elapsed * 1000:8.1f} ms | "
+                  f"{manifest['written']:,} chunks written | +{(folder_size(backups.folder) - before) / 2**10:,.0f} KB")
+
+        elapsed, (_, problems) = timed(backups.verify)
+        print(f"   verify: {elapsed:6.2f} s ({len(problems)} problems)")
+        elapsed, (_, data) = timed(BackupStore(backups.folder).restore_latest)
+        assert data == {name: dict(attrs) for name, attrs in manager.data.items()}
+        print(f"  restore: {elapsed:6.2f} s")
+        manager.storage.close()
+    finally:
+        shutil.rmtree(folder)
+
+
+if __name__ == "__main__":
+    main()
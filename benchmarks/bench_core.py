@@ -0,0 +1,192 @@
+# ============================================================================
+# BENCHMARK CORE - jalur utama PetManager & storage, hasil disimpan ke JSON
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_core [--sizes 10,1000,100000,1000000]
+#                                           [--json hasil.json] [--compare baseline.json]
+# Untuk setiap ukuran roster (dibuat sintetis, disimpan ke folder temporary):
+#   load     : PetManager.__init__ (baca snapshot + journal)
+#   create/rename/delete, feed/play/sleep/heal : rata-rata per perintah, tanpa
+#              animasi (HeadlessUI), autosave per perintah seperti mode biasa
+#   list / stats : render semua pet ke os.devnull
+#   save_full / save_incremental : save_data(full=True) & save journal 100 pet
+# Hasil (detik per operasi) ditulis ke JSON. --compare membandingkan dengan
+# file JSON lama dan exit code 1 kalau ada yang lebih lambat dari --tolerance.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_memory import build_dict
+from data_handler import JsonStorage
+from pet_manager import PetManager
+from ui import HeadlessUI
+
+DEFAULT_SIZES = (10, 1_000, 100_000, 1_000_000)
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Jumlah perintah per pengukuran operasi kecil (create, feed, ...)
+OPS = 100
+# Pengukuran diulang sekian kali, diambil yang tercepat
+REPEAT = 3
+# Lebih lambat dari baseline x (1 + tolerance) = regresi
+DEFAULT_TOLERANCE = 0.2
+
+INTERACTIONS = ("feed", "play", "sleep", "heal")
+
+
+def best_of(func, repeat=REPEAT):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_roster(path, n):
+    """
+    Tulis snapshot sintetis n pet (format default) ke path.
+    """
+    storage = JsonStorage(path)
+    storage.save(build_dict(n))
+    storage.close()
+
+
+def bench_size(n, folder, out):
+    """
+    Semua pengukuran untuk satu ukuran roster.
+    Return (dict operasi -> detik per operasi, True kalau snapshot dibaca lazy).
+    """
+    path = os.path.join(folder, f"pets_{n}.json")
+    write_roster(path, n)
+    open_manager = lambda: PetManager(storage=JsonStorage(path), ui=HeadlessUI(out))
+
+    timings = {}
+    timings["load"] = best_of(lambda: open_manager().storage.close())
+
+    # Satu putaran create -> rename -> interaksi -> delete per batch OPS pet,
+    # diulang REPEAT kali; per operasi diambil putaran tercepat
+    manager = open_manager()
+    for _ in range(REPEAT):
+        names = [f"bench{i}" for i in range(OPS)]
+        renamed = [name + "_r" for name in names]
+        steps = [
+            ("create", lambda: [manager.create_pet(name) for name in names]),
+            ("rename", lambda: [manager.rename(old, new) for old, new in zip(names, renamed)]),
+            ("select", lambda: manager.select_pet(renamed[0])),
+        ]
+        for action in INTERACTIONS:
+            interact = getattr(manager, action)
+            steps.append((action, lambda interact=interact: [interact() for _ in range(OPS)]))
+        steps.append(("delete", lambda: [manager.delete(name, confirm=True) for name in renamed]))
+
+        for op, func in steps:
+            start = time.perf_counter()
+            func()
+            elapsed = (time.perf_counter() - start) / OPS
+            if op != "select":
+                timings[op] = min(timings.get(op, elapsed), elapsed)
+
+    timings["list"] = best_of(manager.list_pets)
+    timings["stats"] = best_of(manager.stats_all)
+    timings["save_full"] = best_of(lambda: manager.save_data(full=True))
+
+    # Save journal: 100 pet berubah tanpa autosave, lalu satu save_data()
+    manager.autosave = False
+    dirty = [name for name, _ in zip(manager.data, range(OPS))]
+    def save_incremental():
+        for name in dirty:
+            manager.apply_action("feed", name)
+        manager.save_data()
+    timings["save_incremental"] = best_of(save_incremental)
+    lazy = manager.storage.lazy
+    manager.close()
+    return timings, lazy
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """
+    Bandingkan dengan hasil lama. Return list (ukuran, operasi, lama, baru) yang regresi.
+    """
+    regressions = []
+    print(f"\nvs baseline {baseline['meta'].get('commit') or '?'} ({baseline['meta'].get('date')})")
+    for size, timings in results["results"].items():
+        old_timings = baseline["results"].get(size, {})
+        for op, new in timings.items():
+            old = old_timings.get(op)
+            if not old:
+                continue
+            ratio = new / old
+            flag = "  <-- slower" if ratio > 1 + tolerance else ""
+            print(f"{int(size):>10,} | {op:>16} | {ratio:>6.2f}x{flag}")
+            if flag:
+                regressions.append((size, op, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time PetManager hot paths and storage.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated roster sizes")
+    parser.add_argument("--json", help="where to write results (default: benchmarks/results/core-<time>.json)")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before flagging a regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    results = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "ops": OPS,
+            "repeat": REPEAT,
+        },
+        "results": {},
+        # Roster besar otomatis dibaca lazy (lihat data_handler.LAZY_LOAD_BYTES)
+        "lazy": {},
+    }
+    print(f"{'pets':>10} | {'operation':>16} | {'time/op':>10}")
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        for n in sizes:
+            with tempfile.TemporaryDirectory(prefix="pet-core-") as folder:
+                timings, lazy = bench_size(n, folder, devnull)
+            results["results"][str(n)] = timings
+            results["lazy"][str(n)] = lazy
+            for op, seconds in timings.items():
+                print(f"{n:>10,} | {op:>16} | {seconds * 1000:>7.3f} ms")
+
+    path = args.json
+    if path is None:
+        os.makedirs(DEFAULT_RESULTS_DIR, exist_ok=True)
+        path = os.path.join(DEFAULT_RESULTS_DIR, f"core-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
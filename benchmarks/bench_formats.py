@@ -0,0 +1,61 @@
+# ============================================================================
+# BENCHMARK FORMAT SNAPSHOT - waktu save/load & ukuran file per format
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_formats [jumlah_pet]   (default 100k)
+# Save = encode + tulis + fsync (JsonStorage.save penuh), load = baca + decode.
+# "json" diukur dua kali: pakai modul json bawaan dan pakai orjson (kalau ada).
+
+import os
+import sys
+import tempfile
+import time
+
+import formats
+from data_handler import JsonStorage
+from benchmarks.bench_memory import build_dict
+
+DEFAULT_PETS = 100_000
+REPEAT = 3
+
+
+def best_of(func, repeat=REPEAT):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(data, fmt, folder):
+    path = os.path.join(folder, f"pets_{fmt}.json")
+    storage = JsonStorage(path, fmt=fmt)
+    save_time = best_of(lambda: storage.save(data))
+    storage.close()
+    load_time = best_of(lambda: JsonStorage(path).load())
+    return save_time, load_time, os.path.getsize(path)
+
+
+def main(n):
+    data = build_dict(n)
+    orjson = formats.orjson
+    runs = [("json-pretty", "json-pretty", None), ("json", "json (stdlib)", None)]
+    if orjson is not None:
+        runs.append(("json", "json (orjson)", orjson))
+    runs += [(fmt, fmt, orjson) for fmt in ("msgpack", "struct") if fmt in formats.available_formats()]
+
+    print(f"{n:,} pets")
+    print(f"{'format':>14} | {'save':>9} | {'load':>9} | {'size':>9}")
+    with tempfile.TemporaryDirectory(prefix="pet-formats-") as folder:
+        for fmt, label, engine in runs:
+            formats.orjson = engine  # pilih engine JSON untuk baris ini
+            try:
+                save_time, load_time, size = measure(data, fmt, folder)
+            finally:
+                formats.orjson = orjson
+            print(f"{label:>14} | {save_time * 1000:>6.0f} ms | {load_time * 1000:>6.0f} ms | "
+                  f"{size / 2**20:>6.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PETS)
@@ -0,0 +1,67 @@
+# ============================================================================
+# BENCHMARK MEMORI - dict-of-dicts vs PetTable
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_memory [jumlah_pet ...]
+# Default membandingkan 10k, 100k dan 1M pet.
+
+import sys
+import gc
+import tracemalloc
+
+from pet_table import PetTable
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+def make_pet(i):
+    # Stat dibuat sedikit bervariasi biar int-nya nggak semua dari cache small-int
+    return {
+        "hunger": i % 101,
+        "energy": (i * 7) % 101,
+        "happy": (i * 13) % 101,
+        "health": 100 - i % 50,
+        "level": 1 + i % 300,
+        "exp": (i * 3) % 100,
+    }
+
+
+def build_dict(n):
+    return {f"pet{i}": make_pet(i) for i in range(n)}
+
+
+def build_table(n):
+    table = PetTable()
+    for i in range(n):
+        table[f"pet{i}"] = make_pet(i)
+    return table
+
+
+def measure(builder, n):
+    """
+    Ukur memori yang masih dipakai struktur hasil builder(n), dalam byte.
+    """
+    gc.collect()
+    tracemalloc.start()
+    obj = builder(n)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    gc.collect()
+    return current
+
+
+def main(sizes):
+    print(f"{'pets':>10} | {'dict-of-dicts':>14} | {'PetTable':>14} | {'B/pet dict':>10} | {'B/pet table':>11} | ratio")
+    for n in sizes:
+        dict_bytes = measure(build_dict, n)
+        table_bytes = measure(build_table, n)
+        print(
+            f"{n:>10,} | {dict_bytes / 2**20:>11.1f} MB | {table_bytes / 2**20:>11.1f} MB | "
+            f"{dict_bytes / n:>10.0f} | {table_bytes / n:>11.0f} | {dict_bytes / table_bytes:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    main(sizes)
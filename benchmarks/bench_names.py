@@ -0,0 +1,94 @@
+# ============================================================================
+# BENCHMARK NAMES - index nama (prefix, "did you mean", update per pet)
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_names [--pets 1000000] [--queries 200]
+# Roster sintetis: setengah "petN", setengah gabungan suku kata acak (biar
+# banyak nama mirip). Yang diukur:
+#   - build   : bangun NameIndex dari nol (sekali, saat pertama dipakai)
+#   - prefix  : 'select mi*' (count_prefix + 5 nama pertama)
+#   - suggest : "did you mean" untuk nama salah ketik (1-2 huruf beda)
+#   - touch   : update index saat pet dibuat / dihapus
+
+import argparse
+import gc
+import random
+import time
+
+from benchmarks.bench_tenants import percentile
+from name_index import NameIndex, SUGGEST_LIMIT
+
+DEFAULT_PETS = 1_000_000
+DEFAULT_QUERIES = 200
+SYLLABLES = ("ma", "mi", "mo", "ww", "ow", "ko", "ci", "pu", "ra", "li", "na", "bo", "ta", "ku")
+
+
+def build_names(count, rng):
+    names = {f"pet{i}" for i in range(count // 2)}
+    while len(names) < count:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return names
+
+
+def typo(name, rng):
+    # Satu atau dua huruf diganti / dihapus / disisipkan
+    for _ in range(rng.randint(1, 2)):
+        i = rng.randrange(len(name))
+        kind = rng.randrange(3)
+        char = rng.choice("abcdefghijklmnopqrstuvwxyz0123456789")
+        if kind == 0:
+            name = name[:i] + char + name[i + 1:]
+        elif kind == 1 and len(name) > 1:
+            name = name[:i] + name[i + 1:]
+        else:
+            name = name[:i] + char + name[i:]
+    return name
+
+
+def measure(samples, fn, args):
+    # GC dimatikan selama diukur (seperti timeit): satu full collection di atas
+    # roster 1M nama ~100 ms, itu biaya roster-nya, bukan biaya lookup
+    gc.disable()
+    try:
+        for arg in args:
+            start = time.perf_counter()
+            fn(arg)
+            samples.append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure prefix / did-you-mean lookups on the name index.")
+    parser.add_argument("--pets", type=int, default=DEFAULT_PETS)
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    data = build_names(args.pets, rng)
+    pool = sorted(data)
+    index = NameIndex()
+    start = time.perf_counter()
+    index.ensure(data)
+    build = time.perf_counter() - start
+
+    picks = [rng.choice(pool) for _ in range(args.queries)]
+    timings = {"prefix": [], "suggest": [], "touch": []}
+    measure(timings["prefix"], lambda name: (index.count_prefix(name[:2]), index.prefix(name[:2], SUGGEST_LIMIT)), picks)
+    measure(timings["suggest"], index.suggest, [typo(name, rng) for name in picks])
+
+    def create_and_delete(name):
+        data.add(name)
+        index.touch(data, name)
+        data.discard(name)
+        index.touch(data, name)
+
+    measure(timings["touch"], create_and_delete, [f"new{name}" for name in picks])
+
+    print(f"{args.pets:,} names | build {build * 1000:.0f} ms")
+    for label, samples in timings.items():
+        print(f"{label:>8}: p50 {percentile(samples, 0.5) * 1000:8.3f} ms | "
+              f"p99 {percentile(samples, 0.99) * 1000:8.3f} ms | max {max(samples) * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
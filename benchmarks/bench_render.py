@@ -0,0 +1,66 @@
+# ============================================================================
+# BENCHMARK RENDER - waktu 'stats' untuk banyak pet, versi lama vs baru
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_render [jumlah_pet]   (default 100k)
+# Output ditulis ke os.devnull lewat stream colorama (seperti stdout setelah
+# init(autoreset=True)), jadi yang diukur murni biaya render + write.
+#   - lama : progress_bar disusun ulang tiap panggilan + satu print per baris
+#   - baru : bar dari tabel cache + buffer, ditulis per chunk (PetManager.stats_all)
+
+import os
+import sys
+import tempfile
+import time
+
+from colorama import AnsiToWin32
+
+from benchmarks.bench_memory import build_dict
+from data_handler import JsonStorage
+from pet_manager import PetManager, MAX_STAT
+from ui import ConsoleUI, HeadlessUI
+
+DEFAULT_PETS = 100_000
+
+
+def legacy_progress_bar(value, length=20):
+    # Versi sebelum cache: string disusun tiap kali dipanggil
+    value = max(0, min(MAX_STAT, int(value)))
+    filled = int((value / MAX_STAT) * length)
+    empty = length - filled
+    return "[" + "█" * filled + "░" * empty + f"] {value}%"
+
+
+def legacy_stats(data, ui):
+    # Versi sebelum render buffer: satu ui.say (print) per baris
+    ui.say("📊 All Pets Summary", "magenta")
+    for pet, attrs in data.items():
+        ui.say(f"\n{pet} — Lv {attrs.get('level',1)} | EXP {attrs.get('exp',0)}/100", "magenta")
+        ui.say("  Hunger : " + legacy_progress_bar(attrs['hunger']))
+        ui.say("  Energy : " + legacy_progress_bar(attrs['energy']))
+        ui.say("  Happy  : " + legacy_progress_bar(attrs['happy']))
+        ui.say("  Health : " + legacy_progress_bar(attrs['health']))
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(n):
+    data = build_dict(n)
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            tempfile.TemporaryDirectory(prefix="pet-render-") as folder:
+        stream = AnsiToWin32(devnull, autoreset=True).stream
+        print(f"stats for {n:,} pets")
+        for label, ui in (("console", ConsoleUI(stream)), ("headless", HeadlessUI(stream))):
+            manager = PetManager(storage=JsonStorage(os.path.join(folder, "pets.json")), ui=ui)
+            manager.data = data
+            before = timed(lambda: legacy_stats(data, ui))
+            after = timed(manager.stats_all)
+            print(f"{label:>9} | before {before * 1000:>7.0f} ms | after {after * 1000:>7.0f} ms | "
+                  f"{before / after:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PETS)
@@ -0,0 +1,109 @@
+# ============================================================================
+# BENCHMARK SERVER - latency perintah dengan banyak client sekaligus
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_server [--sessions 1000] [--commands 20]
+#                                             [--connect HOST:PORT]
+# Default: server dijalankan di proses ini (data di folder temporary), lalu
+# N client konek bersamaan; tiap client bikin pet sendiri, select, lalu kirim
+# perintah feed/status/play/sleep bergantian. Hasil: p50/p99 latency & throughput.
+# Pakai --connect untuk mengukur server yang sudah jalan (python main.py serve).
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from server import PetServer, END_OF_REPLY
+
+COMMANDS = ("feed", "status", "play", "sleep")
+
+
+async def send(reader, writer, command):
+    """
+    Kirim satu perintah & tunggu balasannya selesai. Return latency (detik).
+    """
+    start = time.perf_counter()
+    writer.write(f"{command}\n".encode("utf-8"))
+    await writer.drain()
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        if line.rstrip(b"\n").decode("utf-8") == END_OF_REPLY:
+            return time.perf_counter() - start
+
+
+async def client(host, port, index, commands, ready, go, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    name = f"bench{os.getpid()}_{index}"
+    await send(reader, writer, f"create {name}")
+    await send(reader, writer, f"select {name}")
+    ready.append(index)
+    await go.wait()  # semua client mulai barengan
+    for i in range(commands):
+        latencies.append(await send(reader, writer, COMMANDS[i % len(COMMANDS)]))
+    await send(reader, writer, f"delete {name} --yes")
+    writer.close()
+
+
+def percentile(sorted_values, p):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+async def run(sessions, commands, connect=None):
+    server = None
+    if connect:
+        host, port = connect.rsplit(":", 1)
+        port = int(port)
+    else:
+        from data_handler import JsonStorage
+        from pet_manager import PetManager
+        from ui import HeadlessUI
+
+        tmp = tempfile.mkdtemp(prefix="pet-bench-")
+        storage = JsonStorage(os.path.join(tmp, "pet_data.json"))
+        server = PetServer(PetManager(storage=storage, ui=HeadlessUI()))
+        await server.start("127.0.0.1", 0)
+        host, port = server.address[:2]
+
+    ready, latencies = [], []
+    go = asyncio.Event()
+    tasks = [
+        asyncio.create_task(client(host, port, i, commands, ready, go, latencies))
+        for i in range(sessions)
+    ]
+    while len(ready) < sessions:
+        await asyncio.sleep(0.01)
+        failed = [t for t in tasks if t.done() and t.exception()]
+        if failed:
+            raise failed[0].exception()
+
+    start = time.perf_counter()
+    go.set()
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    if server is not None:
+        await server.close()
+        server.manager.close()
+
+    latencies.sort()
+    print(f"sessions: {sessions:,} | commands: {len(latencies):,} in {elapsed:.2f}s "
+          f"({len(latencies) / elapsed:,.0f} commands/sec)")
+    print(f"latency p50: {percentile(latencies, 50) * 1000:.2f} ms | "
+          f"p99: {percentile(latencies, 99) * 1000:.2f} ms | "
+          f"max: {latencies[-1] * 1000:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the pet server")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--commands", type=int, default=20, help="commands per session")
+    parser.add_argument("--connect", help="HOST:PORT of a running server (default: in-process)")
+    args = parser.parse_args()
+    asyncio.run(run(args.sessions, args.commands, args.connect))
+
+
+if __name__ == "__main__":
+    main()
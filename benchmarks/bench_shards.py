@@ -0,0 +1,88 @@
+# ============================================================================
+# BENCHMARK SHARDS - 'tick' & 'feed --all' satu proses vs roster shard
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_shards [jumlah_pet] [--shards 2,4,8]
+# (default 200k pet, shard 2 & 4 plus jumlah core). Roster sintetis dibagi ke
+# folder temporary, lalu diukur:
+#   - tick      : tick 10 untuk semua pet
+#   - feed_all  : feed --all
+# Skalanya ikut jumlah core: di mesin 1 core, shard cuma nambah biaya IPC.
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.bench_memory import build_dict
+from data_handler import JsonStorage
+from pet_manager import PetManager
+from shard import META_FILE, ShardedManager, shard_of, shard_path
+from ui import HeadlessUI
+
+DEFAULT_PETS = 200_000
+TICKS = 10
+
+
+def write_shards(data, folder, shards):
+    """
+    Tulis roster sintetis sebagai `shards` file shard (plus shards.json).
+    """
+    parts = [{} for _ in range(shards)]
+    for name, attrs in data.items():
+        parts[shard_of(name, shards)][name] = attrs
+    os.makedirs(folder)
+    for index, part in enumerate(parts):
+        storage = JsonStorage(shard_path(folder, index))
+        storage.save(part)
+        storage.close()
+    with open(os.path.join(folder, META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"shards": shards}, f)
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def measure(manager):
+    # Tanpa autosave per perintah: yang diukur kerja world-nya, bukan disk
+    manager.autosave = False
+    return timed(lambda: manager.tick(TICKS)), timed(lambda: manager.bulk("feed"))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare world-wide commands on one process vs shards.")
+    parser.add_argument("pets", nargs="?", type=int, default=DEFAULT_PETS)
+    parser.add_argument("--shards", help="comma separated shard counts (default: 2,4 and the core count)")
+    args = parser.parse_args(argv)
+    cores = os.cpu_count() or 1
+    counts = sorted({int(n) for n in args.shards.split(",")} if args.shards else {2, 4, cores} - {1})
+
+    data = build_dict(args.pets)
+    print(f"{args.pets:,} pets, {cores} core(s), tick {TICKS} + feed --all")
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            tempfile.TemporaryDirectory(prefix="pet-shards-") as folder:
+        ui = HeadlessUI(devnull)
+        path = os.path.join(folder, "single.json")
+        storage = JsonStorage(path)
+        storage.save(data)
+        storage.close()
+        manager = PetManager(storage=JsonStorage(path), ui=ui)
+        base_tick, base_feed = measure(manager)
+        manager.storage.close()
+        print(f"{'single':>9} | tick {base_tick * 1000:>7.0f} ms | feed_all {base_feed * 1000:>7.0f} ms")
+
+        for shards in counts:
+            shard_folder = os.path.join(folder, f"shards-{shards}")
+            write_shards(data, shard_folder, shards)
+            manager = ShardedManager(shards, folder=shard_folder, ui=ui)
+            tick, feed = measure(manager)
+            manager.close()
+            print(f"{shards:>2} shards | tick {tick * 1000:>7.0f} ms | feed_all {feed * 1000:>7.0f} ms | "
+                  f"{base_tick / tick:.2f}x / {base_feed / feed:.2f}x vs single")
+
+
+if __name__ == "__main__":
+    main()
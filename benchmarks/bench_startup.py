@@ -0,0 +1,85 @@
+# ============================================================================
+# BENCHMARK STARTUP - waktu start CLI dari proses baru
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_startup [--runs 20] [--pets 1000]
+# CLI sering dipanggil dari script ribuan kali sehari, jadi yang diukur
+# waktu satu proses python dari nol sampai selesai (median & tercepat):
+#   - import      : python -c "import main" (biaya import modul saja)
+#   - run_list    : python main.py run - --quiet, isi script "list"
+#   - run_status  : select + status (load roster, satu pet dibaca)
+#   - convert     : python main.py convert json (tanpa PetManager)
+# Roster sintetis ditaruh di folder temporary (pet_data.json asli nggak disentuh).
+# Tambahkan --importtime untuk melihat modul paling lambat (python -X importtime).
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_memory import build_dict
+from data_handler import DATA_FILE, JsonStorage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+DEFAULT_RUNS = 20
+DEFAULT_PETS = 1_000
+
+# nama -> (argumen python, isi stdin)
+CASES = {
+    "import": (["-c", "import main"], ""),
+    "run_list": ([MAIN, "run", "-", "--quiet"], "list\n"),
+    "run_status": ([MAIN, "run", "-", "--quiet"], "select pet0\nstatus\n"),
+    "convert": ([MAIN, "convert", "json"], ""),
+}
+
+
+def time_case(args, stdin, folder, runs):
+    env = dict(os.environ, PYTHONPATH=ROOT, PET_AUTOSAVE_INTERVAL="0")
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], input=stdin, text=True, cwd=folder, env=env,
+                       stdout=subprocess.DEVNULL, check=True)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), min(samples)
+
+
+def import_report(folder, top=15):
+    # Modul dengan waktu import kumulatif terbesar
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=folder, env=dict(os.environ, PYTHONPATH=ROOT),
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines()[1:]:
+        _, self_us, total_us, name = (part.strip() for part in line.replace("|", ":").split(":", 3))
+        rows.append((int(total_us), int(self_us), name))
+    print(f"\n{'cumulative':>12} | {'self':>8} | module")
+    for total_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{total_us / 1000:>9.1f} ms | {self_us / 1000:>5.1f} ms | {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time CLI startup in fresh processes.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--pets", type=int, default=DEFAULT_PETS)
+    parser.add_argument("--importtime", action="store_true", help="also list the slowest imports")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="pet-startup-") as folder:
+        storage = JsonStorage(os.path.join(folder, DATA_FILE))
+        storage.save(build_dict(args.pets))
+        storage.close()
+        print(f"{args.pets:,} pets, {args.runs} runs each")
+        print(f"{'case':>12} | {'median':>9} | {'best':>9}")
+        for name, (case_args, stdin) in CASES.items():
+            median, best = time_case(case_args, stdin, folder, args.runs)
+            print(f"{name:>12} | {median * 1000:>6.1f} ms | {best * 1000:>6.1f} ms")
+        if args.importtime:
+            import_report(folder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# ============================================================================
+# BENCHMARK TENANTS - cache LRU PetManager per pemilik
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_tenants [--owners 200] [--pets 1000]
+#           [--cache 20] [--requests 5000] [--hot 0.8]
+# Roster sintetis per pemilik ditaruh di folder temporary, lalu request 'feed'
+# dikirim ke pemilik acak: `--hot` bagian request ke 10% pemilik (working set),
+# sisanya ke pemilik mana saja. Yang diukur:
+#   - hit / miss : latency request yang manager-nya sudah di cache vs harus di-load
+#   - evictions  : berapa kali manager di-flush & dibuang
+#   - memory     : perkiraan TenantCache vs memori yang benar-benar dipakai (tracemalloc)
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_memory import build_dict
+from data_handler import JsonStorage
+from tenants import TenantCache, tenant_path
+
+DEFAULT_OWNERS = 200
+DEFAULT_PETS = 1_000
+DEFAULT_CACHE = 20
+DEFAULT_REQUESTS = 5_000
+
+
+def write_owners(folder, owners, pets):
+    data = build_dict(pets)
+    for i in range(owners):
+        storage = JsonStorage(tenant_path(folder, f"owner{i}", "json"))
+        storage.save(data)
+        storage.close()
+
+
+def percentile(samples, q):
+    if not samples:
+        return 0.0
+    return sorted(samples)[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the per-owner PetManager LRU cache.")
+    parser.add_argument("--owners", type=int, default=DEFAULT_OWNERS)
+    parser.add_argument("--pets", type=int, default=DEFAULT_PETS, help="pets per owner")
+    parser.add_argument("--cache", type=int, default=DEFAULT_CACHE, help="max loaded owners")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--hot", type=float, default=0.8, help="share of requests to the hottest 10%% of owners")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    hot = max(1, args.owners // 10)
+    with tempfile.TemporaryDirectory(prefix="pet-tenants-") as folder:
+        write_owners(folder, args.owners, args.pets)
+        cache = TenantCache(folder, max_tenants=args.cache, max_bytes=2**62)
+        hits, misses = [], []
+        tracemalloc.start()
+        for _ in range(args.requests):
+            owner = rng.randrange(hot) if rng.random() < args.hot else rng.randrange(args.owners)
+            name = f"pet{rng.randrange(args.pets)}"
+            before = cache.misses
+            start = time.perf_counter()
+            with cache.use(f"owner{owner}") as manager:
+                manager.autosave = False  # disk ditulis saat evict, bukan tiap request
+                manager.apply_action("feed", name)
+            (misses if cache.misses > before else hits).append(time.perf_counter() - start)
+        traced, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        estimate = cache.bytes
+        start = time.perf_counter()
+        cache.close()
+        close_time = time.perf_counter() - start
+
+    print(f"{args.owners} owners x {args.pets:,} pets, cache {args.cache}, {args.requests:,} requests "
+          f"({args.hot:.0%} to {hot} hot owners)")
+    for label, samples in (("hit", hits), ("miss", misses)):
+        print(f"{label:>5}: {len(samples):>6,} | p50 {percentile(samples, 0.5) * 1000:8.3f} ms | "
+              f"p99 {percentile(samples, 0.99) * 1000:8.3f} ms")
+    print(f"hit rate {len(hits) / args.requests:.1%} | evictions {cache.evictions:,} | "
+          f"final flush {close_time * 1000:.1f} ms")
+    print(f"memory: estimate {estimate / 2**20:.1f} MB | traced {traced / 2**20:.1f} MB "
+          f"(mean request {statistics.mean(hits + misses) * 1000:.3f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ============================================================================
+# BENCHMARK TRANSFER - export / import roster ke CSV, Parquet & Arrow
+# ============================================================================
+# Jalankan: python -m benchmarks.bench_transfer [--pets 1000000] [--memory]
+# Roster sintetis di-export ke tiap format (Parquet/Arrow cuma kalau pyarrow
+# terpasang), lalu di-import ke PetManager kosong. Yang diukur: durasi, ukuran
+# file, dan dengan --memory puncak memori tambahan selama export / import
+# (tracemalloc, jauh lebih lambat) -- harusnya sebesar satu chunk, bukan roster.
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.bench_memory import make_pet
+from data_handler import JsonStorage
+from pet_manager import PetManager
+from transfer import TransferError, _arrow
+from ui import HeadlessUI
+
+DEFAULT_PETS = 1_000_000
+FILES = ("pets.csv", "pets.parquet", "pets.arrow")
+
+
+def open_manager(path, data=None):
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(open(os.devnull, "w")))
+    manager.autosave = False
+    manager.history.limit = 0  # import tanpa catatan undo (isi sebelum & sesudah tiap pet)
+    if data is not None:
+        manager.data.update(data)
+    return manager
+
+
+def timed(fn, memory):
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure roster export/import to CSV, Parquet and Arrow.")
+    parser.add_argument("--pets", type=int, default=DEFAULT_PETS)
+    parser.add_argument("--memory", action="store_true", help="also trace peak memory (slow)")
+    args = parser.parse_args(argv)
+
+    try:
+        _arrow()
+        files = FILES
+    except TransferError:
+        files = FILES[:1]
+        print("pyarrow not installed: only CSV is measured")
+
+    now = int(time.time())
+    data = {f"pet{i}": {**make_pet(i), "ts": now} for i in range(args.pets)}
+    with tempfile.TemporaryDirectory(prefix="pet-transfer-") as folder:
+        source = open_manager(os.path.join(folder, "source.json"), data)
+        del data
+        print(f"{args.pets:,} pets")
+        for name in files:
+            path = os.path.join(folder, name)
+            export_time, export_peak = timed(lambda: source.export_pets(path), args.memory)
+            target = open_manager(os.path.join(folder, "target.json"))
+            import_time, import_peak = timed(lambda: target.import_pets(path), args.memory)
+            assert len(target.data) == args.pets
+            target.storage.close()
+            line = (f"{os.path.splitext(name)[1]:>9}: export {export_time:6.2f} s | "
+                    f"import {import_time:6.2f} s | {os.path.getsize(path) / 2**20:7.1f} MB")
+            if args.memory:
+                line += f" | peak export {export_peak / 2**20:.1f} MB, import {import_peak / 2**20:.1f} MB"
+            print(line)
+        source.storage.close()
+
+
+if __name__ == "__main__":
+    main()
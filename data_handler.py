@@ -1,43 +1,1184 @@
-import json  # Modul 'json' dipakai untuk mengubah data Python (seperti dict, list, dsb)
-              # menjadi format JSON, dan sebaliknya. JSON ini dipakai buat nyimpen data
-              # biar bisa dibuka lagi nanti.
-
 import os    # Modul 'os' dipakai buat operasi sistem, di sini gunanya buat ngecek
               # apakah file JSON kita udah ada atau belum di penyimpanan lokal.
 
+import threading  # dipakai buat compaction di background biar REPL nggak nunggu
+import time
+import zlib
+from contextlib import nullcontext
+from collections.abc import MutableMapping
+
+import formats  # Ubah data Python <-> isi file snapshot (JSON, msgpack, struct), lihat formats.py
+import snapshot_index  # index offset pet di snapshot JSON (mode lazy)
+from locking import FileLock  # lock antar proses, biar banyak proses bisa pakai satu store
+
 # Nama file tempat data disimpan.
 DATA_FILE = "pet_data.json"
 
+# File journal (write-ahead log). Setiap perubahan pet ditulis sebagai 1 baris
+# JSON kecil di sini, jadi nggak perlu nulis ulang seluruh pet_data.json.
+JOURNAL_FILE = "pet_data.journal"
 
-def load_data():
+# Nama file default untuk backend SQLite
+SQLITE_FILE = "pet_data.db"
+
+# Kalau journal sudah berisi sebanyak ini record, journal "dilipat" (compaction)
+# ke snapshot pet_data.json di background.
+COMPACT_EVERY = 500
+
+# fsync setiap append journal: lebih lambat sedikit, tapi data aman kalau listrik mati
+JOURNAL_FSYNC = True
+
+# Jumlah pet per halaman saat backend "lazy" dibaca berurutan (list/stats)
+PAGE_SIZE = 1000
+
+# Urutan field stat setiap pet (dipakai backend yang punya kolom tetap)
+# ts = detik unix sampai kapan decay offline sudah dihitung (lihat pet_manager.decay_update)
+PET_FIELDS = ("hunger", "energy", "happy", "health", "level", "exp", "ts")
+
+# Nilai default kalau field belum ada (data lama belum punya level, exp & ts)
+PET_DEFAULTS = {"level": 1, "exp": 0, "ts": 0}
+
+# Env untuk memilih format snapshot (lihat formats.py). Kosong = ikut format file
+# yang sudah ada, atau formats.DEFAULT_FORMAT kalau file belum ada.
+FORMAT_ENV = "PET_SNAPSHOT_FORMAT"
+
+# Snapshot JSON sebesar ini (atau lebih) nggak dibaca utuh saat start, tapi
+# dibaca per pet lewat index (lihat snapshot_index.py). Env PET_LAZY=1/0 memaksa.
+LAZY_ENV = "PET_LAZY"
+LAZY_LOAD_BYTES = 8 * 2**20
+
+# Versi pet: naik setiap kali pet ditulis. Disimpan di record journal &
+# snapshot dengan key ini, di memori cuma ada di storage.versions
+# (data pet di PetManager nggak ikut bawa versi).
+VERSION_KEY = "v"
+
+
+class ConflictError(RuntimeError):
+    """
+    Pet yang mau disimpan ternyata sudah diubah proses lain sejak terakhir dibaca.
+    Nggak ada yang ditulis. remote: {nama: attrs / None} semua perubahan proses
+    lain yang baru terlihat; caller menggabungkannya ke datanya lalu save lagi.
     """
-    Fungsi ini dipakai buat *membaca* data dari file JSON.
-    Kalau file-nya belum ada atau rusak, fungsi ini bakal ngembaliin dictionary kosong.
+
+    def __init__(self, remote, names):
+        self.remote = remote
+        self.names = sorted(names)
+        shown = ", ".join(self.names[:5]) + (", ..." if len(self.names) > 5 else "")
+        super().__init__(f"{len(self.names)} pet(s) changed by another process: {shown}")
+
+
+class CorruptStoreError(RuntimeError):
     """
-    # Mengecek apakah file JSON belum ada
-    if not os.path.exists(DATA_FILE):
-        return {}  # Kalau belum ada, balikin data kosong supaya program nggak error
+    Snapshot ada tapi nggak bisa dibaca (terpotong, JSON rusak, ...) dan nggak
+    ada backup utuh untuk menggantikannya. Sengaja nggak dianggap roster
+    kosong: save berikutnya bakal menimpa file-nya dengan roster kosong.
+    """
+
+    def __init__(self, path, reason):
+        self.path = path
+        super().__init__(f"{path} is corrupt ({reason}) and no usable backup was found.")
+
+
+# ============================================================================
+# BACKEND JSON (snapshot + journal)
+# ============================================================================
+
+class JsonStorage:
+    """
+    Backend default: snapshot pet_data.json + journal append-only.
+    Seluruh roster dibaca ke memori saat load(), kecuali snapshot JSON-nya
+    besar: load() balikin LazyPetMap dan pet dibaca satu-satu lewat index.
+
+    fmt: format snapshot ("json", "json-pretty", "msgpack", "struct").
+    None -> env PET_SNAPSHOT_FORMAT, atau format file yang terdeteksi saat load().
+    lazy: True/False memaksa mode lazy, None -> env PET_LAZY atau ukuran file.
+
+    Banyak proses boleh pakai store yang sama: load & save dipegang lock file
+    "<path>.lock", dan sebelum nulis, save() membaca dulu apa yang ditulis
+    proses lain sejak terakhir kita lihat (_sync). Pet yang bentrok nggak
+    ditimpa, tapi dilempar sebagai ConflictError (optimistic concurrency).
+    """
+
+    def __init__(self, path=DATA_FILE, journal_path=None, fmt=None, lazy=None):
+        self.path = path
+        self.lazy = lazy
+        fmt = fmt or os.environ.get(FORMAT_ENV) or None
+        self.format = formats.check_format(fmt) if fmt else None
+        if journal_path is None:
+            # pet_data.json -> pet_data.journal, pets/budi.json -> pets/budi.journal
+            journal_path = os.path.splitext(path)[0] + ".journal"
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        # Lock milik pemilik data (PetManager); dipegang cuma selama data di-copy,
+        # jadi data nggak berubah di tengah copy tapi penulisan ke disk tetap di luar lock
+        self.data_lock = nullcontext()
+        self._journal_count = 0  # jumlah record di journal aktif (buat trigger compaction)
+        self._compactor = None   # thread compaction yang sedang jalan (kalau ada)
+        # Total byte yang sudah ditulis per jenis file (dibaca metrics.py)
+        self.bytes_written = {"journal": 0, "snapshot": 0}
+        # Mode lazy: jumlah pet di snapshot (dari index) & isi journal yang sudah
+        # tersimpan tapi belum dilipat ke snapshot ({nama: attrs / None kalau dihapus})
+        self._snapshot_count = 0
+        self._overlay = {}
+        # Dipegang saat baca snapshot+index, dan saat compaction menukar keduanya
+        self._snapshot_lock = threading.Lock()
+        # Lock antar proses (lihat locking.py), dipegang selama load & save
+        self.file_lock = FileLock(path + ".lock")
+        # Versi pet di disk per nama (lihat _Versions)
+        self.versions = _Versions()
+        # Posisi store yang sudah dibaca proses ini: (signature snapshot,
+        # inode journal, byte journal yang sudah dibaca). Lihat _sync.
+        self._seen = (None, None, 0)
+        # (manifest backup, path file rusak) kalau load() terpaksa restore dari backup
+        self.restored = None
+
+    @property
+    def old_journal_path(self):
+        # Journal lama hasil rotasi saat compaction sedang berjalan
+        return self.journal_path + ".old"
+
+    def _read_snapshot(self):
+        """
+        Baca snapshot utama (pet_data.json).
+        Kalau file-nya belum ada, balikin dictionary kosong.
+        Kalau rusak, lempar CorruptStoreError (load() lalu coba restore dari backup).
+        """
+        # Mengecek apakah file JSON belum ada
+        if not os.path.exists(self.path):
+            return {}  # Kalau belum ada, balikin data kosong supaya program nggak error
+
+        # Kalau file-nya ada, baca isinya sebagai bytes; formatnya ditebak dari
+        # byte pertama (JSON, msgpack, atau struct), lihat formats.decode()
+        with open(self.path, "rb") as f:
+            payload = f.read()
+        try:
+            data, fmt = formats.decode(payload)
+        except Exception as e:
+            # Isi file-nya rusak (misal JSON-nya terpotong). Jangan dianggap kosong:
+            # save berikutnya bakal menimpa semua pet dengan roster kosong
+            raise CorruptStoreError(self.path, e) from None
+        if self.format is None:
+            self.format = fmt  # save berikutnya tetap pakai format yang sama
+        return data
+
+    def _replay_journal(self, path, data, keep_deletes=False, versions=None, start=0):
+        """
+        Terapkan semua record di journal ke atas data snapshot.
+        keep_deletes=True -> pet yang dihapus dicatat sebagai None (overlay mode lazy).
+        versions: dict yang ikut di-update dengan versi tiap record.
+        start: mulai dari byte ini (record yang sudah pernah dibaca dilewati).
+        Baris terakhir yang setengah jadi (crash di tengah nulis) diabaikan dan
+        dipotong dari file, supaya append berikutnya mulai dari baris yang utuh.
+        Return jumlah record yang berhasil diterapkan.
+        """
+        if not os.path.exists(path):
+            return 0
+
+        count = 0
+        good_end = start  # posisi byte setelah record utuh terakhir
+        with open(path, "rb") as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # record terpotong (crash pas nulis)
+                try:
+                    record = formats.loads_json(line)
+                except ValueError:
+                    break  # record rusak, sisanya nggak bisa dipercaya
+                _apply_record(data, record, keep_deletes, versions)
+                good_end += len(line)
+                count += 1
+
+        if good_end < os.path.getsize(path):
+            # Buang ekor journal yang rusak
+            with open(path, "r+b") as f:
+                f.truncate(good_end)
+        return count
+
+    def _write_snapshot(self, data):
+        """
+        Tulis snapshot secara atomik: tulis ke file sementara, fsync, lalu
+        os.replace(). Kalau crash di tengah jalan, pet_data.json lama tetap utuh.
+        """
+        payload = formats.encode(data, self.format or formats.DEFAULT_FORMAT)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        with self._lock:
+            os.replace(tmp, self.path)
+            self._saw_snapshot()
+            # Index mode lazy milik snapshot lama sudah basi (dan nggak berguna
+            # untuk msgpack / struct); dibangun ulang kalau nanti dibuka lazy
+            if os.path.exists(self.path + snapshot_index.INDEX_SUFFIX):
+                os.remove(self.path + snapshot_index.INDEX_SUFFIX)
+        self.bytes_written["snapshot"] += len(payload)
+
+    def _read_store(self):
+        """
+        Baca seluruh store: snapshot + journal .old + journal.
+        Return (data, versions, jumlah record journal aktif). Dipanggil dengan _lock dipegang.
+        """
+        data = self._read_snapshot()
+        versions = _Versions.from_snapshot(data)
+        # Journal .old ada kalau program mati pas compaction; urutannya lebih dulu
+        self._replay_journal(self.old_journal_path, data, versions=versions)
+        count = self._replay_journal(self.journal_path, data, versions=versions)
+        for attrs in data.values():
+            _fill_defaults(attrs)
+        return data, versions, count
+
+    def load(self):
+        """
+        Baca data: snapshot terakhir + replay journal.
+        Memastikan setiap pet punya field level & exp (untuk backward compatibility).
+        Snapshot rusak diganti backup terakhir yang masih utuh (lihat
+        _restore_backup); kalau nggak ada, CorruptStoreError dilempar.
+        """
+        with self.file_lock:
+            try:
+                return self._load()
+            except CorruptStoreError:
+                if not self._restore_backup():
+                    raise
+            return self._load()
+
+    def _load(self):
+        if self._want_lazy():
+            return self._load_lazy()
+        
+        with self._lock:
+            data, self.versions, self._journal_count = self._read_store()
+            self._seen = self._position()
+        return data
 
-    # Kalau file-nya ada, buka file itu dalam mode "read" (r)
-    # 'encoding="utf-8"' biar karakter non-ASCII (misal nama hewan aneh) bisa kebaca
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
+    def _restore_backup(self):
+        """
+        Ganti snapshot rusak dengan backup terakhir yang masih utuh (backup.py).
+        File rusak disimpan sebagai <path>.corrupt-<waktu>; journal tetap
+        di-replay di atas backup saat load. Return True kalau berhasil.
+        """
+        import backup  # cuma dibutuhkan kalau snapshot rusak
+        
+        found = backup.BackupStore(backup.backup_dir(self.path)).restore_latest()
+        if found is None:
+            return False
+        manifest, data = found
+        corrupt = f"{self.path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+        os.replace(self.path, corrupt)
+        if self.lazy:
+            self.format = "json"  # mode lazy cuma bisa baca snapshot JSON
+        self._write_snapshot(data)
+        self.restored = (manifest, corrupt)
+        return True
+
+    def verify(self):
+        """
+        Cek integritas store tanpa mengubah apa pun.
+        Return list (bagian, ok, keterangan). Snapshot JSON yang index-nya masih
+        segar dicek lewat crc32 per record (tanpa parse JSON), selain itu di-decode.
+        """
+        results = []
+        with self.file_lock:
+            count = snapshot_index.index_count(self.path) if os.path.exists(self.path) else None
+            if not os.path.exists(self.path):
+                results.append(("snapshot", True, "no snapshot yet"))
+            elif count is not None:
+                bad = snapshot_index.verify(self.path, count)
+                shown = ", ".join(bad[:5]) + (", ..." if len(bad) > 5 else "")
+                results.append(("snapshot", not bad, f"{count:,} records checked against index checksums"
+                                + (f", {len(bad):,} corrupt: {shown}" if bad else "")))
+            else:
+                try:
+                    with open(self.path, "rb") as f:
+                        data, fmt = formats.decode(f.read())
+                    results.append(("snapshot", True, f"{len(data):,} pets decoded ({fmt})"))
+                except Exception as e:
+                    results.append(("snapshot", False, f"cannot be decoded: {e}"))
+            for path in (self.old_journal_path, self.journal_path):
+                if os.path.exists(path):
+                    results.append(_verify_journal(path))
+        return results
+
+    # ========================================================================
+    # MULTI-PROSES (sync perubahan proses lain sebelum nulis)
+    # ========================================================================
+
+    def _position(self):
+        """
+        Posisi store di disk sekarang: (signature snapshot, inode journal, ukuran journal).
+        Snapshot ditulis ulang lewat os.replace, jadi inode-nya selalu ganti.
+        """
         try:
-            # json.load() = baca isi file dan ubah dari format JSON ke Python dictionary
-            return json.load(f)
-        except Exception:
-            # Kalau isi file-nya rusak (misal format JSON-nya salah),
-            # biar program tetap jalan, kita balikin data kosong
-            return {}
+            st = os.stat(self.path)
+            snapshot = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except FileNotFoundError:
+            snapshot = None
+        try:
+            st = os.stat(self.journal_path)
+            return snapshot, st.st_ino, st.st_size
+        except FileNotFoundError:
+            return snapshot, None, 0
+
+    def _saw_snapshot(self):
+        # Snapshot baru hasil tulisan proses ini sendiri, bukan perubahan proses lain
+        self._seen = (self._position()[0],) + self._seen[1:]
+
+    def _sync(self, data):
+        """
+        Baca apa yang ditulis proses lain sejak posisi terakhir yang kita lihat.
+        Dipanggil dengan file_lock dipegang, jadi selama itu nggak ada yang nulis.
+
+        Kalau proses lain cuma append journal, cukup record barunya yang dibaca
+        (versi tiap pet ikut di-update). Kalau snapshot-nya sudah diganti
+        (compaction / save penuh proses lain), store dibaca ulang & dibandingkan
+        isinya dengan `data`.
+
+        Returns:
+            {nama: attrs / None} pet yang berubah di disk (dict kosong = nggak ada).
+        """
+        with self._lock:
+            seen = self._seen
+            now = self._position()
+            if now == seen:
+                return {}
+            snapshot, inode, end = seen
+            if now[0] == snapshot and (inode is None or now[1] == inode) and now[2] >= end:
+                remote = {}
+                self._journal_count += self._replay_journal(
+                    self.journal_path, remote, keep_deletes=True, versions=self.versions,
+                    start=end if inode is not None else 0,
+                )
+                for attrs in remote.values():
+                    if attrs is not None:
+                        _fill_defaults(attrs)
+                if self.lazy:
+                    with self._snapshot_lock:
+                        self._overlay.update(remote)
+                    # Mode lazy: pet yang nggak di-cache memang selalu dibaca dari disk
+                    remote = {name: attrs for name, attrs in remote.items() if data.holds(name)}
+            elif self.lazy:
+                old = self.versions
+                self._read_lazy()
+                remote = {}
+                for name in data.held():
+                    attrs = self.fetch(name)
+                    with self.data_lock:
+                        mine = data.peek(name)
+                    if attrs != mine or self.versions[name] != old[name]:
+                        remote[name] = attrs
+            else:
+                # Versi beda = ditulis proses lain (walau isinya kebetulan sama dengan
+                # punya kita); isi beda = diubah lewat snapshot penuh proses lain
+                old = self.versions
+                disk, self.versions, self._journal_count = self._read_store()
+                versions = self.versions
+                with self.data_lock:
+                    remote = {
+                        name: attrs for name, attrs in disk.items()
+                        if versions[name] != old[name] or data.get(name) != attrs
+                    }
+                    remote.update((name, None) for name in data if name not in disk)
+            self._seen = self._position()
+        return remote
+
+    def append_journal(self, changes):
+        """
+        Tambahkan perubahan ke journal (append-only).
+        changes: dict {nama_pet: attrs} — attrs None artinya pet dihapus.
+        """
+        lines = []
+        versions = {}
+        for name, attrs in changes.items():
+            # Versi baru = versi terakhir di disk + 1 (proses lain sudah di-sync)
+            versions[name] = self.versions[name] + 1
+            if attrs is None:
+                record = {"op": "del", "name": name, VERSION_KEY: versions[name]}
+            else:
+                record = {"op": "put", "name": name, VERSION_KEY: versions[name], "pet": dict(attrs)}
+            lines.append(formats.dumps_json(record) + b"\n")
+
+        blob = b"".join(lines)
+        with self._lock:
+            with open(self.journal_path, "ab") as f:
+                f.write(blob)
+                f.flush()
+                if JOURNAL_FSYNC:
+                    os.fsync(f.fileno())
+                # Record kita sendiri nggak perlu dibaca lagi oleh _sync
+                self._seen = (self._seen[0], os.fstat(f.fileno()).st_ino, f.tell())
+            self.versions.update(versions)
+            self._journal_count += len(lines)
+            self.bytes_written["journal"] += len(blob)
+            if self.lazy:
+                # Mode lazy: fetch() harus lihat versi yang sudah tersimpan di journal
+                with self._snapshot_lock:
+                    self._overlay.update(
+                        (name, None if attrs is None else dict(attrs))
+                        for name, attrs in changes.items()
+                    )
+
+    def compact(self, data, background=False, remote=None, bump=False):
+        """
+        Lipat journal ke snapshot baru lalu kosongkan journal.
+
+        Journal aktif di-rename jadi .old dulu (di bawah lock), jadi perubahan baru
+        tetap bisa di-append ke journal baru selama snapshot sedang ditulis.
+        remote: perubahan proses lain (hasil _sync) yang belum masuk ke `data`.
+        bump: semua pet dapat versi baru (save penuh, pet mana saja bisa berubah).
+        Lock file dipegang sampai snapshot selesai ditulis, jadi proses lain
+        nggak ikut compaction / nulis journal di tengah jalan.
+        """
+        with self.file_lock:
+            self._compact(data, background, remote or {}, bump)
+
+    def _compact(self, data, background, remote, bump):
+        old = self.old_journal_path
+        if self._compactor is not None and self._compactor.is_alive():
+            if background:
+                return  # sudah ada compaction yang jalan, nggak usah dobel
+            # Tunggu compaction sebelumnya selesai dulu (di luar _lock, thread-nya
+            # butuh _lock buat menukar snapshot)
+            self._compactor.join()
+        with self._lock:
+            if self.lazy:
+                # Mode lazy: yang dilipat cuma isi journal (overlay) ke snapshot lama,
+                # perubahan yang belum di-journal tetap nunggu save berikutnya
+                with self._snapshot_lock:
+                    folded = dict(self._overlay)
+                write = lambda: self._write_merged_snapshot(folded)
+            else:
+                # Copy data sekarang, karena REPL bisa terus ngubah data selama thread nulis
+                if bump:
+                    self.versions = self.versions.bumped()
+                # get(name, floor) = versions[name], tanpa __missing__ per pet
+                version, floor = self.versions.get, self.versions.floor
+                with self.data_lock:
+                    snapshot = {
+                        name: {**attrs, VERSION_KEY: version(name, floor)}
+                        for name, attrs in data.items()
+                    }
+                for name, attrs in remote.items():
+                    if attrs is None:
+                        snapshot.pop(name, None)
+                    else:
+                        snapshot[name] = {**attrs, VERSION_KEY: version(name, floor)}
+                write = lambda: self._write_snapshot(snapshot)
+            if os.path.exists(self.journal_path):
+                if os.path.exists(old):
+                    # Sisa .old dari crash sebelumnya belum masuk snapshot -> gabungkan
+                    with open(old, "ab") as dst, open(self.journal_path, "rb") as src:
+                        dst.write(src.read())
+                    os.remove(self.journal_path)
+                else:
+                    os.replace(self.journal_path, old)
+                self._seen = (self._seen[0], None, 0)
+            self._journal_count = 0
+
+        def run():
+            try:
+                write()
+                # Snapshot sudah aman di disk, journal lama boleh dibuang
+                if os.path.exists(old):
+                    os.remove(old)
+            finally:
+                self.file_lock.release()
+
+        # Thread compaction ikut pegang lock file sampai selesai
+        self.file_lock.acquire()
+        if background:
+            self._compactor = threading.Thread(target=run, name="pet-compactor", daemon=True)
+            self._compactor.start()
+        else:
+            run()
+
+    def save(self, data, changes=None):
+        """
+        Kalau `changes` diisi, cuma pet yang berubah yang ditulis ke journal
+        (murah, ukurannya nggak tergantung jumlah pet). Kalau journal sudah
+        panjang, compaction dijalankan di background.
+        Kalau `changes` None (atau isinya banyak banget), seluruh data ditulis
+        ulang jadi snapshot baru.
+
+        Perubahan proses lain di-sync dulu. Kalau ada pet yang mau ditulis
+        (atau, untuk save penuh, pet mana pun) sudah diubah proses lain,
+        lempar ConflictError tanpa nulis apa-apa.
+
+        Returns:
+            {nama: attrs / None} perubahan proses lain yang nggak bentrok,
+            supaya caller bisa menerapkannya ke `data`.
+        """
+        with self.file_lock:
+            if self.lazy and not isinstance(data, LazyPetMap):
+                # Roster sudah dipindah ke struktur lain (misal PetTable): simpan biasa
+                self.lazy = False
+            remote = self._sync(data)
+            if self.lazy:
+                self._save_lazy(data, changes, remote)
+                return remote
+        
+            conflicts = remote.keys() if changes is None else remote.keys() & changes.keys()
+            if conflicts:
+                raise ConflictError(remote, conflicts)
+            if changes is None or len(changes) >= COMPACT_EVERY:
+                # Perubahan sebanyak ini lebih murah langsung jadi snapshot baru
+                self.compact(data, remote=remote, bump=True)
+                return remote
+
+            if changes:
+                self.append_journal(changes)
+            if self._journal_count >= COMPACT_EVERY:
+                self.compact(data, background=True, remote=remote)
+        return remote
+
+    # ========================================================================
+    # MODE LAZY (snapshot JSON besar dibaca per pet lewat index)
+    # ========================================================================
+
+    def _want_lazy(self):
+        if self.lazy is None:
+            env = os.environ.get(LAZY_ENV, "").lower()
+            exists = os.path.exists(self.path)
+            if env in ("0", "false", "no", "off") or self.format not in (None, "json", "json-pretty"):
+                self.lazy = False
+            elif exists and not self._snapshot_is_json():
+                self.lazy = False  # msgpack / struct dibaca utuh seperti biasa
+            elif env in ("1", "true", "yes", "on"):
+                self.lazy = True
+            else:
+                self.lazy = exists and os.path.getsize(self.path) >= LAZY_LOAD_BYTES
+        return self.lazy
+
+    def _snapshot_is_json(self):
+        with open(self.path, "rb") as f:
+            return formats.detect_format(f.read(len(formats.STRUCT_MAGIC))) == "json"
+
+    def _load_lazy(self):
+        """
+        Versi load() untuk roster besar: cuma baca header index & journal.
+        Index dibangun (sekali scan) kalau belum ada atau sudah basi.
+        """
+        with self._lock:
+            self._read_lazy()
+            self._seen = self._position()
+        return LazyPetMap(self)
+
+    def _read_lazy(self):
+        # Baca ulang header index & journal (overlay). Dipanggil dengan _lock dipegang.
+        self.format = "json"  # snapshot hasil compaction lazy selalu JSON compact
+        count = 0
+        if os.path.exists(self.path):
+            count = snapshot_index.index_count(self.path)
+            if count is None:
+                try:
+                    count = snapshot_index.build_index(self.path)
+                except (ValueError, UnicodeDecodeError) as e:
+                    raise CorruptStoreError(self.path, e) from None
+
+        overlay = {}
+        versions = _Versions()
+        self._replay_journal(self.old_journal_path, overlay, keep_deletes=True, versions=versions)
+        self._journal_count = self._replay_journal(
+            self.journal_path, overlay, keep_deletes=True, versions=versions
+        )
+        for attrs in overlay.values():
+            if attrs is not None:
+                _fill_defaults(attrs)
+
+        with self._snapshot_lock:
+            self._snapshot_count = count
+            self._overlay = overlay
+        # Versi pet yang cuma ada di snapshot diisi saat pet-nya di-fetch
+        self.versions = versions
+
+    def _lookup(self, name):
+        # Dipanggil dengan _snapshot_lock dipegang
+        if not self._snapshot_count:
+            return None
+        return snapshot_index.lookup(self.path, self._snapshot_count, name)
+
+    def fetch(self, name):
+        with self._snapshot_lock:
+            if name in self._overlay:
+                attrs = self._overlay[name]
+                return None if attrs is None else dict(attrs)
+            found = self._lookup(name)
+            if found is None:
+                return None
+            offset, length = found
+            with open(self.path, "rb") as f:
+                f.seek(offset)
+                record = f.read(length)
+        attrs = formats.loads_json(record)
+        version = attrs.pop(VERSION_KEY, 0)
+        if name not in self.versions:
+            self.versions[name] = version
+        return _fill_defaults(attrs)
+
+    def count(self):
+        with self._snapshot_lock:
+            count = self._snapshot_count
+            for name, attrs in self._overlay.items():
+                in_snapshot = self._lookup(name) is not None
+                count += (attrs is not None) - in_snapshot
+        return count
+
+    def pages(self, page_size=PAGE_SIZE):
+        """
+        Generator halaman [(name, attrs), ...] dengan urutan file (streaming,
+        memori nggak tergantung jumlah pet). Versi di journal menang.
+        """
+        with self._snapshot_lock:
+            # Snapshot & overlay diambil barengan biar konsisten walau ada compaction
+            overlay = dict(self._overlay)
+            source = open(self.path, "rb") if self._snapshot_count else None
+        page = []
+        if source is not None:
+            with source:
+                for raw, _, record in snapshot_index.scan_records(source):
+                    name = snapshot_index.decode_key(raw)
+                    if name in overlay:
+                        continue
+                    attrs = formats.loads_json(record)
+                    attrs.pop(VERSION_KEY, None)
+                    page.append((name, _fill_defaults(attrs)))
+                    if len(page) >= page_size:
+                        yield page
+                        page = []
+        for name, attrs in overlay.items():
+            if attrs is not None:
+                page.append((name, dict(attrs)))
+                if len(page) >= page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
+
+    def _save_lazy(self, data, changes, remote):
+        full = changes is None
+        if full:
+            with self.data_lock:
+                changes = data.pending()
+        conflicts = remote.keys() & changes.keys()
+        if conflicts:
+            raise ConflictError(remote, conflicts)
+        if changes:
+            self.append_journal(changes)
+        if (full and self._overlay) or len(changes) >= COMPACT_EVERY:
+            # Journal kosong -> snapshot sudah up to date, nggak perlu tulis ulang file besar
+            self.compact(data)
+        elif self._journal_count >= COMPACT_EVERY:
+            self.compact(data, background=True)
+        with self.data_lock:
+            data.forget(changes)
+
+    def _write_merged_snapshot(self, folded):
+        """
+        Snapshot baru = snapshot lama + overlay journal, ditulis streaming:
+        record lama disalin apa adanya (nggak di-parse ulang), sekalian bikin index.
+        Snapshot & index baru ditukar barengan di bawah _snapshot_lock.
+        """
+        tmp = self.path + ".tmp"
+        entries = []
+        with open(tmp, "wb") as out:
+            pos = out.write(b"{")
+
+            def put(name, key, record):
+                nonlocal pos
+                head = (b',"' if entries else b'"') + key + b'":'
+                pos += out.write(head)
+                entries.append((name, pos, len(record), zlib.crc32(record)))
+                pos += out.write(record)
+
+            if self._snapshot_count:
+                with open(self.path, "rb") as src:
+                    for raw, _, record in snapshot_index.scan_records(src):
+                        name = snapshot_index.decode_key(raw)
+                        if name not in folded:
+                            put(name, raw, record)
+            for name, attrs in folded.items():
+                if attrs is not None:
+                    attrs = {**attrs, VERSION_KEY: self.versions[name]}
+                    put(name, formats.dumps_json(name)[1:-1], formats.dumps_json(attrs))
+            pos += out.write(b"}")
+            out.flush()
+            os.fsync(out.fileno())
+        self.bytes_written["snapshot"] += pos
+
+        index_tmp = snapshot_index.write_index(tmp, entries, self.path + snapshot_index.INDEX_SUFFIX + ".tmp")
+        with self._lock, self._snapshot_lock:
+            os.replace(tmp, self.path)
+            os.replace(index_tmp, self.path + snapshot_index.INDEX_SUFFIX)
+            self._saw_snapshot()
+            self._snapshot_count = len(entries)
+            # Yang sudah masuk snapshot dibuang dari overlay (kecuali sudah berubah lagi)
+            self._overlay = {
+                name: attrs for name, attrs in self._overlay.items()
+                if folded.get(name, _MISSING) is not attrs
+            }
+
+    def set_format(self, fmt):
+        """
+        Ganti format snapshot; berlaku mulai snapshot berikutnya (save penuh).
+        Lempar formats.FormatError kalau format nggak dikenal / belum terpasang.
+        """
+        fmt = formats.check_format(fmt)
+        if self.lazy and fmt != "json":
+            raise formats.FormatError(
+                "Only 'json' works while the roster is loaded lazily (start with PET_LAZY=0)."
+            )
+        self.format = fmt
+
+    def close(self):
+        # Pastikan compaction background selesai sebelum program keluar
+        if self._compactor is not None:
+            self._compactor.join()
+
+
+_MISSING = object()
 
 
-def save_data(data):
+class _Versions(dict):
+    """
+    Versi pet per nama. Pet yang nggak tercatat punya versi `floor`: save penuh
+    memberi semua pet versi baru yang sama, jadi cukup floor-nya yang naik
+    (nggak perlu satu entry per pet).
+    """
+
+    def __init__(self, floor=0):
+        super().__init__()
+        self.floor = floor
+
+    def __missing__(self, name):
+        return self.floor
+
+    @classmethod
+    def from_snapshot(cls, data):
+        # Ambil (dan buang) field versi dari pet hasil baca snapshot
+        found = [attrs.pop(VERSION_KEY, 0) for attrs in data.values()]
+        versions = cls(min(found, default=0))
+        if max(found, default=0) != versions.floor:
+            versions.update((name, version) for name, version in zip(data, found) if version != versions.floor)
+        return versions
+
+    def bumped(self):
+        return _Versions(max(self.floor, max(self.values(), default=0)) + 1)
+
+
+def _verify_journal(path):
+    # (bagian, ok, keterangan) untuk satu journal: tiap baris harus JSON utuh.
+    # Baris terakhir yang terpotong cuma dicatat (dibuang saat load berikutnya).
+    records = 0
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, 1):
+            if not line.endswith(b"\n"):
+                return os.path.basename(path), True, f"{records:,} records, unfinished last line will be dropped"
+            try:
+                formats.loads_json(line)
+            except ValueError as e:
+                return os.path.basename(path), False, f"line {number} is corrupt: {e}"
+            records += 1
+    return os.path.basename(path), True, f"{records:,} records"
+
+
+def _fill_defaults(attrs):
+    # Data lama belum punya level, exp & ts
+    for field, default in PET_DEFAULTS.items():
+        attrs.setdefault(field, default)
+    return attrs
+
+
+def _apply_record(data, record, keep_deletes=False, versions=None):
+    # Record journal selalu berisi state *akhir* pet, jadi replay berulang kali aman
+    if versions is not None:
+        # Record lama (sebelum ada versi) dianggap versi 0
+        versions[record["name"]] = record.get(VERSION_KEY, 0)
+    if record.get("op") == "del":
+        if keep_deletes:
+            data[record["name"]] = None
+        else:
+            data.pop(record["name"], None)
+    else:
+        data[record["name"]] = record["pet"]
+
+
+# ============================================================================
+# LAZY MAPPING (dipakai backend yang nggak load semua pet ke memori)
+# ============================================================================
+
+class LazyPetMap(MutableMapping):
+    """
+    Pengganti dict untuk PetManager.data yang baca pet dari storage saat
+    dibutuhkan saja. Pet yang pernah diakses / diubah disimpan di cache sampai
+    save berikutnya, pet yang dihapus dicatat di _deleted.
+    """
+
+    def __init__(self, storage):
+        self._storage = storage
+        self._cache = {}
+        self._deleted = set()
+
+    def __getitem__(self, name):
+        if name in self._deleted:
+            raise KeyError(name)
+        attrs = self._cache.get(name)
+        if attrs is None:
+            attrs = self._storage.fetch(name)
+            if attrs is None:
+                raise KeyError(name)
+            # Di-cache supaya perubahan in-place (pet["hunger"] = ...) nggak hilang
+            self._cache[name] = attrs
+        return attrs
+
+    def __setitem__(self, name, attrs):
+        self._deleted.discard(name)
+        self._cache[name] = attrs
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._cache.pop(name, None)
+        self._deleted.add(name)
+
+    def __contains__(self, name):
+        if name in self._deleted:
+            return False
+        return name in self._cache or self._storage.fetch(name) is not None
+
+    def __len__(self):
+        count = self._storage.count()
+        for name in self._cache:
+            if self._storage.fetch(name) is None:
+                count += 1  # pet baru yang belum disimpan
+        for name in self._deleted:
+            if self._storage.fetch(name) is not None:
+                count -= 1  # pet yang dihapus tapi masih ada di storage
+        return count
+
+    def __iter__(self):
+        for name, _ in self.items():
+            yield name
+
+    def items(self):
+        """
+        Iterasi semua pet per halaman (PAGE_SIZE), jadi memori tetap kecil
+        walaupun jumlah pet jutaan. Versi cache (yang belum disimpan) menang.
+        """
+        seen = set()
+        for page in self._storage.pages():
+            for name, attrs in page:
+                if name in self._deleted:
+                    continue
+                if name in self._cache:
+                    seen.add(name)
+                    attrs = self._cache[name]
+                yield name, attrs
+        # Pet baru yang belum ada di storage
+        for name, attrs in list(self._cache.items()):
+            if name not in seen and self._storage.fetch(name) is None:
+                yield name, attrs
+
+    def values(self):
+        for _, attrs in self.items():
+            yield attrs
+
+    def holds(self, name):
+        # True kalau versi pet ini di memori bisa beda dengan storage (di-cache / dihapus)
+        return name in self._cache or name in self._deleted
+
+    def held(self):
+        return list(self._cache) + list(self._deleted)
+
+    def peek(self, name):
+        # Versi memori pet yang di-cache (None kalau dihapus), tanpa baca storage
+        return None if name in self._deleted else dict(self._cache[name])
+
+    def pending(self):
+        """
+        Salinan semua perubahan yang belum disimpan, format sama dengan `changes`.
+        """
+        changes = {name: None for name in self._deleted}
+        changes.update((name, dict(attrs)) for name, attrs in self._cache.items())
+        return changes
+
+    def forget(self, written):
+        """
+        Dipanggil setelah save: pet yang sudah tersimpan nggak perlu di-cache lagi.
+        Entry yang berubah lagi setelah di-copy untuk save tetap di cache.
+        """
+        for name, attrs in written.items():
+            if attrs is None:
+                if name not in self._cache:
+                    self._deleted.discard(name)
+            elif self._cache.get(name) == attrs:
+                del self._cache[name]
+
+
+# ============================================================================
+# BACKEND SQLITE
+# ============================================================================
+
+class SqliteStorage:
+    """
+    Backend SQLite: setiap pet jadi satu baris di tabel `pets`.
+    Tabelnya WITHOUT ROWID dengan PRIMARY KEY di kolom name, jadi tabelnya
+    sendiri adalah index berdasarkan nama. Pet dibaca lazy & yang ditulis
+    cuma baris yang berubah.
+    """
+
+    def __init__(self, path=SQLITE_FILE):
+        import sqlite3  # di-import di sini biar backend JSON nggak ikut nanggung
+
+        self.path = path
+        # check_same_thread=False: koneksi juga dipakai thread compaction/autosave
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.data_lock = nullcontext()  # lihat JsonStorage.data_lock
+        # Versi tiap pet saat terakhir dibaca (None = belum ada di database),
+        # dicek ulang saat save biar tulisan proses lain nggak ketimpa
+        self.versions = {}
+        self._map = None  # LazyPetMap terakhir dari load()
+        columns = ", ".join(
+            f"{field} INTEGER NOT NULL DEFAULT {PET_DEFAULTS.get(field, 0)}"
+            for field in PET_FIELDS + (VERSION_KEY,)
+        )
+        with self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS pets (name TEXT PRIMARY KEY, {columns}) WITHOUT ROWID"
+            )
+            # Database lama: tambahkan kolom yang belum ada (misal ts)
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(pets)")}
+            for field in PET_FIELDS + (VERSION_KEY,):
+                if field not in existing:
+                    self.conn.execute(
+                        f"ALTER TABLE pets ADD COLUMN {field} INTEGER NOT NULL "
+                        f"DEFAULT {PET_DEFAULTS.get(field, 0)}"
+                    )
+
+    def load(self):
+        # Nggak ada yang dibaca di sini, pet diambil saat diakses
+        self._map = LazyPetMap(self)
+        return self._map
+
+    def fetch(self, name):
+        with self._lock:
+            attrs, version = self._select(name)
+            self._saw(name, version)
+            return attrs
+
+    def _select(self, name):
+        # Dipanggil dengan _lock dipegang. Return (attrs, versi), (None, None) kalau nggak ada
+        row = self.conn.execute(
+            f"SELECT {', '.join(PET_FIELDS)}, {VERSION_KEY} FROM pets WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None, None
+        return dict(zip(PET_FIELDS, row[:-1])), row[-1]
+
+    def _saw(self, name, version):
+        # Pet yang dipegang LazyPetMap (di-cache / dihapus) tetap pakai versi saat
+        # pertama dibaca: isi di memori diturunkan dari versi itu, bukan yang baru dibaca
+        if self._map is None or not self._map.holds(name):
+            self.versions[name] = version
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM pets").fetchone()[0]
+
+    def pages(self, page_size=PAGE_SIZE):
+        """
+        Generator halaman [(name, attrs), ...] urut nama.
+        Pakai keyset pagination (WHERE name > terakhir) biar tiap halaman O(log n).
+        """
+        last = ""
+        query = (
+            f"SELECT name, {', '.join(PET_FIELDS)}, {VERSION_KEY} FROM pets "
+            "WHERE name > ? ORDER BY name LIMIT ?"
+        )
+        while True:
+            with self._lock:
+                rows = self.conn.execute(query, (last, page_size)).fetchall()
+                for row in rows:
+                    self._saw(row[0], row[-1])
+            if not rows:
+                return
+            yield [(row[0], dict(zip(PET_FIELDS, row[1:-1]))) for row in rows]
+            last = rows[-1][0]
+
+    def save(self, data, changes=None):
+        """
+        Tulis perubahan dalam satu transaksi.
+        changes None = simpan semua yang pending (atau semua pet kalau data dict biasa).
+        Lempar ConflictError kalau ada pet yang sudah diubah proses lain sejak
+        kita baca. Return {} (pet lain selalu dibaca langsung dari database).
+        """
+        replace_all = False
+        with self.data_lock:
+            if changes is None:
+                if isinstance(data, LazyPetMap):
+                    changes = data.pending()
+                else:
+                    changes = {name: dict(attrs) for name, attrs in data.items()}
+                    replace_all = True
+
+        deletes = [name for name, attrs in changes.items() if attrs is None]
+        placeholders = ", ".join("?" * (len(PET_FIELDS) + 2))
+        with self._lock, self.conn:
+            # BEGIN IMMEDIATE: database langsung dikunci buat nulis, jadi versi yang
+            # dicek di bawah nggak bisa diubah proses lain sampai commit
+            self.conn.execute("BEGIN IMMEDIATE")
+            current = self._current_versions(None if replace_all else list(changes))
+            conflicts = self._conflicts(changes, current, replace_all)
+            if conflicts:
+                # Versi sekarang jadi acuan save berikutnya (sesudah perubahannya digabung).
+                # Exception di dalam `with self.conn` -> rollback, nggak ada yang ditulis
+                self.versions.update((name, current.get(name)) for name in conflicts)
+                raise ConflictError({name: self._select(name)[0] for name in conflicts}, conflicts)
+
+            if replace_all:
+                # Masih di transaksi yang sama, jadi kalau gagal data lama tetap utuh
+                self.conn.execute("DELETE FROM pets")
+            if deletes:
+                self.conn.executemany("DELETE FROM pets WHERE name = ?", [(name,) for name in deletes])
+            upserts = [
+                (name, *[int(attrs.get(f, PET_DEFAULTS.get(f, 0))) for f in PET_FIELDS],
+                 (current.get(name) or 0) + 1)
+                for name, attrs in changes.items()
+                if attrs is not None
+            ]
+            if upserts:
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO pets (name, {', '.join(PET_FIELDS)}, {VERSION_KEY}) "
+                    f"VALUES ({placeholders})",
+                    upserts,
+                )
+        self.versions.update((row[0], row[-1]) for row in upserts)
+        self.versions.update((name, None) for name in deletes)
+
+        if isinstance(data, LazyPetMap):
+            with self.data_lock:
+                data.forget(changes)
+        return {}
+
+    def _current_versions(self, names=None):
+        """
+        {nama: versi} di database sekarang, untuk `names` (None = semua pet).
+        """
+        if names is None:
+            return dict(self.conn.execute(f"SELECT name, {VERSION_KEY} FROM pets"))
+        current = {}
+        for i in range(0, len(names), 500):  # batas jumlah parameter SQLite
+            chunk = names[i:i + 500]
+            current.update(self.conn.execute(
+                f"SELECT name, {VERSION_KEY} FROM pets WHERE name IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ))
+        return current
+
+    def _conflicts(self, changes, current, replace_all):
+        """
+        Nama pet yang versinya di database sudah beda dengan saat kita baca.
+        """
+        conflicts = []
+        names = current.keys() | changes.keys() if replace_all else changes.keys()
+        for name in names:
+            expected = self.versions.get(name, _MISSING)
+            if expected is _MISSING:
+                # Belum pernah kita baca: cuma bentrok kalau save penuh bakal menghapusnya
+                if name not in changes:
+                    conflicts.append(name)
+            elif expected != current.get(name):
+                conflicts.append(name)
+        return conflicts
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def verify(self):
+        # Cek halaman & index database (quick_check: tanpa cocokkan isi index ke tabel)
+        with self._lock:
+            rows = [row[0] for row in self.conn.execute("PRAGMA quick_check")]
+            count = self.conn.execute("SELECT COUNT(*) FROM pets").fetchone()[0]
+        if rows == ["ok"]:
+            return [("database", True, f"{count:,} pets, pages ok")]
+        return [("database", False, "; ".join(rows[:5]))]
+
+
+# ============================================================================
+# PEMILIHAN BACKEND
+# ============================================================================
+
+BACKENDS = {"json": JsonStorage, "sqlite": SqliteStorage}
+
+
+def open_storage(path=None, backend=None):
+    """
+    Buka storage sesuai pilihan.
+    backend: "json" / "sqlite". Kalau kosong, diambil dari env PET_STORAGE,
+    atau ditebak dari ekstensi file (.db / .sqlite -> sqlite).
+    """
+    backend = backend or os.environ.get("PET_STORAGE")
+    if backend is None and path and path.endswith((".db", ".sqlite")):
+        backend = "sqlite"
+    backend = (backend or "json").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+    if path is None:
+        path = SQLITE_FILE if backend == "sqlite" else DATA_FILE
+    return BACKENDS[backend](path)
+
+
+def convert_file(path=DATA_FILE, fmt=formats.DEFAULT_FORMAT):
+    """
+    Migrasi snapshot backend JSON ke format lain (journal ikut dilipat).
+    Return (format lama, ukuran lama, ukuran baru) dalam byte.
+    """
+    formats.check_format(fmt)  # validasi dulu sebelum baca file besar
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No snapshot file at {path}")
+    with open(path, "rb") as f:
+        old_fmt = formats.detect_format(f.read(len(formats.STRUCT_MAGIC)))
+    old_size = os.path.getsize(path)
+
+    # Dibaca utuh (bukan lazy): format selain JSON nggak punya index per pet
+    storage = JsonStorage(path, lazy=False)
+    data = storage.load()
+    storage.set_format(fmt)
+    storage.save(data)  # save penuh: snapshot baru + journal dikosongkan
+    storage.close()
+    return old_fmt, old_size, os.path.getsize(path)
+
+
+# ============================================================================
+# FUNGSI LAMA (tetap ada supaya kode lama masih jalan)
+# ============================================================================
+
+_default_storage = None
+
+
+def _storage():
+    global _default_storage
+    if _default_storage is None:
+        _default_storage = JsonStorage(DATA_FILE, JOURNAL_FILE)
+    return _default_storage
+
+
+def load_data():
+    """
+    Fungsi ini dipakai buat *membaca* data dari file JSON (snapshot + journal).
+    Kalau file-nya belum ada, fungsi ini bakal ngembaliin dictionary kosong.
+    Kalau rusak, dipulihkan dari backup terakhir (atau CorruptStoreError).
+    """
+    return _storage().load()
+
+
+def save_data(data, changes=None):
     """
     Fungsi ini dipakai buat *menyimpan* data ke file JSON.
-    Data yang disimpan biasanya berupa dictionary (dict) dari program utama.
-    """
-    # Buka file dalam mode "write" (w), jadi isinya bakal ditimpa setiap kali nyimpen
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        # json.dump() = ubah data Python jadi format JSON dan tulis ke file
-        # indent=4 -> biar hasil JSON rapi (ada jarak 4 spasi)
-        # ensure_ascii=False -> biar karakter non-ASCII (misal huruf é, ü) tetap tampil
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    Lihat JsonStorage.save untuk arti parameter `changes`.
+    """
+    _storage().save(data, changes)
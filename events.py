@@ -0,0 +1,82 @@
+# ============================================================================
+# EVENTS - Tabel random event & RNG yang bisa di-seed
+# ============================================================================
+# Semua peluang & efek event ada di tabel di bawah (bukan if/elif), dipakai
+# bareng oleh interaksi satu pet (PetManager), world.py & simulate.py.
+#
+#   BONUS_EVENTS  : event positif, maksimal satu per action
+#   HAZARD_EVENTS : event negatif, dicek setiap langkah kalau stat pet sudah
+#                   di bawah batas (misal kelaparan)
+#
+# Setiap langkah selalu melempar dadu bonus dulu (walaupun action-nya nggak
+# punya bonus), baru satu dadu per hazard yang kondisinya kena. Urutan ini
+# yang bikin hasil dengan seed yang sama selalu persis sama.
+
+import os
+import random
+from collections import namedtuple
+
+# Env untuk seed RNG PetManager (kosong = acak setiap jalan)
+SEED_ENV = "PET_SEED"
+
+# chance dalam persen (1-100)
+BonusEvent = namedtuple("BonusEvent", "chance stat amount color text")
+HazardEvent = namedtuple("HazardEvent", "name field limit chance stat amount color text")
+
+BONUS_EVENTS = {
+    "play": BonusEvent(15, "happy", 10, "yellow",
+                       "🎁 Lucky! {name} found a toy and got +{amount} happy!"),
+    "feed": BonusEvent(10, "health", 5, "magenta",
+                       "😮 Surprise! {name} found a treat and +{amount} health!"),
+    "sleep": BonusEvent(12, "happy", 8, "blue",
+                        "🌙 Dream event: {name} had a happy dream (+{amount} happy)!"),
+}
+
+# Hazard kena kalau pet[field] <= limit, lalu dadu `chance` persen
+HAZARD_EVENTS = (
+    HazardEvent("starving", "hunger", 10, 8, "health", -10, "red",
+                "⚠️ {name} is starving! Health {amount}."),
+)
+
+
+def make_rng(seed=None):
+    """
+    RNG untuk satu PetManager. seed None -> ambil dari env PET_SEED (kalau ada).
+    """
+    if seed is None:
+        seed = os.environ.get(SEED_ENV) or None
+    return random.Random(seed)
+
+
+def roll_events(pet, action, rng, max_stat=100):
+    """
+    Lempar dadu semua event untuk satu pet setelah `action` & terapkan efeknya.
+    rng: random.Random (atau modul random).
+
+    Returns:
+        List event (BonusEvent / HazardEvent) yang terjadi, urut tabel.
+    """
+    hits = []
+    chance = rng.randint(1, 100)
+    bonus = BONUS_EVENTS.get(action)
+    if bonus is not None and chance <= bonus.chance:
+        pet[bonus.stat] = max(0, min(max_stat, pet[bonus.stat] + bonus.amount))
+        hits.append(bonus)
+
+    for hazard in HAZARD_EVENTS:
+        if pet[hazard.field] <= hazard.limit and rng.randint(1, 100) <= hazard.chance:
+            pet[hazard.stat] = max(0, min(max_stat, pet[hazard.stat] + hazard.amount))
+            hits.append(hazard)
+    return hits
+
+
+def event_name(event):
+    # Nama event untuk statistik: semua bonus dihitung jadi "bonus", hazard pakai namanya
+    return "bonus" if isinstance(event, BonusEvent) else event.name
+
+
+def describe(event, name):
+    """
+    Pesan (warna, teks) untuk event yang terjadi ke pet `name`.
+    """
+    return event.color, event.text.format(name=name, amount=event.amount)
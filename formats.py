@@ -0,0 +1,214 @@
+# ============================================================================
+# FORMATS - Format file snapshot (pet_data.json)
+# ============================================================================
+# Snapshot bisa ditulis dalam beberapa format:
+#   - json        : JSON compact (tanpa indent). Pakai orjson kalau terpasang.
+#   - json-pretty : JSON indent=4 seperti versi lama (enak dibaca manusia)
+#   - msgpack     : binary MessagePack (butuh: pip install msgpack)
+#   - struct      : binary kolom (nama + array int), tanpa library tambahan
+#
+# Format dikenali otomatis saat load dari beberapa byte pertama (magic), jadi
+# nama file tetap pet_data.json apapun formatnya.
+
+import importlib.util
+import json
+import struct
+import sys
+from array import array
+
+try:
+    import orjson
+except ImportError:  # orjson opsional, fallback ke modul json bawaan
+    orjson = None
+
+# msgpack opsional & lumayan berat di-import: saat start cuma dicek terpasang
+# atau nggak, modulnya baru di-import waktu format msgpack benar-benar dipakai
+msgpack = None
+
+DEFAULT_FORMAT = "json"
+
+# Magic di awal file binary (JSON selalu diawali "{" / spasi)
+MSGPACK_MAGIC = b"PETM\x01"
+STRUCT_MAGIC = b"PETS\x02"
+# Versi 1 format struct: nama dipisah "\0" (rusak kalau nama berisi NUL), masih bisa dibaca
+_STRUCT_MAGIC_V1 = b"PETS\x01"
+
+# Header format struct: magic, jumlah pet, panjang blok field, panjang blok nama
+_STRUCT_HEADER = struct.Struct("<5sIII")
+
+
+class FormatError(ValueError):
+    """
+    Format snapshot nggak dikenal / library-nya belum terpasang.
+    """
+
+
+# ============================================================================
+# JSON (juga dipakai journal)
+# ============================================================================
+
+def dumps_json(obj):
+    """
+    Ubah object ke JSON compact dalam bentuk bytes (UTF-8).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(payload):
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _dumps_pretty(data):
+    # indent=4 -> biar hasil JSON rapi (ada jarak 4 spasi)
+    # ensure_ascii=False -> biar karakter non-ASCII (misal huruf é, ü) tetap tampil
+    return json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+
+
+# ============================================================================
+# MSGPACK
+# ============================================================================
+
+def _msgpack():
+    global msgpack
+    if msgpack is None:
+        import msgpack as module
+        msgpack = module
+    return msgpack
+
+
+def _dumps_msgpack(data):
+    return MSGPACK_MAGIC + _msgpack().packb(data, use_bin_type=True)
+
+
+def _loads_msgpack(payload):
+    return _msgpack().unpackb(memoryview(payload)[len(MSGPACK_MAGIC):], raw=False)
+
+
+# ============================================================================
+# STRUCT (binary kolom)
+# ============================================================================
+# Layout: header | "field:typecode,..." | panjang byte tiap nama (uint32) + nama utf-8
+# disambung | satu array per field. Nama boleh berisi karakter apa pun (termasuk "\0").
+# Semua angka little-endian. Typecode array: "i" (int32), "q" (int64), "d" (float).
+
+def _column(values):
+    # Coba int32 dulu (paling kecil); kalau kebesaran -> int64, kalau ada float -> double
+    for typecode in ("i", "q"):
+        try:
+            return array(typecode, values)
+        except (OverflowError, TypeError):
+            continue
+    return array("d", values)
+
+
+def _dumps_struct(data):
+    names = list(data)
+    # Semua pet punya field yang sama (dijamin load()), urutan ikut pet pertama
+    fields = list(data[names[0]]) if names else []
+    columns = []
+    for field in fields:
+        column = _column([attrs[field] for attrs in data.values()])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns.append(column)
+
+    field_blob = ",".join(f"{field}:{col.typecode}" for field, col in zip(fields, columns)).encode("utf-8")
+    encoded = [name.encode("utf-8") for name in names]
+    name_blob = struct.pack(f"<{len(encoded)}I", *map(len, encoded)) + b"".join(encoded)
+    header = _STRUCT_HEADER.pack(STRUCT_MAGIC, len(names), len(field_blob), len(name_blob))
+    return b"".join([header, field_blob, name_blob] + [col.tobytes() for col in columns])
+
+
+def _loads_struct(payload):
+    view = memoryview(payload)
+    magic, count, field_len, name_len = _STRUCT_HEADER.unpack_from(view)
+    pos = _STRUCT_HEADER.size
+    field_blob = bytes(view[pos:pos + field_len]).decode("utf-8")
+    pos += field_len
+    name_blob = bytes(view[pos:pos + name_len])
+    pos += name_len
+    if magic == _STRUCT_MAGIC_V1:
+        names = name_blob.decode("utf-8").split("\0") if count else []
+    else:
+        names = []
+        start = count * 4
+        for length in struct.unpack_from(f"<{count}I", name_blob):
+            names.append(name_blob[start:start + length].decode("utf-8"))
+            start += length
+
+    fields, columns = [], []
+    for spec in filter(None, field_blob.split(",")):
+        field, typecode = spec.rsplit(":", 1)
+        column = array(typecode)
+        size = count * column.itemsize
+        column.frombytes(view[pos:pos + size])
+        if sys.byteorder == "big":
+            column.byteswap()
+        pos += size
+        fields.append(field)
+        columns.append(column)
+    return {name: dict(zip(fields, values)) for name, *values in zip(names, *columns)}
+
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+# nama format -> (fungsi encode, fungsi decode, library yang dibutuhkan)
+FORMATS = {
+    "json": (dumps_json, loads_json, None),
+    "json-pretty": (_dumps_pretty, loads_json, None),
+    "msgpack": (_dumps_msgpack, _loads_msgpack, "msgpack"),
+    "struct": (_dumps_struct, _loads_struct, None),
+}
+
+
+def available_formats():
+    """
+    Format yang bisa dipakai di instalasi ini (msgpack cuma kalau terpasang).
+    """
+    return [name for name, (_, _, needs) in FORMATS.items() if needs is None or _installed(needs)]
+
+
+def _installed(library):
+    # Cek library terpasang tanpa meng-import-nya
+    return importlib.util.find_spec(library) is not None
+
+
+def check_format(name):
+    """
+    Validasi nama format. Lempar FormatError kalau nggak dikenal / belum terpasang.
+    """
+    if name not in FORMATS:
+        raise FormatError(f"Unknown snapshot format: {name} (choose from {', '.join(FORMATS)})")
+    needs = FORMATS[name][2]
+    if needs is not None and not _installed(needs):
+        raise FormatError(f"Format '{name}' needs the {needs} package (pip install {needs}).")
+    return name
+
+
+def detect_format(payload):
+    """
+    Tebak format dari byte-byte pertama file.
+    """
+    if payload.startswith(MSGPACK_MAGIC):
+        return "msgpack"
+    if payload.startswith((STRUCT_MAGIC, _STRUCT_MAGIC_V1)):
+        return "struct"
+    return "json"
+
+
+def encode(data, fmt=DEFAULT_FORMAT):
+    return FORMATS[check_format(fmt)][0](data)
+
+
+def decode(payload):
+    """
+    Baca snapshot dalam format apapun. Return (data, nama format).
+    """
+    fmt = detect_format(payload)
+    return FORMATS[check_format(fmt)][1](payload), fmt
@@ -0,0 +1,237 @@
+# ============================================================================
+# HISTORY - Log operasi untuk undo / redo / goto / history
+# ============================================================================
+# Setiap perubahan PetManager dicatat sebagai satu Op kecil: cuma pet yang
+# disentuh, dengan isi sebelum & sesudahnya (None = pet belum ada / sudah
+# dihapus). Undo = pasang lagi isi "sebelum", redo = pasang isi "sesudah",
+# jadi satu langkah undo/redo nggak perlu memutar ulang operasi lain.
+#
+# Operasi massal (tick, feed --all, import, ...) dicatat dengan cara yang sama,
+# cuma pet yang kena. Di PetTable jalur vectorized, perubahannya disimpan per
+# kolom (world.ColumnDelta: nama pet + nilai kolom sebelum & sesudah).
+#
+# Supaya lompat jauh (undo 500, goto #12) nggak harus memutar ulang ratusan
+# operasi massal, setiap HISTORY_CHECKPOINT_EVERY operasi diambil checkpoint:
+# salinan roster sesudah operasi itu. Lompatan mulai dari checkpoint terdekat
+# kalau itu lebih murah (salin roster + operasi di antaranya) daripada
+# memutar operasi satu per satu. Checkpoint baru diambil kalau sejak
+# checkpoint terakhir sudah ada perubahan pet sebanyak isi roster, jadi
+# biaya salinannya nggak pernah lebih besar dari operasi yang dicatat.
+#
+# Riwayat cuma di memori (hilang saat program ditutup).
+
+import os
+import time
+from collections import deque, namedtuple
+
+from pet_table import PetTable
+
+# Jumlah operasi yang bisa di-undo (env PET_HISTORY_LIMIT, 0 = history mati)
+HISTORY_LIMIT = int(os.environ.get("PET_HISTORY_LIMIT", "1000"))
+# Total perubahan pet yang disimpan semua operasi (env PET_HISTORY_MAX_CHANGES).
+# Kalau lewat, operasi paling lama dibuang; operasi terbaru selalu disimpan.
+HISTORY_MAX_CHANGES = int(os.environ.get("PET_HISTORY_MAX_CHANGES", "2000000"))
+# Checkpoint roster tiap berapa operasi (env PET_HISTORY_CHECKPOINT_EVERY) &
+# maksimal yang disimpan (env PET_HISTORY_CHECKPOINTS, 0 = tanpa checkpoint)
+HISTORY_CHECKPOINT_EVERY = int(os.environ.get("PET_HISTORY_CHECKPOINT_EVERY", "50"))
+HISTORY_CHECKPOINTS = int(os.environ.get("PET_HISTORY_CHECKPOINTS", "3"))
+
+# changes: tuple (nama, sebelum, sesudah); columns: world.ColumnDelta (operasi massal vectorized) atau None
+Op = namedtuple("Op", "seq when kind label changes columns")
+
+
+def world_label(action, conditions, ticks):
+    # Teks operasi massal untuk 'history', mirip perintah aslinya
+    if action == "tick":
+        return f"tick {ticks}"
+    if not conditions:
+        return f"{action} --all"
+    return f"{action} --where " + " and ".join(f"{field}{op}{value}" for field, op, value in conditions)
+
+
+def op_size(op):
+    # Jumlah perubahan pet yang dipegang satu Op (biaya undo/redo-nya)
+    return len(op.changes) + (len(op.columns) if op.columns is not None else 0)
+
+
+def take_checkpoint(data):
+    """
+    Salinan roster untuk checkpoint. PetTable cukup copy array kolomnya.
+    """
+    if isinstance(data, PetTable):
+        return data.copy()
+    return {name: dict(attrs) for name, attrs in data.items()}
+
+
+def restore_checkpoint(data, checkpoint):
+    """
+    Kembalikan roster ke isi checkpoint (checkpoint-nya sendiri nggak diubah,
+    bisa dipakai lagi). Return object roster yang berlaku sesudahnya.
+    """
+    if isinstance(checkpoint, PetTable):
+        return checkpoint.copy()
+    for name in [name for name in data if name not in checkpoint]:
+        del data[name]
+    for name, attrs in checkpoint.items():
+        data[name] = dict(attrs)
+    return data
+
+
+class History:
+    """
+    Daftar Op yang sudah dijalankan (bisa di-undo) & yang sudah di-undo (bisa di-redo),
+    plus checkpoint roster {seq: salinan}. Dipanggil PetManager sambil memegang manager.lock.
+    """
+
+    def __init__(self, limit=HISTORY_LIMIT, checkpoints=HISTORY_CHECKPOINTS,
+                 checkpoint_every=HISTORY_CHECKPOINT_EVERY, max_changes=HISTORY_MAX_CHANGES):
+        self.limit = limit
+        self.checkpoints = checkpoints
+        self.checkpoint_every = checkpoint_every
+        self.max_changes = max_changes
+        self.done = deque()
+        self.undone = []
+        self._seq = 0
+        self._size = 0          # total op_size semua Op yang disimpan
+        self._saved = {}        # seq -> checkpoint (roster sesudah Op seq itu), urut lama -> baru
+        self._since_ops = 0     # operasi & perubahan pet sejak checkpoint terakhir
+        self._since_changes = 0
+
+    @property
+    def enabled(self):
+        return self.limit > 0
+
+    def record(self, kind, label, changes=(), columns=None):
+        """
+        Catat satu operasi baru. Riwayat redo dibuang (cabang baru).
+        """
+        if not self.enabled:
+            return None
+        self._seq += 1
+        op = Op(self._seq, time.time(), kind, label, tuple(changes), columns)
+        if self.undone:
+            self._size -= sum(map(op_size, self.undone))
+            self._drop(self.undone)
+            self.undone.clear()
+        self.done.append(op)
+        size = op_size(op)
+        self._size += size
+        self._since_ops += 1
+        self._since_changes += size
+        self._trim()
+        return op
+
+    def _trim(self):
+        # Buang operasi paling lama sampai jumlah & total perubahannya masuk batas
+        dropped = []
+        while len(self.done) > 1 and (len(self.done) > self.limit or self._size > self.max_changes):
+            op = self.done.popleft()
+            self._size -= op_size(op)
+            dropped.append(op)
+        if dropped:
+            self._drop(dropped)
+
+    def _drop(self, ops):
+        # Op dibuang dari history -> checkpoint sesudah Op itu nggak bisa dicapai lagi
+        for op in ops:
+            self._saved.pop(op.seq, None)
+
+    def maybe_checkpoint(self, data):
+        """
+        Ambil checkpoint roster sesudah operasi terakhir kalau sudah waktunya
+        (lihat atas). Return True kalau checkpoint diambil.
+        """
+        if not self.enabled or not self.checkpoints or not self.done:
+            return False
+        if self._since_ops < self.checkpoint_every or self._since_changes < len(data):
+            return False
+        self._saved[self.done[-1].seq] = take_checkpoint(data)
+        self._since_ops = self._since_changes = 0
+        while len(self._saved) > self.checkpoints:
+            del self._saved[next(iter(self._saved))]
+        return True
+
+    def drop_checkpoints(self):
+        # Roster diubah di luar history (misal perubahan proses lain) -> checkpoint nggak valid
+        self._saved.clear()
+        self._since_ops = self._since_changes = 0
+
+    def steps_to(self, seq):
+        """
+        Jumlah langkah ke keadaan sesudah Op #seq: negatif = undo, positif = redo.
+        seq 0 = sebelum operasi paling lama yang masih dicatat. None kalau nggak ada.
+        """
+        if seq == 0:
+            return -len(self.done)
+        for index, op in enumerate(reversed(self.done)):
+            if op.seq == seq:
+                return -index
+        for index, op in enumerate(reversed(self.undone), 1):
+            if op.seq == seq:
+                return index
+        return None
+
+    def travel(self, steps, apply, restore):
+        """
+        Undo (steps < 0) / redo (steps > 0) beberapa operasi sekaligus.
+        apply(op, undo) memasang isi sebelum / sesudah satu Op, restore(checkpoint)
+        mengganti roster dengan checkpoint. Jalannya lewat rute termurah: Op satu
+        per satu dari posisi sekarang, atau dari checkpoint yang paling dekat.
+        Return list Op yang di-undo / redo (urut seperti dijalankan satu per satu).
+        """
+        # line = semua Op urut waktu; posisi i = keadaan sesudah line[i] (-1 = sebelum line[0])
+        line = list(self.done) + self.undone[::-1]
+        current = len(self.done) - 1
+        target = max(-1, min(len(line) - 1, current + steps))
+        if target == current:
+            return []
+        sizes = [op_size(op) for op in line]
+
+        def cost(start):
+            low, high = sorted((start, target))
+            return sum(sizes[low + 1:high + 1])
+
+        start, checkpoint, best = current, None, cost(current)
+        positions = {op.seq: index for index, op in enumerate(line)}
+        for seq, saved in self._saved.items():
+            index = positions.get(seq)
+            if index is not None and len(saved) + cost(index) < best:
+                start, checkpoint, best = index, saved, len(saved) + cost(index)
+
+        if checkpoint is not None:
+            restore(checkpoint)
+        if start > target:
+            for op in reversed(line[target + 1:start + 1]):
+                apply(op, True)
+        else:
+            for op in line[start + 1:target + 1]:
+                apply(op, False)
+
+        self.done = deque(line[:target + 1])
+        self.undone = line[target + 1:][::-1]
+        if target < current:
+            return line[target + 1:current + 1][::-1]
+        return line[current + 1:target + 1]
+
+    def clear(self):
+        self.done.clear()
+        self.undone.clear()
+        self._size = 0
+        self.drop_checkpoints()
+
+    def entries(self, name=None):
+        """
+        Op terbaru dulu, sebagai (op, sudah_di_undo). name: cuma op yang
+        menyentuh pet itu (termasuk saat masih pakai nama lamanya) & operasi massal.
+        """
+        rows = [(op, True) for op in self.undone] + [(op, False) for op in reversed(self.done)]
+        if name is None:
+            return rows
+        names = {name}
+        picked = []
+        for op, undone in rows:
+            if op.kind == "world" or any(pet in names for pet, _, _ in op.changes):
+                picked.append((op, undone))
+            if op.kind == "rename" and op.changes[1][0] in names:
+                names.add(op.changes[0][0])
+        return picked
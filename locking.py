@@ -0,0 +1,106 @@
+# ============================================================================
+# LOCKING - Advisory file lock antar proses untuk satu store
+# ============================================================================
+# Beberapa proses CLI / worker boleh buka pet_data.json yang sama. Setiap
+# proses yang mau baca-tulis store (load, append journal, compaction) pegang
+# lock eksklusif di file "<store>.lock" dulu, jadi urutan tulisannya nggak
+# pernah saling tumpuk. Lock-nya advisory: cuma dihormati proses yang juga
+# pakai FileLock ini.
+#
+# Di dalam satu proses lock-nya dihitung (reference count): thread lain di
+# proses yang sama (autosave, compaction background) boleh ikut memegangnya.
+# Sinkronisasi antar thread tetap urusan lock threading milik storage.
+
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+
+class FileLock:
+    """
+    Lock eksklusif antar proses berbasis file (flock di POSIX, msvcrt.locking
+    di Windows; tanpa keduanya lock cuma berlaku di dalam proses ini).
+    Dipakai sebagai context manager, boleh bersarang.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._fd = None
+        self._depth = 0
+        self._guard = threading.Lock()  # jaga _fd & _depth
+        self._owner = threading.Lock()  # dipegang selama lock file-nya dipegang proses ini
+
+    def acquire(self):
+        with self._guard:
+            if self._depth:
+                self._depth += 1
+                return
+        # Proses ini belum pegang lock: tunggu sampai proses lain melepas
+        self._owner.acquire()
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                _lock_fd(fd)
+            except BaseException:
+                os.close(fd)
+                raise
+        except BaseException:
+            self._owner.release()
+            raise
+        with self._guard:
+            self._fd = fd
+            self._depth = 1
+
+    def release(self):
+        with self._guard:
+            self._depth -= 1
+            if self._depth:
+                return
+            fd, self._fd = self._fd, None
+        try:
+            _unlock_fd(fd)
+        finally:
+            os.close(fd)
+            self._owner.release()
+
+    @property
+    def held(self):
+        return self._depth > 0
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _lock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    elif msvcrt is not None:
+        # LK_LOCK nyoba ulang selama ~10 detik, jadi diulang sampai dapat
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+
+def _unlock_fd(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    elif msvcrt is not None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
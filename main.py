@@ -1,139 +1,468 @@
 # main.py
-from pet_manager import PetManager # import class utama untuk mengatur logika hewan
-from colorama import Fore, Style, init # libary untuk membari warna pada teks terminal
-import time, sys # time untuk delay animasi, sys untuk output teks manual
-
-#Inisiasi colorama agar warna otomatis reset setelah digunakan
-init(autoreset=True)
-
-# Menampilkan teks karakter demi karakter 
-# Output saat di run (tampilan awal)
-def slow_print(text, delay=0.03):
-    for char in text:
-        sys.stdout.write(char) #tulis satu karakter ke terminal tanpa newline
-        sys.stdout.flush() #untuk memastikan karakter langsung muncul
-        time.sleep(delay) #delay antar karakter
-    print()
+#PetManager, autosave & metrics di-import saat dibutuhkan (lihat open_manager & main),
+#biar start CLI tetap cepat dan mode convert/serve/simulate cuma memuat yang dipakai
+from ui import get_ui, headless_requested, HeadlessUI # UI terminal (warna & animasi) atau headless
+import os, sys, time # sys untuk baca argumen command line, time untuk ukur throughput script
+from collections import namedtuple # bentuk entry registry perintah
 
 #nampilin daftar perintah (command list) yang bisa digunakan oleh user
-def show_help():
-    print(Fore.CYAN + """
+def show_help(ui):
+    ui.say("""
 Available commands:
-  list                     - Show all your pets
+  list / ls                - Show all your pets
+  list where [cond] ...    - Filter/sort/page, e.g. list where health<30 order by level desc limit 20
   create [name]            - Create a new pet (e.g. create maww)
-  delete [name]            - Delete a pet
+  delete [name] [--yes]    - Delete a pet
   rename [old] [new]       - Rename a pet
-  select [name]            - Select a pet to play with
+  select [name]            - Select a pet to play with (select mi* = the one pet starting with "mi")
   status                   - Show current pet's status
-  stats                    - Show all pets' stats
+  stats                    - Show all pets' stats (same where/order by/limit options as list)
   feed                     - Feed your pet 🍗
   play                     - Play with your pet ⚽
   sleep                    - Let your pet rest 😴
   heal                     - Heal your pet ❤️‍🩹
+  feed --all               - Feed every pet at once (also play/sleep/heal)
+  play --where [cond]      - Only pets matching e.g. level>=3 and health<50
+  tick [n]                 - Advance the world n ticks for all pets ⏳
+  undo [n] / redo [n]      - Undo or redo the last n changes ↩️
+  goto [#n]                - Jump to right after change #n from history (#0 = before the oldest)
+  history [name]           - Show recent changes (only one pet's with a name)
+  run [file]               - Run commands from a script file 📜
   save                     - Save pet data 💾
+  convert [format]         - Change snapshot format: json, json-pretty, msgpack, struct
+  export [file] [where ..] - Write pets to .csv, .parquet or .arrow (same where/order by/limit as list)
+  import [file]            - Add or update pets from .csv, .parquet or .arrow
+  backup [--full]          - Back up pets changed since the last backup (--full = all pets) 🗄️
+  verify                   - Check snapshot, journal & latest backup checksums
+  metrics                  - Show runtime metrics (Prometheus text format)
+  profile on|off [file]    - Profile commands with cProfile, 'off' prints the hottest functions
   exit                     - Quit the game 🐾
-  help                     - Show this help
-""")
+  help / ?                 - Show this help
+
+Run with --headless (or PET_HEADLESS=1) to skip colors & animations.
+Changes are autosaved in the background every PET_AUTOSAVE_INTERVAL seconds (0 = save after every command).
+Batch mode: python main.py run script.txt [--flush-every N] [--quiet]  ('-' = stdin)
+Convert a file: python main.py convert FORMAT [FILE]  (default file: pet_data.json)
+Server mode: python main.py serve [--host H] [--port P] [--unix PATH]  (one pet per client session)
+Per-owner stores: python main.py serve --tenants DIR  (clients send 'login <owner>' first)
+Balance sim: python main.py simulate [--pets N] [--steps S] [--mix feed=1,play=1,...] [--seed X]
+Sharded roster: PET_SHARDS=4 python main.py  (pets split across 4 worker processes in pet_shards/)
+Backups go to pet_data.json.backups/ every PET_BACKUP_INTERVAL seconds (0 = off) and on exit; a corrupt pet_data.json is restored from the latest good one.
+Set PET_SEED to replay the exact same random events.
+Export metrics: PET_METRICS_FILE=pets.prom and/or PET_METRICS_PORT=9464 (http://127.0.0.1:9464/metrics)
+""", "cyan")
+
+#registry perintah: nama & alias -> Command, dibangun sekali saat import (lookup O(1) tiap baris input)
+#args = cara argumen diolah sebelum handler dipanggil:
+#  "none"  : tanpa argumen                 "text"  : digabung jadi satu teks (None kalau kosong)
+#  "name"  : digabung jadi nama, kalau kosong ditanya pakai prompt
+#  "count" : angka opsional (default 1)    "raw"   : list argumen apa adanya
+Command = namedtuple("Command", "name handler args prompt usage")
+COMMANDS = {}
+
+#decorator buat mendaftarkan handler perintah (handler return False = keluar program)
+def command(name, *aliases, args="none", prompt=None, usage=None):
+    def register(handler):
+        entry = Command(name, handler, args, prompt, usage or name)
+        for key in (name,) + aliases:
+            COMMANDS[key] = entry
+        return handler
+    return register
+
+#olah argumen sesuai spesifikasi perintah; return None kalau argumennya salah
+def parse_args(entry, args, ui):
+    if entry.args == "none":
+        return ()
+    if entry.args == "raw":
+        return (args,)
+    if entry.args == "text":
+        return (" ".join(args) or None,)
+    if entry.args == "name":
+        return (" ".join(args) if args else ui.ask(entry.prompt),)
+    if args and not args[0].isdigit(): #"count"
+        return None
+    return (int(args[0]) if args else 1,)
+
+#jalankan satu baris perintah; return False kalau user minta keluar
+def handle_command(manager, ui, user_input):
+    # proses input
+    parts = user_input.replace("'", "").replace('"', "").split() #pisahkan input jadi dua bagian: command & argumen
+    cmd = parts[0].lower() #command utama (misal: create, list, feed)
+    args = parts[1:] #sisanya (nama hewan, dll)
+
+    #catat latency tiap perintah; kalau 'profile on', perintahnya juga diprofile cProfile
+    entry = COMMANDS.get(cmd)
+    label = entry.name if entry else "unknown" #alias dicatat pakai nama aslinya
+    profiler = manager.profiler
+    with manager.metrics.timer("pet_command_duration_seconds", command=label):
+        if profiler is None or label == "profile":
+            return dispatch(manager, ui, cmd, args)
+        with profiler:
+            return dispatch(manager, ui, cmd, args)
+
+#eksekusi berdasarkan perintah user; return False kalau user minta keluar
+def dispatch(manager, ui, cmd, args):
+    entry = COMMANDS.get(cmd)
+    if entry is None:
+        #jika command tidak dikenal
+        ui.say("Unknown command! Type 'help' for list of commands.", "red")
+        return True
+    parsed = parse_args(entry, args, ui)
+    if parsed is None:
+        ui.say(f"Usage: {entry.usage}", "red")
+        return True
+    return entry.handler(manager, ui, *parsed) is not False
+
+#nama asli perintah (alias -> nama), atau cmd apa adanya kalau nggak dikenal
+def resolve_command(cmd):
+    entry = COMMANDS.get(cmd)
+    return entry.name if entry else cmd
+
+@command("help", "?")
+def cmd_help(manager, ui):
+    show_help(ui)
+
+@command("list", "ls", args="text")
+def cmd_list(manager, ui, query):
+    manager.list_pets(query) #menampilkan daftar hewan (bisa pakai where/order by/limit)
+
+@command("create", args="name", prompt="Enter new pet name: ")
+def cmd_create(manager, ui, name):
+    manager.create_pet(name) #buat hewan baru
+
+@command("delete", args="raw")
+def cmd_delete(manager, ui, args):
+    #--yes / -y: hapus tanpa konfirmasi (berguna buat script)
+    confirm = True if any(a in ("--yes", "-y") for a in args) else None
+    args = [a for a in args if a not in ("--yes", "-y")]
+    name = " ".join(args) if args else ui.ask("Enter pet name to delete: ")
+    manager.delete(name, confirm) #hapus hewan dari data
+
+@command("rename", args="raw")
+def cmd_rename(manager, ui, args):
+    #jika user langsung nulis dua nama, pakai langsung
+    if len(args) >= 2:
+        old = args[0]
+        new = " ".join(args[1:])
+    else:
+        #kalau belum ada, minta input manual
+        old = ui.ask("Old name: ")
+        new = ui.ask("New name: ")
+    manager.rename(old, new) #jalankan rename
+
+@command("select", args="name", prompt="Enter pet name to select: ")
+def cmd_select(manager, ui, name):
+    manager.select_pet(name) #pilih hewan yang mau dimainkan
+
+@command("status")
+def cmd_status(manager, ui):
+    manager.show_status() #lihat status hewan aktif
+
+@command("stats", args="text")
+def cmd_stats(manager, ui, query):
+    manager.stats_all(query) #tampilin statistik hewan (bisa pakai where/order by/limit)
+
+#interaksi ke pet aktif, atau mode massal: semua pet (--all) / yang memenuhi kondisi (--where)
+def interact(manager, ui, action, args):
+    if not args or args[0] not in ("--all", "--where"):
+        getattr(manager, action)()
+        return
+    where = " ".join(args[1:]) if args[0] == "--where" else None
+    if args[0] == "--where" and not where:
+        ui.say("Usage: " + action + " --where level>=3", "red")
+    else:
+        manager.bulk(action, where)
+
+@command("feed", args="raw")
+def cmd_feed(manager, ui, args):
+    interact(manager, ui, "feed", args) #kasih makan
+
+@command("play", args="raw")
+def cmd_play(manager, ui, args):
+    interact(manager, ui, "play", args) #bermain dengan hewan
+
+@command("sleep", args="raw")
+def cmd_sleep(manager, ui, args):
+    interact(manager, ui, "sleep", args) #istirahatkan hewan
+
+@command("heal", args="raw")
+def cmd_heal(manager, ui, args):
+    interact(manager, ui, "heal", args) #sembuhkan hewan
+
+@command("tick", args="count", usage="tick [n]")
+def cmd_tick(manager, ui, ticks):
+    manager.tick(ticks) #majukan waktu dunia untuk semua pet
+
+@command("undo", args="count", usage="undo [n]")
+def cmd_undo(manager, ui, steps):
+    manager.undo(steps) #batalkan n perubahan terakhir
+
+@command("redo", args="count", usage="redo [n]")
+def cmd_redo(manager, ui, steps):
+    manager.redo(steps) #ulangi n perubahan yang di-undo
+
+@command("goto", args="raw", usage="goto #n")
+def cmd_goto(manager, ui, args):
+    #lompat ke keadaan sesudah perubahan #n (undo/redo sekaligus)
+    if len(args) != 1 or not args[0].lstrip("#").isdigit():
+        ui.say("Usage: goto #n (numbers from 'history')", "red")
+        return
+    manager.goto(int(args[0].lstrip("#")))
+
+@command("history", args="text")
+def cmd_history(manager, ui, name):
+    manager.show_history(name) #riwayat perubahan (semua / satu pet)
+
+@command("run", args="name", prompt="Script file: ")
+def cmd_run(manager, ui, path):
+    #jalankan file script dari dalam REPL
+    try:
+        script = open(path.strip(), encoding="utf-8")
+    except OSError as e:
+        ui.say(f"Cannot open script: {e}", "red")
+    else:
+        with script:
+            report_throughput(ui, *run_script(manager, ui, script))
+
+@command("save")
+def cmd_save(manager, ui):
+    # simpan semua data ke file json
+    manager.save_data(full=True)
+    ui.say("Data saved ✅", "cyan")
+
+@command("convert", args="raw")
+def cmd_convert(manager, ui, args):
+    #ganti format file snapshot (misal json -> msgpack)
+    fmt = args[0] if args else ui.ask("Format (json/json-pretty/msgpack/struct): ")
+    manager.convert(fmt)
+
+@command("export", args="raw", usage="export FILE [where ...]")
+def cmd_export(manager, ui, args):
+    #tulis roster ke CSV / Parquet / Arrow (format dari ekstensi file) buat dianalisis
+    path = args[0] if args else ui.ask("File to export (.csv/.parquet/.arrow): ")
+    manager.export_pets(path, " ".join(args[1:]) or None)
+
+@command("import", args="name", prompt="File to import (.csv/.parquet/.arrow): ")
+def cmd_import(manager, ui, path):
+    manager.import_pets(path) #upsert pet dari file, disimpan sekali di akhir
+
+@command("backup", args="raw", usage="backup [--full]")
+def cmd_backup(manager, ui, args):
+    #backup incremental (cuma pet yang berubah sejak backup terakhir), --full = semua pet
+    manager.backup(full="--full" in args)
+
+@command("verify")
+def cmd_verify(manager, ui):
+    manager.verify() #cek checksum snapshot, journal & backup terbaru tanpa mengubah apa pun
+
+@command("metrics")
+def cmd_metrics(manager, ui):
+    #metrik runtime dalam format teks Prometheus
+    ui.page((line, None) for line in manager.metrics.render().splitlines())
+
+@command("profile", args="raw")
+def cmd_profile(manager, ui, args):
+    #profile on -> mulai cProfile; profile off [file] -> tampilkan fungsi paling berat
+    if args[:1] == ["on"]:
+        from metrics import CommandProfiler
+        manager.profiler = CommandProfiler()
+        ui.say("Profiling on. Run some commands, then 'profile off'.", "yellow")
+    elif args[:1] == ["off"] and manager.profiler is not None:
+        profiler, manager.profiler = manager.profiler, None
+        path = args[1] if len(args) > 1 else None
+        ui.say(f"Profile of {profiler.commands:,} command(s):", "yellow")
+        ui.say(profiler.report(path=path).rstrip())
+        if path:
+            ui.say(f"Raw stats saved to {path} (open with pstats or snakeviz)", "yellow")
+    else:
+        ui.say("Usage: profile on | profile off [file]", "red")
+
+@command("exit", "quit")
+def cmd_exit(manager, ui):
+    #animasi keluar program
+    ui.say("\nSaving data and saying goodbye...", "yellow")
+    ui.animate(["🐾", "🐾🐾", "🐾🐾🐾"], 0.4, "yellow")
+    ui.say("\nGoodbye! See you next time 👋", "cyan")
+    manager.save_data(full=True) #simpan data sebelum keluar
+    return False
+
+#jalankan banyak perintah sekaligus (file script / stdin) dengan sekali load & sekali save
+#return (jumlah perintah, durasi detik)
+def run_script(manager, ui, lines, flush_every=0):
+    lines = iter(lines)
+    prev_answers, prev_autosave = ui.answers, manager.autosave
+    ui.answers = lines #pertanyaan (misal nama pet) dijawab dari baris berikutnya
+    manager.autosave = False #jangan save tiap perintah, cukup di akhir / tiap N perintah
+
+    count = 0
+    start = time.perf_counter()
+    #try/finally: perintah yang error (atau Ctrl+C) tetap disimpan & autosave/answers dibalikin
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"): #baris kosong & komentar dilewati
+                continue
+            count += 1
+            if not handle_command(manager, ui, line):
+                break
+            if flush_every and count % flush_every == 0:
+                manager.save_data()
+    finally:
+        try:
+            manager.save_data() #flush sisa perubahan
+        finally:
+            manager.autosave = prev_autosave
+            ui.answers = prev_answers
+    elapsed = time.perf_counter() - start
+    return count, elapsed
+
+#PetManager biasa, atau ShardedManager kalau PET_SHARDS > 1 (roster dibagi ke beberapa proses)
+def open_manager(ui):
+    from shard import ShardedManager, shards_from_env
+    from pet_manager import PetManager # import class utama untuk mengatur logika hewan
+    shards = shards_from_env()
+    if shards > 1:
+        try:
+            return ShardedManager(shards, ui=ui)
+        except ValueError as e: #jumlah shard beda dengan roster yang sudah dibagi
+            sys.exit(str(e))
+    from data_handler import CorruptStoreError
+    try:
+        return PetManager(ui=ui)
+    except CorruptStoreError as e: #snapshot rusak & nggak ada backup: jangan mulai dengan roster kosong
+        sys.exit(f"{e} Move it away to start with an empty roster.")
+
+#tampilkan throughput hasil run_script
+def report_throughput(ui, count, elapsed):
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    ui.say(f"Ran {count:,} commands in {elapsed:.2f}s ({rate:,.0f} commands/sec)", "yellow")
+
+#mode "python main.py run script.txt [--flush-every N] [--quiet]" ("-" = baca dari stdin)
+def script_main(argv):
+    usage = "Usage: main.py run FILE [--flush-every N] [--quiet]"
+    args = [a for a in argv if a != "--headless"]
+    flush_every = 0
+    if "--flush-every" in args:
+        i = args.index("--flush-every")
+        if i + 1 >= len(args) or not args[i + 1].isdigit():
+            print(usage, file=sys.stderr)
+            return 2
+        flush_every = int(args[i + 1])
+        del args[i:i + 2]
+    quiet = "--quiet" in args
+    args = [a for a in args if a != "--quiet"]
+    if len(args) != 1:
+        print(usage, file=sys.stderr)
+        return 2
+
+    #script selalu headless; --quiet buang output per perintah, ringkasan tetap tampil
+    ui = get_ui(headless=True)
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        manager = open_manager(HeadlessUI(devnull) if quiet else ui)
+        source = sys.stdin if args[0] == "-" else open(args[0], encoding="utf-8")
+        with source:
+            count, elapsed = run_script(manager, manager.ui, source, flush_every)
+        manager.close()
+    report_throughput(ui, count, elapsed)
+    return 0
+
+#mode "python main.py convert FORMAT [FILE]": migrasi file snapshot tanpa masuk REPL
+def convert_main(argv):
+    from data_handler import DATA_FILE, convert_file
+    from formats import FormatError
+
+    args = [a for a in argv if a != "--headless"]
+    if len(args) not in (1, 2):
+        print("Usage: main.py convert FORMAT [FILE]", file=sys.stderr)
+        return 2
+    path = args[1] if len(args) == 2 else DATA_FILE
+    try:
+        old_fmt, old_size, new_size = convert_file(path, args[0].lower())
+    except (FormatError, OSError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{path}: {old_fmt} ({old_size:,} bytes) -> {args[0].lower()} ({new_size:,} bytes)")
+    return 0
+
+#perintah yang argumennya nama pet (buat tab completion)
+PET_NAME_COMMANDS = ("select", "delete", "rename", "history")
+
+#tab completion di REPL: kata pertama = nama perintah, argumen pertama perintah di atas = nama pet
+def setup_completion(manager):
+    try:
+        import readline #nggak ada di semua platform (misal Windows tanpa pyreadline)
+    except ImportError:
+        return
+    complete_names = getattr(manager, "complete_names", None)
+
+    def complete(text, state):
+        if state == 0:
+            words = readline.get_line_buffer()[:readline.get_begidx()].split()
+            if not words:
+                complete.options = sorted(key for key in COMMANDS if key.startswith(text))
+            elif len(words) == 1 and resolve_command(words[0].lower()) in PET_NAME_COMMANDS and complete_names:
+                complete.options = complete_names(text)
+            else:
+                complete.options = []
+        return complete.options[state] if state < len(complete.options) else None
+
+    readline.set_completer(complete)
+    readline.set_completer_delims(" ")
+    readline.parse_and_bind("tab: complete")
 
 #fungsi utama tempat program berjalan secara interaktif
-def main():
-    manager = PetManager() #membuat instance petmanager untuk mengatur semua hewan
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "run":
+        return script_main(argv[1:])
+    if argv and argv[0] == "convert":
+        return convert_main(argv[1:])
+    if argv and argv[0] == "serve":
+        from server import serve_main #server asyncio cuma di-load kalau dipakai
+        return serve_main(argv[1:])
+    if argv and argv[0] == "simulate":
+        from simulate import simulate_main #simulasi balancing (butuh NumPy)
+        return simulate_main(argv[1:])
+
+    from autosave import AUTOSAVE_INTERVAL # interval autosave background (0 = simpan tiap perintah)
+    from metrics import exporter_from_env # export metrik (PET_METRICS_FILE / PET_METRICS_PORT)
+
+    ui = get_ui(headless_requested(argv)) #mode headless: tanpa warna & tanpa delay
+    manager = open_manager(ui) #membuat instance petmanager untuk mengatur semua hewan
+    setup_completion(manager) #tab buat melengkapi perintah & nama pet
+    if AUTOSAVE_INTERVAL > 0:
+        manager.start_autosave() #simpan di background thread, perintah nggak nunggu disk
+    exporter = exporter_from_env(manager.metrics) #export metrik ke file / http kalau diminta lewat env
 
     #menampilkan teks pembuka dengan efek animasi
-    slow_print(Fore.CYAN + "🐾 Booting up Virtual Pet CLI v2... Loading cuddles ❤️", 0.03)
-    time.sleep(0.3) #jeda singkat biar efeknya halus
-    print(Fore.CYAN + "Welcome to Virtual Pet CLI v2 🐾 (Cute Mode)")
-    print(Fore.YELLOW + "Type 'help' to see available commands.\n")
+    ui.slow_print("🐾 Booting up Virtual Pet CLI v2... Loading cuddles ❤️", "cyan", 0.03)
+    ui.pause(0.3) #jeda singkat biar efeknya halus
+    ui.say("Welcome to Virtual Pet CLI v2 🐾 (Cute Mode)", "cyan")
+    ui.say("Type 'help' to see available commands.\n", "yellow")
 
     #loop utama (program berjalan terus)
     while True:
         try:
             #minta input dari user
-            user_input = input(Fore.GREEN + ">> ").strip()
+            user_input = ui.prompt(">> ").strip()
         except (KeyboardInterrupt, EOFError):
             #jika user menekan ctl+c atau ctrl+z program berhenti dengan aman
-            print(Fore.YELLOW + "\nDetected exit signal. Saving and quitting...")
-            manager.save_data() #buat nyimpen data sebelum keluar
+            ui.say("\nDetected exit signal. Saving and quitting...", "yellow")
+            manager.save_data(full=True) #buat nyimpen data sebelum keluar
             break
 
         #jika input kosong, lanjut ke loop berikutnya
         if not user_input:
             continue
 
-        # proses input
-        parts = user_input.replace("'", "").replace('"', "").split() #pisahkan input jadi dua bagian: command & argumen
-        cmd = parts[0].lower() #command utama (misal: create, list, feed)
-        args = parts[1:] #sisanya (nama hewan, dll)
-
-
-        #eksekusi berdasarkan perintah user
-        if cmd == "help":
-            show_help()
-
-        elif cmd == "list":
-            manager.list_pets() #menampilkan daftar semua hewan
-
-        elif cmd == "create":
-            #jika user tidak menulis nama di command, minta input tambahan
-            name = " ".join(args) if args else input("Enter new pet name: ")
-            manager.create_pet(name) #buat hewan baru
-
-        elif cmd == "delete":
-            name = " ".join(args) if args else input("Enter pet name to delete: ")
-            manager.delete(name) #hapus hewan dari data
-
-        elif cmd == "rename":
-            #jika user langsung nulis dua nama, pakai langsung
-            if len(args) >= 2:
-                old = args[0]
-                new = " ".join(args[1:])
-            else:
-                #kalau belum ada, minta input manual
-                old = input("Old name: ")
-                new = input("New name: ")
-            manager.rename(old, new) #jalankan rename
-
-        elif cmd == "select":
-            name = " ".join(args) if args else input("Enter pet name to select: ")
-            manager.select_pet(name) #pilih hewan yang mau dimainkan
-
-        elif cmd == "status":
-            manager.show_status() #lihat status hewan aktif
-
-        elif cmd == "stats":
-            manager.stats_all() #tampilin statistik semua hewan
-
-        elif cmd == "feed":
-            manager.feed() #kasih makan
-
-        elif cmd == "play":
-            manager.play() #bermain dengan hewan
-
-        elif cmd == "sleep":
-            manager.sleep() #istirahatkan hewan
-
-        elif cmd == "heal":     
-            manager.heal() #sembuhkan hewan
-
-        elif cmd == "save":
-            # simpan semua data ke file json
-            manager.save_data()
-            print(Fore.CYAN + "Data saved ✅")
-
-        elif cmd == "exit" or cmd == "quit":
-            #animasi keluar program
-            print(Fore.YELLOW + "\nSaving data and saying goodbye...")
-            for frame in ["🐾", "🐾🐾", "🐾🐾🐾"]:
-                print(Fore.YELLOW + frame, end="\r", flush=True)
-                time.sleep(0.4)
-            print(Fore.CYAN + "\nGoodbye! See you next time 👋")
-            manager.save_data() #simpan data sebelum keluar
+        if not handle_command(manager, ui, user_input):
             break
-        else:
-            #jika command tidak dikenal
-            print(Fore.RED + "Unknown command! Type 'help' for list of commands.")
+
+    manager.close() #tunggu penulisan data di background selesai
+    if exporter is not None:
+        exporter.stop()
 
 
 #memastikan program hanya dijalankan jika file ini langsung dieksekusi (bukan di import dari file lain)
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
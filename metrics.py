@@ -0,0 +1,288 @@
+# ============================================================================
+# METRICS - Metrik runtime (format teks Prometheus) & profiler perintah
+# ============================================================================
+# Setiap PetManager punya satu Metrics (manager.metrics) yang mencatat:
+#   - latency per perintah (histogram)
+#   - durasi save_data per jenis (full / journal) & total byte yang ditulis storage
+#   - durasi load saat start & jumlah pet
+#   - jumlah event (bonus, kelaparan, level up)
+#
+# Lihat dari REPL dengan perintah 'metrics', atau export otomatis:
+#   PET_METRICS_FILE=/path/pets.prom  -> ditulis ulang tiap PET_METRICS_INTERVAL detik
+#                                       (cocok untuk textfile collector node_exporter)
+#   PET_METRICS_PORT=9464             -> endpoint HTTP /metrics di 127.0.0.1 untuk di-scrape
+
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# http.server, cProfile & pstats di-import saat exporter / profiler dipakai:
+# ketiganya paling berat di startup CLI padahal jarang dinyalakan
+
+FILE_ENV = "PET_METRICS_FILE"
+PORT_ENV = "PET_METRICS_PORT"
+INTERVAL_ENV = "PET_METRICS_INTERVAL"
+DEFAULT_INTERVAL = 15.0
+
+# Batas bucket histogram (detik)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# nama metrik -> (tipe, keterangan)
+METRIC_HELP = {
+    "pet_command_duration_seconds": ("histogram", "Time spent handling one command."),
+    "pet_save_duration_seconds": ("histogram", "Time spent in save_data, by kind (full snapshot or journal)."),
+    "pet_storage_written_bytes_total": ("counter", "Bytes written by the storage backend, by file."),
+    "pet_save_conflicts_total": ("counter", "Saves retried because another process changed the same pets."),
+    "pet_load_duration_seconds": ("gauge", "Time PetManager took to load the roster at startup."),
+    "pet_roster_size": ("gauge", "Number of pets in the roster."),
+    "pet_events_total": ("counter", "Random events and level ups triggered, by event and action."),
+}
+
+# Jumlah fungsi yang ditampilkan 'profile off'
+PROFILE_TOP = 20
+
+
+class Histogram:
+    """
+    Histogram kumulatif ala Prometheus: counts[i] = jumlah nilai <= buckets[i].
+    """
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(LATENCY_BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # Cukup naikkan satu bucket; dijumlahkan kumulatif saat render
+        i = bisect_left(LATENCY_BUCKETS, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Penampung metrik untuk satu PetManager. Aman dipanggil dari banyak thread
+    (REPL, autosave, thread pool server).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}      # (nama, labels) -> angka (counter / gauge)
+        self._histograms = {}  # (nama, labels) -> Histogram
+        # Fungsi tanpa argumen yang return [(nama, labels dict, nilai)], dipanggil saat render
+        self.collectors = []
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._values[(name, tuple(sorted(labels.items())))] = value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def timer(self, name, **labels):
+        """
+        Context manager: `with metrics.timer("pet_save_duration_seconds", kind="full"): ...`
+        """
+        return _Timer(self, name, labels)
+
+    def render(self):
+        """
+        Semua metrik dalam format teks Prometheus (text/plain; version=0.0.4).
+        """
+        with self._lock:
+            values = dict(self._values)
+            histograms = {
+                key: (list(h.counts), h.sum, h.count) for key, h in self._histograms.items()
+            }
+        for collect in self.collectors:
+            for name, labels, value in collect():
+                values[(name, tuple(sorted(labels.items())))] = value
+
+        lines = []
+        for name, (kind, text) in METRIC_HELP.items():
+            samples = [(labels, value) for (n, labels), value in values.items() if n == name]
+            series = [(labels, h) for (n, labels), h in histograms.items() if n == name]
+            if not samples and not series:
+                continue
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(samples):
+                lines.append(f"{name}{_labels(labels)} {value:g}")
+            for labels, (counts, total, count) in sorted(series):
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, counts):
+                    cumulative += n
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', f'{bound:g}'),))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{_labels(labels)} {total:.6f}")
+                lines.append(f"{name}_count{_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class _Timer:
+    __slots__ = ("metrics", "name", "labels", "start")
+
+    def __init__(self, metrics, name, labels):
+        self.metrics, self.name, self.labels = metrics, name, labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    body = ",".join(
+        f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for key, value in labels
+    )
+    return "{" + body + "}"
+
+
+# ============================================================================
+# EXPORTER (file / HTTP)
+# ============================================================================
+
+class MetricsExporter:
+    """
+    Export Metrics ke file (ditulis ulang berkala, atomik) dan/atau endpoint
+    HTTP lokal. Dua-duanya jalan di thread daemon.
+    """
+
+    def __init__(self, metrics, path=None, port=None, interval=DEFAULT_INTERVAL, host="127.0.0.1"):
+        self.metrics = metrics
+        self.path = path
+        self.port = port
+        self.host = host
+        self.interval = interval
+        self._stop = threading.Event()
+        self._writer = None
+        self._http = None
+
+    def start(self):
+        if self.path:
+            self._writer = threading.Thread(target=self._write_loop, name="pet-metrics", daemon=True)
+            self._writer.start()
+        if self.port is not None:
+            from http.server import ThreadingHTTPServer
+            self._http = ThreadingHTTPServer((self.host, self.port), _handler(self.metrics))
+            self._http.daemon_threads = True
+            threading.Thread(target=self._http.serve_forever, name="pet-metrics-http", daemon=True).start()
+        return self
+
+    @property
+    def address(self):
+        return self._http.server_address if self._http else None
+
+    def write_file(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.metrics.render())
+        os.replace(tmp, self.path)
+
+    def _write_loop(self):
+        while True:
+            self.write_file()
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self):
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join()
+            self.write_file()  # angka terakhir sebelum program keluar
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+
+
+def _handler(metrics):
+    from http.server import BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = metrics.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # jangan nyampah ke terminal REPL
+
+    return Handler
+
+
+def exporter_from_env(metrics):
+    """
+    Jalankan MetricsExporter kalau PET_METRICS_FILE / PET_METRICS_PORT di-set.
+    Return exporter-nya, atau None.
+    """
+    path = os.environ.get(FILE_ENV) or None
+    port = os.environ.get(PORT_ENV) or None
+    if path is None and port is None:
+        return None
+    interval = float(os.environ.get(INTERVAL_ENV, DEFAULT_INTERVAL))
+    return MetricsExporter(metrics, path, int(port) if port else None, interval).start()
+
+
+# ============================================================================
+# PROFILER
+# ============================================================================
+
+class CommandProfiler:
+    """
+    cProfile yang cuma aktif selama perintah dijalankan (bukan saat nunggu input).
+    """
+
+    def __init__(self):
+        import cProfile
+
+        self.profile = cProfile.Profile()
+        self.commands = 0
+
+    def __enter__(self):
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profile.disable()
+        self.commands += 1
+
+    def report(self, top=PROFILE_TOP, path=None):
+        """
+        Teks fungsi paling berat (urut waktu kumulatif). path: simpan juga data
+        mentahnya (buka dengan pstats / snakeviz).
+        """
+        import io
+        import pstats
+
+        if path:
+            self.profile.dump_stats(path)
+        out = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(top)
+        return out.getvalue()
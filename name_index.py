@@ -0,0 +1,159 @@
+# ============================================================================
+# NAME INDEX - Daftar nama pet yang selalu urut, untuk prefix & "did you mean"
+# ============================================================================
+# Nama disimpan di satu list urut (bisect), jadi:
+#   - prefix "mi*"  : bisect ke awal prefix, ambil nama berikutnya selama masih
+#                     diawali "mi" -> O(log n + jumlah hasil)
+#   - did you mean  : list urut = trie implisit (semua nama dengan prefix yang
+#                     sama berdempetan). Trie-nya ditelusuri sambil menghitung
+#                     edit distance (Levenshtein) per prefix, cabang yang sudah
+#                     pasti lewat batas jarak langsung dipotong. Yang dikunjungi
+#                     cuma prefix yang dekat dengan nama yang dicari, bukan semua nama.
+#
+# Index baru dibangun saat pertama dibutuhkan (O(n log n) sekali), lalu
+# di-update per pet setiap kali PetManager menandai pet berubah (_mark),
+# sama seperti pet_index.py.
+
+from bisect import bisect_left
+
+# Maksimal saran "did you mean" & hasil prefix yang ditampilkan
+SUGGEST_LIMIT = 5
+# Maksimal nama yang ditawarkan tab completion (roster besar bisa jutaan nama)
+COMPLETE_LIMIT = 200
+# Batas edit distance saran: nama pendek cukup beda 1 huruf, yang panjang boleh 2
+SHORT_NAME = 4
+MAX_DISTANCE = 2
+
+_LAST_CHAR = chr(0x10FFFF)
+
+
+class NameIndex:
+    """
+    Nama semua pet dalam list urut. Semua method dipanggil dengan manager.lock
+    dipegang (kecuali completion readline, yang cuma baca).
+    """
+
+    def __init__(self):
+        self._names = None  # None = belum dibangun
+
+    @property
+    def ready(self):
+        return self._names is not None
+
+    def __len__(self):
+        return len(self._names or ())
+
+    def ensure(self, data):
+        if self._names is None:
+            self._names = sorted(data)
+
+    def invalidate(self):
+        # Roster diganti sekaligus (undo operasi massal) -> bangun ulang nanti
+        self._names = None
+
+    def touch(self, data, name):
+        """
+        Sinkronkan index untuk satu pet setelah ditambah / dihapus / di-rename.
+        """
+        names = self._names
+        if names is None:
+            return
+        i = bisect_left(names, name)
+        indexed = i < len(names) and names[i] == name
+        if name in data:
+            if not indexed:
+                names.insert(i, name)
+        elif indexed:
+            del names[i]
+
+    def prefix(self, prefix, limit=None):
+        """
+        Nama yang diawali `prefix`, urut abjad (maksimal `limit`).
+        """
+        names = self._names
+        i = bisect_left(names, prefix)
+        found = []
+        while i < len(names) and names[i].startswith(prefix):
+            if limit is not None and len(found) >= limit:
+                break
+            found.append(names[i])
+            i += 1
+        return found
+
+    def count_prefix(self, prefix):
+        # Jumlah nama dengan prefix ini tanpa bikin list-nya: dua bisect
+        names = self._names
+        return bisect_left(names, prefix + _LAST_CHAR) - bisect_left(names, prefix)
+
+    def suggest(self, word, limit=SUGGEST_LIMIT, max_distance=None):
+        """
+        Nama lain yang paling mirip `word` (edit distance <= batas), urut abjad.
+        Jarak 1 dicari dulu; jarak 2 cuma kalau jarak 1 nggak ketemu apa-apa.
+        """
+        if max_distance is None:
+            max_distance = 1 if len(word) <= SHORT_NAME else MAX_DISTANCE
+        for distance in range(1, max_distance + 1):
+            found = self._within(word, distance, limit)
+            if found:
+                return found
+        return []
+
+    def _within(self, word, distance, limit):
+        """
+        Maksimal `limit` nama (selain word sendiri) dengan edit distance <= distance,
+        urut abjad. Node trie = (prefix, lo, hi, row): names[lo:hi] diawali prefix,
+        row = baris tabel Levenshtein prefix vs word (row[j] = jarak ke word[:j]).
+        Anak ditumpuk terbalik, jadi nama dikunjungi urut abjad & bisa berhenti
+        begitu dapat `limit` nama.
+        """
+        names = self._names
+        cap = distance + 1
+        found = []
+        stack = [("", 0, len(names), [min(j, cap) for j in range(len(word) + 1)])]
+        while stack:
+            prefix, lo, hi, row = stack.pop()
+            depth = len(prefix)
+            if lo < hi and len(names[lo]) == depth:
+                # Nama yang sama persis dengan prefix selalu paling depan di range-nya
+                if row[-1] <= distance and names[lo] != word:
+                    found.append(names[lo])
+                    if len(found) >= limit:
+                        return found
+                lo += 1
+            if min(row) >= distance:
+                # Jarak sudah habis: sisa nama harus persis word[j:] untuk kolom j yang
+                # masih <= distance, jadi cukup bisect nama-nama itu (tanpa turun per huruf)
+                for name in sorted({prefix + word[j:] for j in range(len(word)) if row[j] <= distance}):
+                    i = bisect_left(names, name, lo, hi)
+                    if i < hi and names[i] == name and name != word:
+                        found.append(name)
+                        if len(found) >= limit:
+                            return found
+                continue
+            # Masih ada sisa jarak: huruf apa pun bisa jadi sisipan / ganti -> semua anak
+            children = self._children(prefix, lo, hi)
+            # Sel di luar diagonal |i - j| <= distance pasti > distance, jadi cukup diisi
+            # cap; yang dihitung cuma pita di sekitar diagonal (band Ukkonen)
+            first, last = max(1, depth + 1 - distance), min(len(word), depth + 1 + distance)
+            for char, start, end in reversed(list(children)):
+                new = [cap] * len(row)
+                new[0] = min(row[0] + 1, cap)
+                best = new[0]
+                for j in range(first, last + 1):
+                    value = min(new[j - 1] + 1, row[j] + 1, row[j - 1] + (word[j - 1] != char), cap)
+                    new[j] = value
+                    if value < best:
+                        best = value
+                if best <= distance:
+                    stack.append((prefix + char, start, end, new))
+        return found
+
+    def _children(self, prefix, lo, hi):
+        # (huruf, lo, hi) tiap anak node prefix di names[lo:hi]
+        names = self._names
+        depth = len(prefix)
+        while lo < hi:
+            char = names[lo][depth]
+            end = hi if char == _LAST_CHAR else bisect_left(names, prefix + chr(ord(char) + 1), lo, hi)
+            yield char, lo, end
+            lo = end
@@ -0,0 +1,222 @@
+# ============================================================================
+# PET INDEX - Index sekunder (level, health, hunger) untuk query list/stats
+# ============================================================================
+# Tiap index = daftar (nilai, nama) yang selalu urut, dicari pakai bisect.
+# Jadi "health < 30" atau "order by level desc limit 10" cukup O(log n) +
+# jumlah hasil, nggak perlu scan semua pet.
+#
+# Isinya dipecah jadi blok-blok kecil (list of list, maks ~2 x CHUNK_SIZE per
+# blok) + list nilai maksimum tiap blok. insort ke satu list besar itu O(n)
+# karena semua elemen di belakangnya digeser; di sini cuma satu blok yang
+# digeser, jadi add/remove per pet ~O(log n + CHUNK_SIZE) walau roster 1 juta.
+#
+# Index baru dibangun saat query pertama yang butuh (O(n log n) sekali), lalu
+# di-update per pet setiap kali PetManager menandai pet berubah (_mark).
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import accumulate
+
+# Field yang di-index
+INDEXED_FIELDS = ("level", "health", "hunger")
+
+# Ukuran blok awal; blok dipecah dua kalau sudah lebih dari 2x ini
+CHUNK_SIZE = 512
+
+
+class StatIndex:
+    """
+    Index urut untuk satu field: [(nilai, nama), ...], disimpan per blok.
+    Posisi (lo, hi) dari bounds() adalah posisi global di urutan itu.
+    """
+
+    def __init__(self, field, keys=(), chunk_size=CHUNK_SIZE):
+        self.field = field
+        self._chunk = chunk_size
+        keys = sorted(keys)
+        self._lists = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+        self._maxes = [chunk[-1] for chunk in self._lists]
+        self._len = len(keys)
+        self._offsets = None  # posisi awal tiap blok, dihitung ulang kalau perlu
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for chunk in self._lists:
+            yield from chunk
+
+    def add(self, name, value):
+        key = (value, name)
+        lists, maxes = self._lists, self._maxes
+        if not lists:
+            lists.append([key])
+            maxes.append(key)
+        else:
+            i = bisect_left(maxes, key)
+            if i == len(maxes):
+                i -= 1
+                lists[i].append(key)
+                maxes[i] = key
+            else:
+                insort(lists[i], key)
+            if len(lists[i]) > 2 * self._chunk:
+                chunk = lists[i]
+                half = len(chunk) // 2
+                lists[i:i + 1] = [chunk[:half], chunk[half:]]
+                maxes[i:i + 1] = [chunk[half - 1], chunk[-1]]
+        self._len += 1
+        self._offsets = None
+
+    def remove(self, name, value):
+        key = (value, name)
+        lists, maxes = self._lists, self._maxes
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            return
+        chunk = lists[i]
+        j = bisect_left(chunk, key)
+        if j == len(chunk) or chunk[j] != key:
+            return
+        del chunk[j]
+        if chunk:
+            maxes[i] = chunk[-1]
+        else:
+            del lists[i], maxes[i]
+        self._len -= 1
+        self._offsets = None
+
+    def _starts(self):
+        if self._offsets is None:
+            self._offsets = [0, *accumulate(len(chunk) for chunk in self._lists)][:-1]
+        return self._offsets
+
+    def _position(self, key):
+        # Versi global dari bisect_left(semua_key, key)
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return self._starts()[i] + bisect_left(self._lists[i], key)
+
+    def _locate(self, pos):
+        # Posisi global -> (nomor blok, posisi di blok)
+        if not self._lists:
+            return 0, 0
+        starts = self._starts()
+        i = bisect_right(starts, pos) - 1
+        return i, pos - starts[i]
+
+    def bounds(self, op, value):
+        """
+        Posisi (lo, hi) di index untuk kondisi `field op value` (nilai int).
+        Return None kalau operator-nya nggak bisa pakai index (misal !=).
+        Trik: (value,) selalu lebih kecil dari (value, nama apapun).
+        """
+        position = self._position
+        if op == "<":
+            return 0, position((value,))
+        if op == "<=":
+            return 0, position((value + 1,))
+        if op == ">":
+            return position((value + 1,)), self._len
+        if op == ">=":
+            return position((value,)), self._len
+        if op in ("=", "=="):
+            return position((value,)), position((value + 1,))
+        return None
+
+    def names(self, lo=0, hi=None, descending=False):
+        """
+        Nama pet di posisi lo..hi, urut nilai (naik / turun).
+        """
+        hi = self._len if hi is None else hi
+        remaining = hi - lo
+        lists = self._lists
+        if descending:
+            i, j = self._locate(hi)
+            while remaining > 0:
+                if j == 0:
+                    i -= 1
+                    j = len(lists[i])
+                    continue
+                chunk = lists[i]
+                stop = max(j - remaining, 0)
+                for k in range(j - 1, stop - 1, -1):
+                    yield chunk[k][1]
+                remaining -= j - stop
+                j = 0
+        else:
+            i, j = self._locate(lo)
+            while remaining > 0:
+                part = lists[i][j:j + remaining]
+                for key in part:
+                    yield key[1]
+                remaining -= len(part)
+                i += 1
+                j = 0
+
+
+class PetIndexes:
+    """
+    Kumpulan StatIndex untuk INDEXED_FIELDS, plus nilai terakhir tiap pet
+    (biar update cukup tahu nama pet-nya saja).
+    """
+
+    def __init__(self, fields=INDEXED_FIELDS):
+        self.fields = fields
+        self._indexes = None  # None = belum dibangun
+        self._values = {}     # nama -> tuple nilai field yang sedang ada di index
+
+    @property
+    def ready(self):
+        return self._indexes is not None
+
+    def get(self, field):
+        return self._indexes.get(field) if self._indexes else None
+
+    def ensure(self, data):
+        """
+        Bangun semua index dari data kalau belum ada.
+        """
+        if self._indexes is not None:
+            return
+        values = {
+            name: tuple(attrs[field] for field in self.fields)
+            for name, attrs in data.items()
+        }
+        self._indexes = {
+            field: StatIndex(field, ((vals[pos], name) for name, vals in values.items()))
+            for pos, field in enumerate(self.fields)
+        }
+        self._values = values
+
+    def invalidate(self):
+        """
+        Buang semua index (dibangun ulang di query berikutnya). Dipakai kalau
+        banyak pet berubah sekaligus dan nggak jelas yang mana (tick vectorized).
+        """
+        self._indexes = None
+        self._values = {}
+
+    def touch(self, data, name):
+        """
+        Sinkronkan index untuk satu pet setelah berubah / ditambah / dihapus.
+        """
+        if self._indexes is None:
+            return  # index belum pernah dipakai, nggak ada yang perlu di-update
+        attrs = data.get(name)
+        new = None if attrs is None else tuple(attrs[field] for field in self.fields)
+        old = self._values.get(name)
+        if old == new:
+            return
+        for pos, field in enumerate(self.fields):
+            if old is not None and new is not None and old[pos] == new[pos]:
+                continue  # field ini nggak berubah
+            index = self._indexes[field]
+            if old is not None:
+                index.remove(name, old[pos])
+            if new is not None:
+                index.add(name, new[pos])
+        if new is None:
+            del self._values[name]
+        else:
+            self._values[name] = new
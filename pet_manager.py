@@ -3,13 +3,81 @@
 # Sistem manajemen hewan peliharaan virtual dengan fitur leveling & stats
 # ============================================================================
 
-from colorama import Fore, Style
-import time, os, random
-from data_handler import load_data, save_data
+import gc, os, threading, time
+from contextlib import contextmanager, nullcontext
+from itertools import repeat
+from data_handler import open_storage, ConflictError
+from formats import FormatError, check_format
+from pet_table import PetTable
+from query import parse_where, parse_query, execute, QueryError
+from pet_index import PetIndexes
+from name_index import NameIndex, SUGGEST_LIMIT, COMPLETE_LIMIT
+from events import make_rng, roll_events, describe, event_name
+from metrics import Metrics
+from history import History, restore_checkpoint, world_label
+from backup import BackupStore, BackupError, BACKUP_INTERVAL, backup_dir, encode_records, wants_full
+from ui import get_ui
 
 # Konstanta untuk batas maksimal stat (0-100%)
 MAX_STAT = 100
 
+# Stat awal pet baru (juga dipakai simulate.py)
+NEW_PET_STATS = {"hunger": 50, "energy": 50, "happy": 50, "health": 100, "level": 1, "exp": 0}
+
+# Efek tiap interaksi: (perubahan stat, EXP yang didapat)
+ACTION_EFFECTS = {
+    "feed": ({"hunger": 20}, 10),
+    "play": ({"happy": 20, "energy": -10}, 15),
+    "sleep": ({"energy": 30, "hunger": -10}, 8),
+    "heal": ({"health": 25}, 12),
+}
+
+# Random event (bonus & kelaparan) ada di tabel events.py
+
+# Berapa kali save dicoba ulang kalau terus bentrok dengan proses lain
+SAVE_RETRIES = 5
+
+# Penanda "base pet nggak diketahui" (beda dengan None = pet belum ada)
+_NO_BASE = object()
+
+# Leveling: EXP per level & efek stat setiap naik level
+LEVEL_UP_EXP = 100
+LEVEL_UP_BONUS = {"hunger": -5, "happy": 5}
+
+# World tick: penurunan stat & EXP "umur" untuk setiap pet per tick
+TICK_DECAY = {"hunger": -3, "energy": -2, "happy": -2}
+TICK_EXP = 1
+
+# Batas nilai tiap field pet yang dimasukkan dari luar (import), None = tanpa batas atas.
+# Level maksimal ikut kolom int32 PetTable.
+FIELD_LIMITS = {
+    "hunger": (0, MAX_STAT), "energy": (0, MAX_STAT), "happy": (0, MAX_STAT),
+    "health": (0, MAX_STAT), "level": (1, 2**31 - 1), "exp": (0, LEVEL_UP_EXP - 1), "ts": (0, None),
+}
+
+# Decay offline: setiap DECAY_STEP detik sejak stat pet terakhir dihitung, stat
+# turun sebesar TICK_DECAY. Dihitung saat pet dibaca (lihat decay_update), jadi
+# nggak ada loop background & pet yang nggak pernah dibaca nggak makan biaya.
+# Atur lewat env PET_DECAY_STEP (detik), 0 = decay mati.
+DECAY_STEP = int(os.environ.get("PET_DECAY_STEP", 1800))
+
+# Tampilan tiap interaksi (murni UI, nggak ngaruh ke stat):
+# (teks pembuka, warna, frame animasi, delay per frame, warna frame, teks penutup, warna penutup)
+ACTION_SCENES = {
+    "feed": ("\nFeeding {name} 🍖", "yellow",
+             ["(˶ᵔᴗᵔ)っ🍗", "( ˘▽˘)っ🍗", "(๑>◡<๑)っ🍖"], 0.5, "green",
+             "\nYummy! That was delicious 😋", "green"),
+    "play": ("\nPlaying with {name} ⚽", "magenta",
+             ["(•ᴗ•)ノ⚽", "(⚽>ᴗ<)ノ", "ヽ(>ᴗ<⚽)ノ"], 0.45, "magenta",
+             "\nThat was fun! 😄", "magenta"),
+    "sleep": ("\n{name} is sleeping... 😴", "blue",
+              ["(˘ω˘) z", "(˘ω˘) zz", "(˘ω˘) zzz"], 0.8, "blue",
+              "\nAll rested up! 🌞", "cyan"),
+    "heal": ("\nHealing {name} ✨", "lightgreen",
+             ["💖", "💫", "✨", "💫", "💖"], 0.35, "lightgreen",
+             "\nFeeling much better now! ❤️‍🩹", "lightgreen"),
+}
+
 
 # ============================================================================
 # PROGRESS BAR FUNCTION
@@ -24,19 +92,263 @@ def progress_bar(value, length=20):
     Args:
         value: Nilai stat (0-100)
         length: Panjang bar dalam karakter (default 20)
-    
+
     Returns:
         String visual progress bar dengan persentase
     """
     # Pastikan nilai berada di range 0-100
     value = max(0, min(MAX_STAT, int(value)))
     
-    # Hitung jumlah karakter terisi dan kosong
-    filled = int((value / MAX_STAT) * length)
-    empty = length - filled
+    # Cuma ada 101 kemungkinan bar per panjang, jadi diambil dari tabel saja
+    bars = _BAR_CACHE.get(length)
+    if bars is None:
+        bars = _BAR_CACHE[length] = _build_bars(length)
+    return bars[value]
+
+
+# Cache tabel bar: panjang bar -> tuple 101 string (index = nilai stat)
+_BAR_CACHE = {}
+
+
+def _build_bars(length):
+    bars = []
+    for value in range(MAX_STAT + 1):
+        # Hitung jumlah karakter terisi dan kosong
+        filled = int((value / MAX_STAT) * length)
+        empty = length - filled
+        
+        # Gabungkan karakter █ (terisi) dan ░ (kosong)
+        bars.append("[" + "█" * filled + "░" * empty + f"] {value}%")
+    return tuple(bars)
+
+
+# ============================================================================
+# OFFLINE DECAY
+# ============================================================================
+# Field "ts" tiap pet = detik unix sampai kapan decay sudah diterapkan ke stat-nya.
+# ts 0 (data lama) = jam-nya belum jalan, mulai dihitung di interaksi berikutnya.
+# Alasan def: Dipakai tampilan (show_status, list, stats) & interaksi
+def decay_update(pet, now=None):
+    """
+    Hitung decay offline satu pet tanpa mengubah pet-nya.
     
-    # Gabungkan karakter █ (terisi) dan ░ (kosong)
-    return "[" + "█" * filled + "░" * empty + f"] {value}%"
+    Setiap step penurunannya sama (TICK_DECAY) dan cuma di-clamp di 0,
+    jadi n step = stat + n * delta: satu kali hitung, berapapun lamanya
+    pet ditinggal.
+    
+    Returns:
+        Dict field -> nilai baru (termasuk "ts"), kosong kalau belum genap satu step.
+    """
+    ts = pet.get("ts", 0)
+    if DECAY_STEP <= 0 or not ts:
+        return {}
+    
+    now = time.time() if now is None else now
+    steps = int(now - ts) // DECAY_STEP
+    if steps <= 0:
+        return {}
+    
+    update = {
+        stat: max(0, min(MAX_STAT, pet[stat] + delta * steps))
+        for stat, delta in TICK_DECAY.items()
+    }
+    # ts cuma maju per step penuh, sisa waktunya tetap terhitung di baca berikutnya
+    update["ts"] = ts + steps * DECAY_STEP
+    return update
+
+
+def decayed(pet, now=None):
+    """
+    Pet setelah decay, untuk ditampilkan saja: copy dict kalau ada yang
+    berubah, atau pet itu sendiri kalau belum. Data aslinya nggak diubah.
+    """
+    update = decay_update(pet, now)
+    return {**pet, **update} if update else pet
+
+
+# ============================================================================
+# RENDER LIST / STATS
+# ============================================================================
+# Generator (teks, warna) untuk ui.page(); dipakai PetManager & shard.py
+# Alasan def: Satu tampilan yang sama untuk roster biasa maupun roster shard
+def list_lines(rows):
+    now = time.time()
+    yield "🐾 Your pets:", "yellow"
+    for pet, attrs in rows:
+        attrs = decayed(attrs, now)
+        lvl = attrs.get("level", 1)
+        hp = attrs.get("health", 0)
+        yield f" - {pet} (Lv {lvl}) | Health: {hp}%", None
+
+
+def stats_lines(rows):
+    now = time.time()
+    yield "📊 All Pets Summary", "magenta"
+    for pet, attrs in rows:
+        attrs = decayed(attrs, now)
+        yield f"\n{pet} — Lv {attrs.get('level',1)} | EXP {attrs.get('exp',0)}/100", "magenta"
+        # 4 baris bar digabung jadi satu entry (tanpa warna)
+        yield (f"  Hunger : {progress_bar(attrs['hunger'])}\n"
+               f"  Energy : {progress_bar(attrs['energy'])}\n"
+               f"  Happy  : {progress_bar(attrs['happy'])}\n"
+               f"  Health : {progress_bar(attrs['health'])}"), None
+
+
+# ============================================================================
+# MERGE (beberapa proses, satu store)
+# ============================================================================
+# Kalau proses lain sudah menyimpan pet yang juga kita ubah, perubahan kedua
+# pihak digabung: stat & EXP adalah hasil tambah / kurang, jadi selisih kita
+# (ours - base) ditambahkan ke versi mereka. base = isi pet saat terakhir sama
+# dengan yang ada di disk.
+# Alasan def: Aturan gabungnya ikut aturan game (MAX_STAT, LEVEL_UP_EXP)
+def merge_pet(base, ours, theirs):
+    """
+    Gabungkan dua perubahan pet yang sama (None = pet nggak ada / dihapus).
+    Hapus menang dari update; kalau dua proses bikin pet baru dengan nama
+    yang sama, yang duluan tersimpan (theirs) yang dipakai.
+    """
+    if ours == base:
+        return theirs
+    if theirs == base or theirs is None and ours is None:
+        return ours
+    if ours is None or theirs is None or base is None:
+        return None if ours is None or theirs is None else theirs
+    
+    merged = dict(theirs)
+    for stat in ("hunger", "energy", "happy", "health"):
+        merged[stat] = max(0, min(MAX_STAT, theirs[stat] + ours[stat] - base[stat]))
+    
+    # Level + EXP dihitung sebagai total EXP, biar level up dari dua sisi nggak hilang
+    def total(pet):
+        return (pet.get("level", 1) - 1) * LEVEL_UP_EXP + pet.get("exp", 0)
+    
+    level, exp = divmod(max(0, total(theirs) + total(ours) - total(base)), LEVEL_UP_EXP)
+    merged["level"], merged["exp"] = level + 1, exp
+    merged["ts"] = max(ours.get("ts", 0), theirs.get("ts", 0))
+    return merged
+
+
+class PetError(ValueError):
+    """
+    Error validasi dari method state (add_pet, rename_pet, remove_pet, ...).
+    Pesannya siap ditampilkan ke user.
+    """
+
+
+# Validasi pet dari file import, aturannya sama dengan add_pet (create)
+# Alasan def: Dipakai per baris saat import, terpisah dari method PetManager
+def check_name(name):
+    name = name.strip()
+    if not name:
+        raise PetError("Name cannot be empty.")
+    return name
+
+
+def check_pet(name, attrs, ts):
+    """
+    Nama & stat pet dari luar (CSV, Parquet, ...). Field yang nggak ada di file
+    pakai nilai pet baru (ts = `ts`); yang ada harus angka bulat dalam FIELD_LIMITS.
+    Return (nama, attrs bersih). Lempar PetError kalau nggak valid.
+    """
+    name = check_name(name if isinstance(name, str) else "")
+    pet = {}
+    for field, (low, high) in FIELD_LIMITS.items():
+        if field not in attrs:
+            pet[field] = NEW_PET_STATS.get(field, ts)
+            continue
+        value = attrs[field]
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise PetError(f"{field} must be a whole number, got {value!r}.") from None
+        fraction = not isinstance(value, str) and number != value  # 12.5 dari Parquet float
+        if fraction or number < low or (high is not None and number > high):
+            limit = f"between {low} and {high}" if high is not None else f"at least {low}"
+            raise PetError(f"{field} must be a whole number {limit}, got {value!r}.")
+        pet[field] = number
+    return name, pet
+
+
+def check_pets(start, names, columns, ts):
+    """
+    Validasi satu chunk import per kolom (map/min/max jalan di C), jauh lebih
+    cepat dari check_pet per baris. Kalau ada yang nggak lolos, chunk itu
+    dicek ulang per baris biar ketahuan baris mana & kenapa.
+    start = nomor baris pertama chunk.
+    Return (list (nama, attrs) yang valid, list "row N: pesan").
+    """
+    fields, values = [], []
+    valid = set(map(type, names)) <= {str}
+    names = [name.strip() for name in names] if valid else names
+    valid = valid and all(names)
+    for field, (low, high) in FIELD_LIMITS.items():
+        if not valid:
+            break
+        fields.append(field)
+        if field not in columns:
+            values.append(repeat(NEW_PET_STATS.get(field, ts)))
+            continue
+        column = columns[field]
+        try:
+            numbers = list(map(int, column))
+        except (TypeError, ValueError):
+            valid = False
+            break
+        # Kolom string (CSV) cukup lolos int(); kolom angka nggak boleh pecahan
+        if set(map(type, column)) - {str} and numbers != column:
+            valid = False
+        elif numbers and (min(numbers) < low or (high is not None and max(numbers) > high)):
+            valid = False
+        values.append(numbers)
+    if valid:
+        return list(zip(names, (dict(zip(fields, row)) for row in zip(*values)))), []
+    
+    pets, errors = [], []
+    for i, name in enumerate(names):
+        try:
+            pets.append(check_pet(name, {field: column[i] for field, column in columns.items()}, ts))
+        except PetError as e:
+            errors.append(f"row {start + i:,}: {e}")
+    return pets, errors
+
+
+@contextmanager
+def _gc_paused():
+    # Import jutaan pet = jutaan dict baru; GC-nya berkali-kali menyisir seluruh
+    # roster (~40% waktu import), padahal nggak ada siklus yang dibuat
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+# ============================================================================
+# CARI NAMA PET (select mi*, "did you mean")
+# ============================================================================
+# Hasil PetManager.match_names -> satu nama, atau PetError dengan pesan yang pas
+# Alasan def: Dipakai PetManager & ShardedManager (hasil semua shard digabung dulu)
+def pick_name(pattern, match, limit=SUGGEST_LIMIT):
+    """
+    match = (nama persis / None, nama dengan prefix (urut, maks limit),
+             jumlah nama dengan prefix, saran "did you mean").
+    """
+    exact, matches, total, suggestions = match
+    if exact is not None:
+        return exact
+    if pattern.endswith("*"):
+        if total == 1:
+            return matches[0]
+        if not total:
+            raise PetError(f"No pet name starts with '{pattern[:-1]}'.")
+        more = f" (+{total - limit:,} more)" if total > limit else ""
+        raise PetError(f"{total:,} pets match '{pattern}': {', '.join(matches[:limit])}{more}")
+    if suggestions:
+        raise PetError(f"Pet not found. Did you mean: {', '.join(suggestions)}?")
+    raise PetError("Pet not found.")
 
 
 # ============================================================================
@@ -48,65 +360,284 @@ class PetManager:
     """
     Manager untuk mengelola hewan peliharaan virtual.
     Mencakup create, select, feed, play, sleep, heal, dll.
+    
+    Method "state" (add_pet, rename_pet, remove_pet, apply_action) nggak
+    nyentuh terminal sama sekali. Method "command" (create_pet, feed, ...)
+    membungkusnya dan menampilkan hasilnya lewat self.ui.
     """
     
-    def __init__(self):
+    def __init__(self, storage=None, layout=None, ui=None, seed=None):
         """
-        Inisialisasi PetManager dengan load data dari file.
-        Memastikan setiap pet punya field level & exp.
+        Inisialisasi PetManager dengan load data dari storage.
+        storage: backend dari data_handler (default: JSON atau sesuai env PET_STORAGE).
+        layout: "dict" (default) atau "table" -> roster disimpan di PetTable
+                (kolom array, jauh lebih hemat memori). Bisa juga lewat env PET_LAYOUT.
+        ui: object dari modul ui (default: ConsoleUI, atau HeadlessUI kalau
+            --headless / PET_HEADLESS=1).
+        seed: seed RNG random event (default env PET_SEED, kosong = acak).
+        Backend JSON memastikan setiap pet punya field level & exp.
         """
-        self.data = load_data()
+        self.ui = ui or get_ui()
+        # Metrik runtime (perintah 'metrics', lihat metrics.py)
+        self.metrics = Metrics()
+        self.metrics.collectors.append(self._collect_metrics)
+        # CommandProfiler aktif (perintah 'profile on'), None = nggak diprofile
+        self.profiler = None
+        
+        start = time.perf_counter()
+        self.storage = storage or open_storage()
+        self.data = self.storage.load()
+        self.metrics.set("pet_load_duration_seconds", time.perf_counter() - start)
+        restored = getattr(self.storage, "restored", None)
+        if restored:
+            # Snapshot rusak & diganti backup: kabari user, file rusaknya masih ada
+            manifest, corrupt = restored
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(manifest["created"]))
+            self.ui.say(f"⚠️ {self.storage.path} was corrupt: restored backup #{manifest['seq']} ({when}, "
+                        f"{manifest['pets']:,} pets) plus the journal. The damaged file was kept as {corrupt}.",
+                        "yellow")
+        
+        layout = layout or os.environ.get("PET_LAYOUT", "dict")
+        if layout == "table":
+            # Catatan: backend lazy (SQLite) jadi dibaca semua ke tabel
+            self.data = PetTable.from_mapping(self.data)
         self.current_pet = None
         
-        # Pastikan setiap pet punya field level & exp (untuk backward compatibility)
-        for pet, attrs in list(self.data.items()):
-            attrs.setdefault("level", 1)
-            attrs.setdefault("exp", 0)
+        # RNG sendiri per manager: random event bisa diulang persis dengan seed yang sama
+        self.rng = make_rng(seed)
+        
+        # Nama pet yang berubah sejak save terakhir (buat journal)
+        self._changes = set()
+        # True kalau perubahan terakhir butuh snapshot penuh (misal tick vectorized)
+        self._full_pending = False
+        # Isi pet sebelum diubah sejak save terakhir (None = belum ada), jadi
+        # base merge_pet kalau proses lain ikut mengubah pet yang sama.
+        # Roster PetTable yang diubah operasi massal: base-nya salinan tabel.
+        self._bases = {}
+        self._base_table = None
+        # Index level/health/hunger untuk query list/stats (dibangun saat pertama dipakai)
+        self.indexes = PetIndexes()
+        # Nama pet urut untuk 'select mi*', saran typo & tab completion
+        self.names = NameIndex()
+        # Log operasi untuk undo / redo / history (lihat history.py)
+        self.history = History()
+        
+        # Backup incremental (lihat backup.py): nama pet yang berubah sejak backup
+        # terakhir. _backup_full = ada perubahan massal, backup berikutnya penuh.
+        path = getattr(self.storage, "path", None)
+        self.backups = BackupStore(backup_dir(path)) if path else None
+        self._backup_dirty = set()
+        self._backup_full = False
+        self._last_backup = time.monotonic()
+        self._backup_lock = threading.Lock()
+        
+        # autosave=False -> perubahan cuma ditandai, disimpan saat save_data() dipanggil
+        # (dipakai mode script biar nggak nulis ke disk tiap perintah)
+        self.autosave = True
+        # AutoSaver aktif (lihat start_autosave); None = simpan langsung di _commit
+        self.saver = None
+        
+        # lock: dipegang selama data pet diubah / di-copy buat disimpan.
+        # Storage ikut pakai lock ini waktu bikin snapshot di thread lain.
+        self.lock = threading.RLock()
+        self.storage.data_lock = self.lock
+        # _save_lock: cuma satu save yang jalan dalam satu waktu
+        self._save_lock = threading.Lock()
 
     # ========================================================================
-    # CREATE & SELECT PET METHODS
+    # STATE METHODS (tanpa I/O terminal)
     # ========================================================================
     
-    def create_pet(self, name):
+    def add_pet(self, name):
         """
-        Buat pet baru dengan stats awal.
-        Alasan def: Logika pembuatan pet cukup kompleks (validasi, init data)
+        Tambah pet baru dengan stats awal. Lempar PetError kalau nama nggak valid.
+        """
+        # Validasi input
+        name = check_name(name)
+        
+        with self.lock:
+            if name in self.data:
+                raise PetError("Pet already exists!")
+        
+            # Inisialisasi stat baru pet dengan nilai awal
+            self._remember(name)
+            self.data[name] = {**NEW_PET_STATS, "ts": int(time.time())}
+            self._record("create", f"create {name}", [(name, None, dict(self.data[name]))])
+        
+            self._mark(name)
+        self._commit()
+        return name
+
+    def rename_pet(self, old_name, new_name):
+        """
+        Ganti nama pet (plus update current_pet). Lempar PetError kalau gagal.
+        """
+        old_name = old_name.strip()
+        new_name = new_name.strip()
+        
+        # Validasi input
+        if not old_name or not new_name:
+            raise PetError("Both old and new name required.")
+        
+        with self.lock:
+            if old_name not in self.data:
+                raise PetError("Pet not found.")
+        
+            if new_name in self.data:
+                raise PetError("New name already used by another pet.")
+        
+            # Update data & reference
+            self._remember(old_name)
+            self._remember(new_name)
+            self.data[new_name] = self.data.pop(old_name)
+            attrs = dict(self.data[new_name])
+            self._record("rename", f"rename {old_name} -> {new_name}",
+                         [(old_name, attrs, None), (new_name, None, attrs)])
+            if self.current_pet == old_name:
+                self.current_pet = new_name
+        
+            self._mark(old_name)
+            self._mark(new_name)
+        self._commit()
+
+    def remove_pet(self, name):
+        """
+        Hapus pet tanpa konfirmasi. Lempar PetError kalau pet nggak ada.
         """
         name = name.strip()
         
         # Validasi input
         if not name:
-            print(Fore.RED + "Name cannot be empty.")
-            return
+            raise PetError("Name required.")
+        
+        with self.lock:
+            if name not in self.data:
+                raise PetError("Pet not found.")
+        
+            self._remember(name)
+            attrs = self.data.pop(name)
+            self._record("delete", f"delete {name}", [(name, dict(attrs), None)])
+            if self.current_pet == name:
+                self.current_pet = None
+            self._mark(name)
+        self._commit()
+
+    def apply_action(self, action, name=None):
+        """
+        Jalankan aturan game satu interaksi (stat, EXP/level up, random event)
+        ke pet `name` (default: pet yang dipilih), lalu simpan.
         
-        if name in self.data:
-            print(Fore.RED + "Pet already exists!")
+        Returns:
+            List pesan (warna, teks) yang bisa ditampilkan caller — atau diabaikan.
+        """
+        name = name or self.current_pet
+        with self.lock:
+            if name not in self.data:
+                raise PetError("Pet not found.")
+        
+            notes = []
+            pet = self.data[name]
+            before = dict(pet)
+            self._remember(name)
+        
+            # Decay selama ditinggal diterapkan dulu, baru efek interaksinya
+            self._apply_decay(pet)
+        
+            # Update stat & gain EXP, lalu cek event
+            level = pet.get("level", 1)
+            self._apply_effects(pet, action)
+            notes.append(self._gain_exp(name, pet, ACTION_EFFECTS[action][1]))
+            if pet["level"] > level:
+                self.metrics.inc("pet_events_total", pet["level"] - level, event="level_up", action=action)
+            notes.extend(self._random_event(name, pet, action))
+            self._record(action, f"{action} {name}", [(name, before, dict(pet))])
+            self._mark(name)
+        self._commit()
+        return notes
+
+    def find_pets(self, query):
+        """
+        Jalankan query "where ... order by ... limit N" (lihat query.py).
+        Return list (nama, attrs). Lempar QueryError kalau query salah.
+        """
+        return self.run_query(parse_query(query))
+
+    def run_query(self, query):
+        """
+        Jalankan Query yang sudah di-parse (dipakai juga worker shard).
+        Kondisi / order by di stat yang turun sendiri (hunger, energy, happy)
+        pakai nilai setelah decay offline, sama seperti yang ditampilkan.
+        """
+        with self.lock:
+            settled = self._settle_decay(query)
+            rows = execute(self.data, query, self.indexes)
+        if settled:
+            self._commit()
+        return rows
+
+    def match_names(self, pattern, limit=SUGGEST_LIMIT):
+        """
+        Bahan pick_name untuk input nama dari user (lihat find_pet).
+        "mi*" = semua nama yang diawali "mi"; selain itu nama persis,
+        atau nama yang mirip kalau nggak ada.
+        """
+        with self.lock:
+            if pattern in self.data:
+                return pattern, [], 0, []
+            self.names.ensure(self.data)
+            if pattern.endswith("*"):
+                prefix = pattern[:-1]
+                return None, self.names.prefix(prefix, limit), self.names.count_prefix(prefix), []
+            return None, [], 0, self.names.suggest(pattern, limit)
+
+    def find_pet(self, pattern):
+        """
+        Nama pet dari input user: nama persis, atau prefix "mi*" yang cocok
+        dengan tepat satu pet. Lempar PetError (plus saran nama) kalau nggak ketemu.
+        """
+        pattern = pattern.strip()
+        if not pattern:
+            raise PetError("Name required.")
+        return pick_name(pattern, self.match_names(pattern))
+
+    def complete_names(self, prefix, limit=COMPLETE_LIMIT):
+        # Nama untuk tab completion (urut abjad, maksimal `limit`)
+        with self.lock:
+            self.names.ensure(self.data)
+            return self.names.prefix(prefix, limit)
+
+    # ========================================================================
+    # CREATE & SELECT PET METHODS
+    # ========================================================================
+    
+    def create_pet(self, name):
+        """
+        Buat pet baru dengan stats awal.
+        Alasan def: Logika pembuatan pet cukup kompleks (validasi, init data)
+        """
+        try:
+            name = self.add_pet(name)
+        except PetError as e:
+            self.ui.say(str(e), "red")
             return
         
-        # Inisialisasi stat baru pet dengan nilai awal
-        self.data[name] = {
-            "hunger": 50,
-            "energy": 50,
-            "happy": 50,
-            "health": 100,
-            "level": 1,
-            "exp": 0
-        }
-        
-        print(Fore.GREEN + f"Pet '{name}' created successfully! 🐣")
-        self.save_data()
+        self.ui.say(f"Pet '{name}' created successfully! 🐣", "green")
 
     def select_pet(self, name):
         """
         Pilih pet yang akan diinteraksi.
         Alasan def: Fungsi ini perlu divalidasi dan mengubah state current_pet
+        
+        name boleh prefix dengan "*" (misal 'select mi*') kalau cocok dengan satu pet.
         """
-        if name not in self.data:
-            print(Fore.RED + "Pet not found!")
+        try:
+            name = self.find_pet(name)
+        except PetError as e:
+            self.ui.say(str(e), "red")
             return
         
         self.current_pet = name
-        print(Fore.YELLOW + f"You selected {name} 🐾")
+        self.ui.say(f"You selected {name} 🐾", "yellow")
 
     # ========================================================================
     # STATUS & INFO DISPLAY METHODS
@@ -120,49 +651,51 @@ class PetManager:
         if not self._ensure_selected():
             return
         
-        pet = self.data[self.current_pet]
+        pet = decayed(self.data[self.current_pet])
         
-        print(Fore.CYAN + f"""
+        self.ui.say(f"""
 --- {self.current_pet}'s Status ---
 Level: {pet.get('level',1)}   EXP: {pet.get('exp',0)}/100
 🍖 Hunger : {progress_bar(pet['hunger'])}
 ⚡ Energy : {progress_bar(pet['energy'])}
 😊 Happy  : {progress_bar(pet['happy'])}
 ❤️ Health : {progress_bar(pet['health'])}
-""")
+""", "cyan")
 
-    def list_pets(self):
+    def list_pets(self, query=None):
         """
         Tampilkan daftar semua pet dengan info ringkas.
         Alasan def: Display logic terpisah untuk modularitas
+        
+        query: opsional, misal "where health<30 order by level desc limit 20".
         """
         if not self.data:
-            print(Fore.RED + "No pets found.")
+            self.ui.say("No pets found.", "red")
+            return
+        
+        rows = self._query_rows(query)
+        if rows is None:
             return
         
-        print(Fore.YELLOW + "🐾 Your pets:")
-        for pet, attrs in self.data.items():
-            lvl = attrs.get("level", 1)
-            hp = attrs.get("health", 0)
-            print(f" - {pet} (Lv {lvl}) | Health: {hp}%")
+        # Semua baris dirender dulu lalu ditulis per chunk (lewat pager kalau panjang)
+        self.ui.page(list_lines(rows))
 
-    def stats_all(self):
+    def stats_all(self, query=None):
         """
         Tampilkan ringkasan lengkap semua pet dengan bar stats.
         Alasan def: Method terpisah untuk reporting yang komprehensif
+        
+        query: sama seperti list_pets.
         """
         if not self.data:
-            print(Fore.RED + "No pets found.")
+            self.ui.say("No pets found.", "red")
             return
         
-        print(Fore.MAGENTA + "📊 All Pets Summary")
+        rows = self._query_rows(query)
+        if rows is None:
+            return
         
-        for pet, attrs in self.data.items():
-            print(Fore.MAGENTA + f"\n{pet} — Lv {attrs.get('level',1)} | EXP {attrs.get('exp',0)}/100")
-            print("  " + "Hunger :", progress_bar(attrs['hunger']))
-            print("  " + "Energy :", progress_bar(attrs['energy']))
-            print("  " + "Happy  :", progress_bar(attrs['happy']))
-            print("  " + "Health :", progress_bar(attrs['health']))
+        self.ui.page(stats_lines(rows))
 
     # ========================================================================
     # PET INTERACTION METHODS
@@ -174,110 +707,227 @@ Level: {pet.get('level',1)}   EXP: {pet.get('exp',0)}/100
         Alasan def: Setiap interaksi punya logika serupa (animasi, stat change, exp)
         jadi lebih clean jika terpisah method
         """
-        if not self._ensure_selected():
-            return
-        
-        print(Fore.YELLOW + f"\nFeeding {self.current_pet} 🍖")
-        
-        # Animasi feeding dengan frame berbeda
-        for frame in ["(˶ᵔᴗᵔ)っ🍗", "( ˘▽˘)っ🍗", "(๑>◡<๑)っ🍖"]:
-            print(Fore.GREEN + frame, end="\r", flush=True)
-            time.sleep(0.5)
-        
-        print(Fore.GREEN + "\nYummy! That was delicious 😋")
-        
-        # Update stat
-        pet = self.data[self.current_pet]
-        pet["hunger"] = min(MAX_STAT, pet["hunger"] + 20)
-        
-        # Gain EXP dan cek event
-        self._gain_exp(10)
-        self._random_event("feed")
-        
-        self.save_data()
+        self._interact("feed")
 
     def play(self):
         """
         Main dengan pet. Naikkan happy, turunkan energy, gain EXP.
         Alasan def: Interaction logic yang perlu terpisah & reusable
         """
-        if not self._ensure_selected():
-            return
-        
-        print(Fore.MAGENTA + f"\nPlaying with {self.current_pet} ⚽")
-        
-        # Animasi play dengan 3 frame
-        for frame in ["(•ᴗ•)ノ⚽", "(⚽>ᴗ<)ノ", "ヽ(>ᴗ<⚽)ノ"]:
-            print(Fore.MAGENTA + frame, end="\r", flush=True)
-            time.sleep(0.45)
-        
-        print(Fore.MAGENTA + "\nThat was fun! 😄")
-        
-        # Update stat
-        pet = self.data[self.current_pet]
-        pet["happy"] = min(MAX_STAT, pet["happy"] + 20)
-        pet["energy"] = max(0, pet["energy"] - 10)
-        
-        # Gain EXP dan cek event
-        self._gain_exp(15)
-        self._random_event("play")
-        
-        self.save_data()
+        self._interact("play")
 
     def sleep(self):
         """
         Tidurkan pet. Naikkan energy, turunkan hunger, gain EXP.
         Alasan def: Interaksi berbeda perlu method terpisah untuk clarity
         """
-        if not self._ensure_selected():
+        self._interact("sleep")
+
+    def heal(self):
+        """
+        Sembuhkan pet. Naikkan health, gain EXP.
+        Alasan def: Interaksi spesifik yang perlu isolated logic
+        """
+        self._interact("heal")
+
+    # ========================================================================
+    # BULK INTERACTION & WORLD TICK
+    # ========================================================================
+    
+    def bulk(self, action, where=None):
+        """
+        Jalankan interaksi ke banyak pet sekaligus, tanpa animasi.
+        where: kondisi seperti "level>=3 and health<50", None = semua pet.
+        Alasan def: Server simulasi perlu update banyak pet dalam satu langkah
+        """
+        try:
+            conditions = parse_where(where) if where else ()
+        except QueryError as e:
+            self.ui.say(str(e), "red")
             return
         
-        print(Fore.BLUE + f"\n{self.current_pet} is sleeping... 😴")
-        
-        # Animasi sleep dengan karakter "z" bertambah
-        for frame in ["(˘ω˘) z", "(˘ω˘) zz", "(˘ω˘) zzz"]:
-            print(Fore.BLUE + frame, end="\r", flush=True)
-            time.sleep(0.8)
-        
-        print(Fore.CYAN + "\nAll rested up! 🌞")
+        result = self._run_world(action, conditions)
+        if not result["pets"]:
+            self.ui.say("No pets matched.", "red")
+            return
+        self.ui.say(f"{action.capitalize()} applied to {result['pets']:,} pets ✅", "green")
+        self._print_world_result(result)
+
+    def tick(self, ticks=1):
+        """
+        Majukan waktu dunia: stat semua pet turun, EXP bertambah, cek level up
+        & kelaparan. Semua pet diproses dalam satu langkah (vectorized kalau bisa).
+        """
+        with self.lock:
+            # Di bawah lock: autosave bisa lagi ngosongin cache roster lazy
+            empty = not self.data
+        if empty:
+            self.ui.say("No pets found.", "red")
+            return
         
-        # Update stat
-        pet = self.data[self.current_pet]
-        pet["energy"] = min(MAX_STAT, pet["energy"] + 30)
-        pet["hunger"] = max(0, pet["hunger"] - 10)
+        result = self._run_world("tick", (), ticks)
+        self.ui.say(f"⏳ World advanced {ticks} tick(s) for {result['pets']:,} pets.", "cyan")
+        self._print_world_result(result)
+
+    def _run_world(self, action, conditions, ticks=1):
+        # Import di sini: world ikut import NumPy (opsional) yang lumayan berat
+        import world
         
-        # Gain EXP dan cek event
-        self._gain_exp(8)
-        self._random_event("sleep")
+        with self.lock:
+            # before: isi pet yang kena sebelum diubah (jalur loop), deltas: perubahan
+            # kolom (jalur vectorized) -> dua-duanya dicatat history buat undo
+            before = {}
+            deltas = [] if self.history.enabled else None
+            table = isinstance(self.data, PetTable)
+            if table:
+                self._keep_base_table()
+            result, changed = world.run(self.data, action, conditions, ticks, self.rng, before, deltas=deltas)
+            if not table:
+                for name, attrs in before.items():
+                    self._bases.setdefault(name, attrs)
+            if result["pets"]:
+                label = world_label(action, conditions, ticks)
+                if changed is None:
+                    self._record("world", label, columns=deltas[0] if deltas else None)
+                else:
+                    self._record("world", label, [(name, before[name], dict(self.data[name])) for name in changed])
+            if changed is None:
+                # Jalur vectorized nggak tahu pet mana saja yang berubah -> snapshot penuh
+                self._full_pending = True
+                self._backup_full = True
+                self.indexes.invalidate()
+            else:
+                for name in changed:
+                    self._mark(name)
+        self._commit()
         
-        self.save_data()
+        # Counter hasil world jadi metrik event (level_ups -> event "level_up")
+        for key, count in result.items():
+            if key != "pets" and count:
+                event = "level_up" if key == "level_ups" else key
+                self.metrics.inc("pet_events_total", count, event=event, action=action)
+        return result
 
-    def heal(self):
+    def _settle_decay(self, query):
         """
-        Sembuhkan pet. Naikkan health, gain EXP.
-        Alasan def: Interaksi spesifik yang perlu isolated logic
+        Tulis decay offline ke roster sebelum query yang pakai field decay,
+        supaya index sekunder (bisect) cocok dengan nilai yang ditampilkan.
+        Nggak dicatat di history: decay cuma fungsi dari ts, undo tetap konsisten.
+        Return True kalau ada pet yang berubah. Dipanggil dengan self.lock.
         """
-        if not self._ensure_selected():
-            return
+        fields = {field for field, _, _ in query.conditions} | {query.order_by}
+        if DECAY_STEP <= 0 or fields.isdisjoint(TICK_DECAY):
+            return False
         
-        print(Fore.LIGHTGREEN_EX + f"\nHealing {self.current_pet} ✨")
+        import world
         
-        # Animasi heal dengan emoji healing
-        for frame in ["💖", "💫", "✨", "💫", "💖"]:
-            print(Fore.LIGHTGREEN_EX + frame, end="\r", flush=True)
-            time.sleep(0.35)
+        before = {}
+        changed = world.settle_decay(self.data, before, prepare=self._keep_base_table)
+        if changed is None:
+            # Sama seperti _run_world jalur vectorized: snapshot penuh & index dibangun ulang
+            self._full_pending = True
+            self._backup_full = True
+            self.indexes.invalidate()
+            return True
+        for name, attrs in before.items():
+            self._bases.setdefault(name, attrs)
+        for name in changed:
+            self._mark(name)
+        return bool(changed)
+
+    def _keep_base_table(self):
+        # Salinan PetTable sebelum diubah massal = base merge_pet (lihat _remember)
+        if self._base_table is None:
+            self._base_table = self.data.copy()
+
+    def _print_world_result(self, result):
+        self.ui.say(f"  Level ups: {result['level_ups']:,} | "
+                    f"Bonus events: {result['bonus']:,} | Starving: {result['starving']:,}", "cyan")
+
+    # ========================================================================
+    # EXPORT / IMPORT (CSV, Parquet, Arrow)
+    # ========================================================================
+    
+    def export_pets(self, path, query=None):
+        """
+        Tulis roster (atau hasil query where/order by/limit) ke file CSV /
+        Parquet / Arrow, format dari ekstensinya (lihat transfer.py).
+        Nilai yang ditulis = nilai tersimpan (tanpa decay), plus ts.
+        """
+        import transfer
         
-        print(Fore.LIGHTGREEN_EX + "\nFeeling much better now! ❤️‍🩹")
+        path = path.strip()
+        with self.lock:
+            rows = self._query_rows(query)
+            if rows is None:
+                return
+            try:
+                count = transfer.write_pets(path, rows)
+            except (transfer.TransferError, OSError) as e:
+                self.ui.say(str(e), "red")
+                return
         
-        # Update stat
-        pet = self.data[self.current_pet]
-        pet["health"] = min(MAX_STAT, pet["health"] + 25)
+        self.ui.say(f"Exported {count:,} pets to {path} ✅", "green")
+
+    def import_pets(self, path):
+        """
+        Masukkan pet dari file CSV / Parquet / Arrow. Nama yang sudah ada
+        ditimpa (upsert). Tiap baris divalidasi seperti create; baris yang
+        salah dilewati & dilaporkan. Dicatat sebagai satu operasi massal
+        (bisa di-undo) dan disimpan sekali di akhir (snapshot penuh).
+        """
+        import transfer
         
-        # Gain EXP dan cek event
-        self._gain_exp(12)
-        self._random_event("heal")
+        path = path.strip()
+        ts = int(time.time())
+        imported = skipped = 0
+        first_error = None
+        stopped = False
+        try:
+            chunks = transfer.read_pets(path)
+            with self.lock, _gc_paused():
+                # Isi tiap pet sebelum & sesudah import {nama: (sebelum, sesudah)}, buat undo
+                changes = {} if self.history.enabled else None
+                try:
+                    for start, names, columns in chunks:
+                        pets, errors = check_pets(start, names, columns, ts)
+                        if errors:
+                            skipped += len(errors)
+                            first_error = first_error or errors[0]
+                        if changes is not None:
+                            for name, attrs in pets:
+                                # Nama yang muncul dua kali: "sebelum" tetap isi sebelum import
+                                if name in changes:
+                                    before = changes[name][0]
+                                else:
+                                    before = self.data.get(name)
+                                    before = None if before is None else dict(before)
+                                changes[name] = (before, dict(attrs))
+                        # Tanpa base (_remember): kalau proses lain ikut mengubah pet
+                        # ini, isi dari file yang menang saat digabung
+                        self.data.update(pets)
+                        imported += len(pets)
+                finally:
+                    if imported:
+                        self._record("world", f"import {os.path.basename(path)}",
+                                     [(name, before, after) for name, (before, after) in (changes or {}).items()])
+                        # Bisa jutaan pet: index dibangun ulang & snapshot penuh, bukan per pet
+                        self._full_pending = True
+                        self._backup_full = True
+                        self.indexes.invalidate()
+                        self.names.invalidate()
+        except (transfer.TransferError, OSError) as e:
+            # Pet dari chunk sebelumnya tetap masuk (dan bisa di-undo)
+            self.ui.say(f"Import stopped: {e}", "red")
+            stopped = True
         
-        self.save_data()
+        if imported:
+            self._commit()
+            self.ui.say(f"Imported {imported:,} pets from {path} ✅", "green")
+        if skipped:
+            self.ui.say(f"Skipped {skipped:,} invalid rows ({first_error})", "yellow")
+        if not imported and not skipped and not stopped:
+            self.ui.say("No pets to import.", "red")
 
     # ========================================================================
     # PET MANAGEMENT METHODS
@@ -289,65 +939,300 @@ Level: {pet.get('level',1)}   EXP: {pet.get('exp',0)}/100
         Alasan def: Perlu validasi & update reference (current_pet),
         jadi perlu method tersendiri
         """
-        old_name = old_name.strip()
-        new_name = new_name.strip()
-        
-        # Validasi input
-        if not old_name or not new_name:
-            print(Fore.RED + "Both old and new name required.")
-            return
-        
-        if old_name not in self.data:
-            print(Fore.RED + "Pet not found.")
-            return
-        
-        if new_name in self.data:
-            print(Fore.RED + "New name already used by another pet.")
+        try:
+            if old_name.strip():
+                old_name = self.find_pet(old_name)
+            self.rename_pet(old_name, new_name)
+        except PetError as e:
+            self.ui.say(str(e), "red")
             return
         
-        # Update data & reference
-        self.data[new_name] = self.data.pop(old_name)
-        if self.current_pet == old_name:
-            self.current_pet = new_name
-        
-        print(Fore.GREEN + f"Renamed '{old_name}' to '{new_name}' ✅")
-        self.save_data()
+        self.ui.say(f"Renamed '{old_name.strip()}' to '{new_name.strip()}' ✅", "green")
 
-    def delete(self, name):
+    def delete(self, name, confirm=None):
         """
         Hapus pet dengan konfirmasi.
         Alasan def: Operasi destruktif perlu confirmation logic terpisah
+        
+        confirm: True = langsung hapus tanpa tanya (misal 'delete maww --yes').
         """
         name = name.strip()
         
-        # Validasi input
+        # Validasi dulu sebelum tanya konfirmasi
         if not name:
-            print(Fore.RED + "Name required.")
+            self.ui.say("Name required.", "red")
             return
         
-        if name not in self.data:
-            print(Fore.RED + "Pet not found.")
+        try:
+            name = self.find_pet(name)
+        except PetError as e:
+            self.ui.say(str(e), "red")
             return
         
         # Minta konfirmasi dari user
-        confirm = input(Fore.RED + f"Are you sure to delete '{name}'? (y/n): ").strip().lower()
+        if confirm is None:
+            answer = self.ui.ask(f"Are you sure to delete '{name}'? (y/n): ", "red")
+            confirm = answer.strip().lower() == "y"
         
-        if confirm == "y":
-            del self.data[name]
-            if self.current_pet == name:
-                self.current_pet = None
-            print(Fore.YELLOW + f"Pet '{name}' deleted.")
-            self.save_data()
+        if confirm:
+            self.remove_pet(name)
+            self.ui.say(f"Pet '{name}' deleted.", "yellow")
+        else:
+            self.ui.say("Delete cancelled.", "cyan")
+
+    # ========================================================================
+    # UNDO / REDO / HISTORY
+    # ========================================================================
+    
+    def undo_op(self):
+        """
+        Batalkan operasi terakhir. Return Op-nya, lempar PetError kalau nggak ada.
+        """
+        ops = self._travel(-1)
+        if not ops:
+            raise PetError("Nothing to undo.")
+        return ops[0]
+
+    def redo_op(self):
+        """
+        Jalankan lagi operasi yang terakhir di-undo. Lempar PetError kalau nggak ada.
+        """
+        ops = self._travel(1)
+        if not ops:
+            raise PetError("Nothing to redo.")
+        return ops[0]
+
+    def undo(self, steps=1):
+        """
+        Batalkan `steps` operasi terakhir (create, rename, delete, feed, tick, ...).
+        Alasan def: Delete & interaksi sebelumnya nggak bisa dibalikin sama sekali
+        """
+        self._step_history(-steps, "Nothing to undo.")
+
+    def redo(self, steps=1):
+        """
+        Ulangi `steps` operasi yang tadi di-undo.
+        """
+        self._step_history(steps, "Nothing to redo.")
+
+    def goto(self, seq):
+        """
+        Lompat ke keadaan roster tepat sesudah operasi #seq di 'history'
+        (0 = sebelum operasi paling lama), undo / redo sekaligus.
+        Alasan def: Balik jauh ke belakang tanpa hitung manual berapa kali undo
+        """
+        with self.lock:
+            steps = self.history.steps_to(seq)
+        if steps is None:
+            self.ui.say(f"#{seq} is not in the history.", "red")
+        elif not steps:
+            self.ui.say(f"Already at #{seq}.", "yellow")
         else:
-            print(Fore.CYAN + "Delete cancelled.")
+            self._step_history(steps)
 
-    def save_data(self):
+    def show_history(self, name=None, limit=20):
+        """
+        Tampilkan operasi terakhir (terbaru di atas), atau cuma yang menyentuh pet `name`.
+        """
+        with self.lock:
+            rows = self.history.entries(name.strip() if name else None)[:limit]
+        if not rows:
+            self.ui.say("No history yet.", "red")
+            return
+        
+        def lines():
+            yield "📜 History (newest first):", "yellow"
+            for op, undone in rows:
+                when = time.strftime("%H:%M:%S", time.localtime(op.when))
+                yield f"  #{op.seq:<5} {when}  {op.label}" + ("  (undone)" if undone else ""), "blue" if undone else None
+        
+        self.ui.page(lines())
+
+    def save_data(self, full=False):
         """
         Simpan data ke file.
         Alasan def: Wrapper untuk save_data dari data_handler,
         memudahkan future updates atau logging
+        
+        Default-nya cuma pet yang berubah yang di-append ke journal.
+        full=True -> tulis ulang snapshot lengkap (dipakai saat 'save' & exit).
+        
+        Aman dipanggil dari thread autosave: perubahan di-copy di bawah self.lock,
+        lalu ditulis ke disk tanpa menahan lock (perintah user nggak ikut nunggu).
+        
+        Kalau proses lain sudah mengubah pet yang sama (ConflictError dari
+        storage), perubahan mereka digabung ke data kita (_merge_remote) lalu
+        save dicoba lagi, maksimal SAVE_RETRIES kali. Lock file storage JSON
+        dipegang selama itu, jadi percobaan kedua nggak bakal bentrok lagi.
+        
+        Setiap BACKUP_INTERVAL detik, save yang berhasil disusul backup incremental.
         """
-        save_data(self.data)
+        file_lock = getattr(self.storage, "file_lock", None) or nullcontext()
+        with self._save_lock, file_lock:
+            for attempt in range(SAVE_RETRIES):
+                try:
+                    self._save_once(full)
+                    break
+                except ConflictError as e:
+                    self.metrics.inc("pet_save_conflicts_total")
+                    with self.lock:
+                        self._merge_remote(e.remote)
+                    if attempt == SAVE_RETRIES - 1:
+                        raise
+        if BACKUP_INTERVAL and time.monotonic() - self._last_backup >= BACKUP_INTERVAL:
+            self._auto_backup()
+
+    def backup_data(self, full=False):
+        """
+        Backup incremental ke folder backup (lihat backup.py): yang ditulis cuma
+        bucket berisi pet yang berubah sejak backup terakhir. full=True -> semua pet.
+        Return manifest backup baru, atau None kalau nggak ada yang berubah.
+        
+        Pet di-encode di bawah self.lock, ditulis ke disk tanpa menahan lock.
+        Kalau backup dasarnya ternyata rusak, langsung diganti backup penuh.
+        """
+        if self.backups is None:
+            return None
+        with self._backup_lock:
+            full = full or not self.backups.sequences()
+            while True:
+                with self.lock:
+                    dirty = self._backup_dirty
+                    full = full or self._backup_full
+                    if not full and not dirty:
+                        return None
+                    self._backup_dirty, self._backup_full = set(), False
+                    if full:
+                        records = encode_records(self.data.items())
+                    else:
+                        records = encode_records((name, self.data.get(name)) for name in dirty)
+                try:
+                    with self.metrics.timer("pet_backup_duration_seconds", kind="full" if full else "incremental"):
+                        manifest = self.backups.write(records, full)
+                except BackupError:
+                    if full:
+                        raise
+                    full = True  # backup dasar rusak -> ulang sebagai backup penuh
+                    continue
+                except Exception:
+                    # Gagal nulis -> dicoba lagi di backup berikutnya
+                    with self.lock:
+                        self._backup_dirty |= dirty
+                        self._backup_full = self._backup_full or full
+                    raise
+                break
+            self._last_backup = time.monotonic()
+            if wants_full(manifest):
+                self._backup_full = True  # roster tumbuh / menyusut jauh -> bucket dibagi ulang
+        return manifest
+
+    def backup(self, full=False):
+        """
+        Perintah 'backup': backup sekarang (incremental, atau penuh dengan --full).
+        """
+        if self.backups is None:
+            self.ui.say("Backups need a file-based store.", "red")
+            return
+        
+        try:
+            manifest = self.backup_data(full)
+        except (OSError, BackupError) as e:
+            self.ui.say(f"Backup failed: {e}", "red")
+            return
+        if manifest is None:
+            self.ui.say("Nothing changed since the last backup.", "yellow")
+            return
+        kind = "Full backup" if manifest["full"] else "Backup"
+        self.ui.say(f"{kind} #{manifest['seq']} saved: {manifest['pets']:,} pets, "
+                    f"{manifest['written']:,} of {manifest['buckets']:,} chunks written ✅", "green")
+
+    def verify(self):
+        """
+        Perintah 'verify': cek checksum store (snapshot, journal) & backup
+        terbaru tanpa parse ulang semua pet dan tanpa mengubah apa pun.
+        Return True kalau semuanya utuh.
+        """
+        results = self.storage.verify() if hasattr(self.storage, "verify") else []
+        if self.backups is not None and not self.backups.sequences():
+            results.append(("backup", True, "no backups yet"))
+        elif self.backups is not None:
+            try:
+                manifest, problems = self.backups.verify()
+            except BackupError as e:
+                results.append(("backup", False, f"{e} (run 'backup --full' to replace it)"))
+            else:
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(manifest["created"]))
+                detail = f"{manifest['pets']:,} pets in {manifest['buckets']:,} chunks"
+                if problems:
+                    detail = "; ".join(problems[:3]) + " (run 'backup --full' to replace it)"
+                results.append((f"backup #{manifest['seq']} ({when})", not problems, detail))
+        
+        for part, ok, detail in results:
+            self.ui.say(f"{'✅' if ok else '❌'} {part}: {detail}", "green" if ok else "red")
+        return all(ok for _, ok, _ in results)
+
+    def convert(self, fmt):
+        """
+        Ganti format file snapshot (json / json-pretty / msgpack / struct)
+        lalu langsung tulis ulang snapshot dalam format baru.
+        """
+        if not hasattr(self.storage, "set_format"):
+            self.ui.say("Snapshot formats only apply to the JSON storage backend.", "red")
+            return
+        
+        fmt = fmt.strip().lower()
+        try:
+            if self.storage.lazy and check_format(fmt) != "json":
+                self._load_all()
+            self.storage.set_format(fmt)
+        except FormatError as e:
+            self.ui.say(str(e), "red")
+            return
+        
+        self.save_data(full=True)
+        size = os.path.getsize(self.storage.path)
+        self.ui.say(f"Snapshot converted to {self.storage.format} ({size:,} bytes) ✅", "green")
+
+    def _load_all(self):
+        """
+        Roster lazy (LazyPetMap) dipindah ke dict biasa: dipakai convert ke
+        msgpack / struct, yang nggak bisa dibaca per pet lewat index.
+        Perubahan pending disimpan dulu ke journal, lalu pet dibaca per halaman.
+        """
+        self.save_data()
+        with self.lock:
+            self.data = {name: dict(attrs) for name, attrs in self.data.items()}
+            self.storage.lazy = False
+            self.indexes.invalidate()
+            self.names.invalidate()
+
+    def start_autosave(self, interval=None, threshold=None):
+        """
+        Pindahkan penulisan ke thread background (lihat autosave.py):
+        perintah cuma menandai pet dirty, thread yang menyimpan berkala.
+        """
+        from autosave import AutoSaver, AUTOSAVE_INTERVAL, AUTOSAVE_THRESHOLD
+        
+        self.saver = AutoSaver(
+            self,
+            AUTOSAVE_INTERVAL if interval is None else interval,
+            AUTOSAVE_THRESHOLD if threshold is None else threshold,
+        ).start()
+        return self.saver
+
+    def close(self):
+        """
+        Simpan perubahan yang masih pending & tunggu penulisan background selesai.
+        Kalau ada yang berubah sejak backup terakhir, sekalian dibuat backup.
+        """
+        if self.saver is not None:
+            self.saver.stop()  # sudah termasuk flush terakhir
+            self.saver = None
+        else:
+            self.save_data()
+        if BACKUP_INTERVAL and (self._backup_dirty or self._backup_full):
+            self._auto_backup()
+        self.storage.close()
 
     # ========================================================================
     # INTERNAL HELPER METHODS (Private dengan prefix _)
@@ -355,6 +1240,209 @@ Level: {pet.get('level',1)}   EXP: {pet.get('exp',0)}/100
     # Alasan prefix "_": Menandakan method ini internal & tidak perlu dipanggil
     # dari luar class
     
+    def _mark(self, name):
+        """
+        Tandai pet sebagai berubah supaya ikut disimpan di save berikutnya
+        (sekalian update index query & index nama untuk pet itu).
+        """
+        self._changes.add(name)
+        self._backup_dirty.add(name)
+        self.indexes.touch(self.data, name)
+        self.names.touch(self.data, name)
+
+    def _save_once(self, full):
+        with self.lock:
+            pending = self._full_pending
+            full = full or pending
+            if not full and not self._changes:
+                return
+        
+            # Pet yang sudah dihapus dicatat sebagai None (record "del" di journal)
+            dirty = set(self._changes)
+            changes = None
+            if not full:
+                changes = {}
+                for name in dirty:
+                    attrs = self.data.get(name)
+                    changes[name] = None if attrs is None else dict(attrs)
+            self._changes.clear()
+            self._full_pending = False
+            old_bases = old_table = None
+            if full:
+                # Save penuh = base baru semua pet. Direset sekarang, jadi pet yang
+                # diubah selama snapshot ditulis dapat base lewat _remember
+                old_bases, old_table = self._bases, self._base_table
+                self._bases, self._base_table = {}, None
+        
+        try:
+            # Save penuh: storage sendiri yang copy data di bawah data_lock
+            with self.metrics.timer("pet_save_duration_seconds", kind="full" if full else "journal"):
+                remote = self.storage.save(self.data, changes)
+        except Exception:
+            # Gagal nulis -> tandai dirty lagi biar dicoba di save berikutnya
+            with self.lock:
+                self._changes |= dirty
+                self._full_pending = self._full_pending or pending
+                if full:
+                    self._bases = {**old_bases, **self._bases}
+                    self._base_table = self._base_table if old_table is None else old_table
+            raise
+        
+        with self.lock:
+            if not full:
+                # Base pet yang sudah tersimpan = isi yang barusan ditulis (sekaligus
+                # menimpa isi lama pet itu di _base_table)
+                for name in dirty:
+                    if name in self._changes or self._base_table is not None:
+                        self._bases[name] = changes[name]
+                    else:
+                        self._bases.pop(name, None)
+            if remote:
+                self._merge_remote(remote)
+
+    def _remember(self, name):
+        # Simpan isi pet sebelum perubahan pertama sejak save (base merge_pet)
+        if name not in self._bases and (self._base_table is None or name not in self._base_table):
+            attrs = self.data.get(name)
+            self._bases[name] = None if attrs is None else dict(attrs)
+
+    def _merge_remote(self, remote):
+        """
+        Terapkan perubahan proses lain {nama: attrs / None} ke roster.
+        Pet yang juga sedang kita ubah (dirty) digabung lewat merge_pet dan
+        tetap dirty; pet lain cukup diganti versi mereka. Dipanggil dengan self.lock.
+        """
+        for name, theirs in remote.items():
+            merged = theirs
+            if self._full_pending or name in self._changes:
+                ours = self.data.get(name)
+                ours = None if ours is None else dict(ours)
+                base = self._bases.get(name, _NO_BASE)
+                if base is _NO_BASE and self._base_table is not None:
+                    base = self._base_table.get(name)
+                    base = None if base is None else dict(base)
+                # Tanpa base (misal sesudah undo operasi massal) versi kita yang menang
+                merged = ours if base is _NO_BASE else merge_pet(base, ours, theirs)
+                # Isi disk sekarang = base baru untuk perubahan kita berikutnya
+                self._bases[name] = theirs
+                if merged == theirs:
+                    self._changes.discard(name)
+            if merged is None:
+                self.data.pop(name, None)
+            else:
+                self.data[name] = dict(merged)
+            self._backup_dirty.add(name)
+            self.indexes.touch(self.data, name)
+            self.names.touch(self.data, name)
+        if remote:
+            # Checkpoint history nggak tahu perubahan ini -> jangan dipakai lagi
+            self.history.drop_checkpoints()
+        self._fix_current()
+
+    def _auto_backup(self):
+        # Backup berkala / saat close. Pet sudah tersimpan, jadi gagal cukup dilaporkan
+        try:
+            self.backup_data()
+        except (OSError, BackupError) as e:
+            self.ui.say(f"Backup failed: {e}", "red")
+
+    def _collect_metrics(self):
+        """
+        Metrik yang dibaca langsung saat 'metrics' dipanggil (bukan dicatat per kejadian).
+        """
+        samples = [("pet_roster_size", {}, len(self.data))]
+        for kind, size in getattr(self.storage, "bytes_written", {}).items():
+            samples.append(("pet_storage_written_bytes_total", {"file": kind}, size))
+        return samples
+
+    def _commit(self):
+        """
+        Dipanggil setelah setiap perubahan state: simpan sekarang kalau autosave nyala,
+        atau kabari thread AutoSaver kalau ada (dia yang nulis nanti).
+        """
+        if not self.autosave:
+            return
+        if self.saver is not None:
+            self.saver.notify(len(self._changes))
+        else:
+            self.save_data()
+
+    def _query_rows(self, query):
+        """
+        Pet yang mau ditampilkan list/stats: semua, atau hasil query.
+        Return None (setelah tampilkan pesan) kalau query salah / nggak ada hasil.
+        """
+        if not query:
+            return self.data.items()
+        try:
+            rows = self.find_pets(query)
+        except QueryError as e:
+            self.ui.say(str(e), "red")
+            return None
+        if not rows:
+            self.ui.say("No pets matched.", "red")
+            return None
+        return rows
+
+    def _record(self, kind, label, changes=(), columns=None):
+        # Catat operasi di history (sesudah roster diubah), plus checkpoint kalau sudah waktunya
+        if self.history.record(kind, label, changes, columns) is not None:
+            self.history.maybe_checkpoint(self.data)
+
+    def _travel(self, steps):
+        # Undo (steps < 0) / redo lewat History.travel, return list Op yang dijalankan
+        with self.lock:
+            ops = self.history.travel(steps, self._apply_op, self._restore_checkpoint)
+        if ops:
+            self._commit()
+        return ops
+
+    def _apply_op(self, op, undo):
+        """
+        Pasang isi sebelum (undo) / sesudah (redo) satu Op ke roster.
+        Perubahan kolom (operasi massal vectorized) dipasang langsung ke PetTable
+        & disimpan lewat snapshot penuh, sama seperti operasi aslinya.
+        """
+        if op.columns is not None:
+            op.columns.apply(self.data, undo)
+            self._full_pending = True
+            self._backup_full = True
+            self.indexes.invalidate()
+        
+        added = None
+        for name, before, after in op.changes:
+            attrs = before if undo else after
+            self._remember(name)
+            if attrs is None:
+                self.data.pop(name, None)
+            else:
+                self.data[name] = dict(attrs)
+                added = name
+            self._mark(name)
+        self._fix_current(added)
+
+    def _restore_checkpoint(self, checkpoint):
+        # Roster diganti checkpoint history (lompatan jauh) -> snapshot penuh & index dibangun ulang
+        self.data = restore_checkpoint(self.data, checkpoint)
+        self._full_pending = True
+        self._backup_full = True
+        self.indexes.invalidate()
+        self.names.invalidate()
+        self._fix_current()
+
+    def _fix_current(self, renamed=None):
+        # Pet yang dipilih hilang karena undo/redo: ikut nama barunya (rename) atau lepas
+        if self.current_pet is not None and self.current_pet not in self.data:
+            self.current_pet = renamed
+
+    def _step_history(self, steps, empty=None):
+        ops = self._travel(steps)
+        verb = "↩️ Undid" if steps < 0 else "↪️ Redid"
+        for op in ops:
+            self.ui.say(f"{verb} #{op.seq}: {op.label}", "yellow")
+        if empty and len(ops) < abs(steps):
+            self.ui.say(empty, "red")
+
     def _ensure_selected(self):
         """
         Validasi apakah ada pet yang dipilih.
@@ -362,72 +1450,97 @@ Level: {pet.get('level',1)}   EXP: {pet.get('exp',0)}/100
         jadi better extract ke helper function
         """
         if not self.current_pet:
-            print(Fore.RED + "Select a pet first using 'select [name]'.")
+            self.ui.say("Select a pet first using 'select [name]'.", "red")
+            return False
+        
+        # Bisa terjadi di mode server: pet dihapus / di-rename client lain
+        if self.current_pet not in self.data:
+            self.ui.say(f"Pet '{self.current_pet}' no longer exists. Select another pet.", "red")
+            self.current_pet = None
             return False
         return True
 
-    def _gain_exp(self, amount):
+    def _interact(self, action):
+        """
+        Bagian tampilan dari feed/play/sleep/heal: animasi, lalu apply_action,
+        lalu tampilkan pesan hasilnya.
+        """
+        if not self._ensure_selected():
+            return
+        
+        intro, intro_color, frames, delay, frame_color, outro, outro_color = ACTION_SCENES[action]
+        self.ui.say(intro.format(name=self.current_pet), intro_color)
+        self.ui.animate(frames, delay, frame_color)
+        self.ui.say(outro, outro_color)
+        
+        for color, text in self.apply_action(action):
+            self.ui.say(text, color)
+
+    def _apply_decay(self, pet):
+        """
+        Terapkan decay offline ke pet (in place) sebelum pet diubah.
+        Pet lama tanpa ts mulai dihitung jam-nya dari sekarang.
+        """
+        for field, value in decay_update(pet).items():
+            pet[field] = value
+        if not pet.get("ts"):
+            pet["ts"] = int(time.time())
+
+    def _apply_effects(self, pet, action):
+        """
+        Terapkan perubahan stat dari ACTION_EFFECTS (EXP ditangani _gain_exp).
+        """
+        stats, _ = ACTION_EFFECTS[action]
+        for stat, delta in stats.items():
+            pet[stat] = max(0, min(MAX_STAT, pet[stat] + delta))
+
+    def _gain_exp(self, name, pet, amount):
         """
         Tambah EXP & cek apakah pet bisa level up.
         Alasan def: Logika leveling cukup kompleks, perlu terpisah & reusable
-        """
-        pet = self.data[self.current_pet]
         
+        Returns:
+            Pesan (warna, teks) hasilnya.
+        """
         # Tambah EXP
         pet["exp"] = pet.get("exp", 0) + amount
         
         leveled = False
         
         # Cek apakah EXP >= 100 (level up)
-        while pet["exp"] >= 100:
-            pet["exp"] -= 100
+        while pet["exp"] >= LEVEL_UP_EXP:
+            pet["exp"] -= LEVEL_UP_EXP
             pet["level"] = pet.get("level", 1) + 1
-            
+        
             # Bonus stat saat level up
-            pet["hunger"] = max(0, pet["hunger"] - 5)
-            pet["happy"] = min(MAX_STAT, pet["happy"] + 5)
-            
+            for stat, delta in LEVEL_UP_BONUS.items():
+                pet[stat] = max(0, min(MAX_STAT, pet[stat] + delta))
+        
             leveled = True
         
         # Output message
         if leveled:
-            print(Fore.CYAN + f"✨ {self.current_pet} leveled up! Now Lv {pet['level']} ✨")
-        else:
-            print(Fore.CYAN + f"{self.current_pet} gained {amount} EXP.")
+            return ("cyan", f"✨ {name} leveled up! Now Lv {pet['level']} ✨")
+        return ("cyan", f"{name} gained {amount} EXP.")
 
-    def _random_event(self, action):
+    def _random_event(self, name, pet, action):
         """
         Trigger random event yang membuat game terasa lebih hidup & dinamis.
         
         Alasan def: Event logic terpisah agar mudah di-maintain & di-extend.
         Setiap action bisa punya multiple random event outcomes.
+        Dadu-nya dari self.rng, jadi bisa di-seed (PetManager(seed=...) / PET_SEED).
         
         Args:
+            name: Nama pet
+            pet: Data pet (dict / PetView)
             action: Tipe action ('feed', 'play', 'sleep', 'heal')
-        """
-        chance = random.randint(1, 100)
-        pet = self.data[self.current_pet]
-        
-        # ====== POSITIVE EVENTS ======
         
-        # 15% chance ketika play: pet menemukan mainan bonus
-        if action == "play" and chance <= 15:
-            print(Fore.YELLOW + f"🎁 Lucky! {self.current_pet} found a toy and got +10 happy!")
-            pet["happy"] = min(MAX_STAT, pet["happy"] + 10)
-        
-        # 10% chance ketika feed: pet menemukan treat bonus
-        elif action == "feed" and chance <= 10:
-            print(Fore.MAGENTA + f"😮 Surprise! {self.current_pet} found a treat and +5 health!")
-            pet["health"] = min(MAX_STAT, pet["health"] + 5)
-        
-        # 12% chance ketika sleep: pet mimpi indah
-        elif action == "sleep" and chance <= 12:
-            print(Fore.BLUE + f"🌙 Dream event: {self.current_pet} had a happy dream (+8 happy)!")
-            pet["happy"] = min(MAX_STAT, pet["happy"] + 8)
-        
-        # ====== NEGATIVE EVENTS ======
-        
-        # Jika hunger sangat rendah (<= 10): 8% chance pet kelaparan & health -10
-        if pet["hunger"] <= 10 and random.randint(1, 100) <= 8:
-            print(Fore.RED + f"⚠️ {self.current_pet} is starving! Health -10.")
-            pet["health"] = max(0, pet["health"] - 10)
+        Returns:
+            List pesan (warna, teks) untuk event yang terjadi.
+        """
+        # Peluang, efek & pesan event diambil dari tabel di events.py
+        hits = roll_events(pet, action, self.rng, MAX_STAT)
+        for event in hits:
+            self.metrics.inc("pet_events_total", event=event_name(event), action=action)
+        return [describe(event, name) for event in hits]
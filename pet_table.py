@@ -0,0 +1,178 @@
+# ============================================================================
+# PET TABLE - Penyimpanan roster berbentuk kolom (columnar)
+# ============================================================================
+# Dict-of-dicts makan ratusan byte per pet (dict + 6 key string + int object).
+# PetTable nyimpen setiap stat di satu array bertipe (array.array), jadi satu
+# pet cuma butuh belasan byte + entry di index nama -> baris.
+
+from array import array
+from collections.abc import MutableMapping
+
+from data_handler import PET_FIELDS, PET_DEFAULTS
+
+# Tipe data tiap kolom: 'h' = signed short (2 byte), 'i' = signed int (4 byte)
+FIELD_TYPES = {
+    "hunger": "h",
+    "energy": "h",
+    "happy": "h",
+    "health": "h",
+    "level": "i",
+    "exp": "i",
+    "ts": "q",  # detik unix, 'q' = signed long long (8 byte)
+}
+
+
+class PetView(MutableMapping):
+    """
+    View ringan ke satu baris PetTable. Bisa dipakai seperti dict
+    (pet["hunger"] += 10), tapi datanya tetap tinggal di kolom tabel.
+    Kalau pet-nya dihapus dari tabel, view ini jangan dipakai lagi.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, field):
+        return self._table.columns[field][self._row]
+
+    def __setitem__(self, field, value):
+        # KeyError kalau field bukan kolom tabel
+        self._table.columns[field][self._row] = int(value)
+
+    def __delitem__(self, field):
+        raise TypeError("PetView fields cannot be deleted")
+
+    def __iter__(self):
+        return iter(self._table.fields)
+
+    def __len__(self):
+        return len(self._table.fields)
+
+    def __repr__(self):
+        return f"PetView({dict(self)!r})"
+
+
+class PetTable(MutableMapping):
+    """
+    Mapping nama -> PetView yang datanya disimpan per kolom.
+    Baris yang dihapus masuk free list dan dipakai ulang oleh pet berikutnya,
+    jadi nomor baris pet lain nggak pernah geser.
+    """
+
+    def __init__(self, fields=PET_FIELDS):
+        self.fields = tuple(fields)
+        self.columns = {field: array(FIELD_TYPES.get(field, "i")) for field in self.fields}
+        self._index = {}   # nama -> nomor baris
+        self._names = []   # nomor baris -> nama (None kalau baris kosong)
+        self._free = []    # baris kosong yang bisa dipakai ulang
+        self.alive = bytearray()  # 1 kalau baris terisi pet (mask buat operasi massal)
+
+    @classmethod
+    def from_mapping(cls, data, fields=PET_FIELDS):
+        """
+        Bangun PetTable dari dict-of-dicts (hasil storage.load()).
+        """
+        table = cls(fields)
+        for name, attrs in data.items():
+            table[name] = attrs
+        return table
+
+    # ------------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------------
+
+    def __getitem__(self, name):
+        return PetView(self, self._index[name])
+
+    def __setitem__(self, name, attrs):
+        row = self._index.get(name)
+        if row is None:
+            row = self._alloc_row(name)
+        for field in self.fields:
+            value = attrs.get(field, PET_DEFAULTS.get(field, 0))
+            self.columns[field][row] = int(value)
+
+    def __delitem__(self, name):
+        row = self._index.pop(name)
+        self._names[row] = None
+        self.alive[row] = 0
+        self._free.append(row)
+
+    def pop(self, name, *default):
+        """
+        Hapus pet dan balikin salinan dict-nya (bukan view, karena barisnya
+        bisa langsung dipakai ulang pet lain).
+        """
+        if name not in self._index:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        attrs = self.row_dict(self._index[name])
+        del self[name]
+        return attrs
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    # ------------------------------------------------------------------------
+    # Helper kolom
+    # ------------------------------------------------------------------------
+
+    def _alloc_row(self, name):
+        if self._free:
+            row = self._free.pop()
+            self._names[row] = name
+            self.alive[row] = 1
+        else:
+            row = len(self._names)
+            self._names.append(name)
+            self.alive.append(1)
+            for field in self.fields:
+                self.columns[field].append(0)
+        self._index[name] = row
+        return row
+
+    def copy(self):
+        """
+        Salinan tabel (copy array kolom, jauh lebih cepat dari copy per pet).
+        """
+        table = PetTable(self.fields)
+        table.columns = {field: col[:] for field, col in self.columns.items()}
+        table._index = dict(self._index)
+        table._names = list(self._names)
+        table._free = list(self._free)
+        table.alive = bytearray(self.alive)
+        return table
+
+    def row_of(self, name):
+        return self._index[name]
+
+    def name_at(self, row):
+        return self._names[row]
+
+    def names_at(self, rows):
+        # Nama pet di tiap nomor baris (None = baris kosong), sekaligus
+        return list(map(self._names.__getitem__, rows))
+
+    def row_dict(self, row):
+        return {field: self.columns[field][row] for field in self.fields}
+
+    @property
+    def capacity(self):
+        # Jumlah baris fisik (termasuk baris kosong di free list)
+        return len(self._names)
+
+    def live_rows(self):
+        """
+        Nomor baris yang sedang terisi pet.
+        """
+        return [row for row, name in enumerate(self._names) if name is not None]
@@ -0,0 +1,163 @@
+# ============================================================================
+# QUERY - Filter sederhana untuk perintah massal (misal: --where level>=3)
+# ============================================================================
+# Juga dipakai list/stats: "list where health<30 order by level desc limit 20"
+
+import heapq
+import operator
+import re
+from collections import namedtuple
+from itertools import islice
+
+from data_handler import PET_FIELDS
+
+# Operator yang didukung di kondisi where
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Satu kondisi: <field> <op> <angka>, misal "health < 30"
+_CONDITION = re.compile(r"^\s*(\w+)\s*(<=|>=|==|!=|=|<|>)\s*(-?\d+)\s*$")
+
+
+class QueryError(ValueError):
+    """
+    Dilempar kalau teks query nggak bisa dipahami.
+    """
+
+
+def parse_where(text):
+    """
+    Ubah teks "level>=3 and health<50" jadi list kondisi [(field, op, value), ...].
+    """
+    conditions = []
+    for part in re.split(r"\s+and\s+", text.strip(), flags=re.IGNORECASE):
+        match = _CONDITION.match(part)
+        if not match:
+            raise QueryError(f"Invalid condition: '{part.strip()}'")
+        field, op, value = match.groups()
+        field = field.lower()
+        if field not in PET_FIELDS:
+            raise QueryError(f"Unknown field '{field}'. Use one of: {', '.join(PET_FIELDS)}")
+        conditions.append((field, op, int(value)))
+    return conditions
+
+
+def matches(attrs, conditions):
+    """
+    Cek apakah satu pet (dict / PetView) memenuhi semua kondisi.
+    """
+    return all(OPERATORS[op](attrs[field], value) for field, op, value in conditions)
+
+
+# ============================================================================
+# QUERY LENGKAP (list / stats): [where ...] [order by FIELD [asc|desc]] [limit N]
+# ============================================================================
+
+Query = namedtuple("Query", "conditions order_by descending limit")
+
+_QUERY = re.compile(
+    r"^\s*(?:where\s+(?P<where>.+?))?"
+    r"\s*(?:order\s+by\s+(?P<order>\w+)(?:\s+(?P<dir>asc|desc))?)?"
+    r"\s*(?:limit\s+(?P<limit>\d+))?\s*$",
+    re.IGNORECASE,
+)
+
+# Kalau range dari index hasilnya nggak lebih dari limit x angka ini, lebih murah
+# ambil range itu lalu sort, daripada jalan urut index order-by sambil filter
+RANGE_PREFERENCE = 16
+
+
+def parse_query(text):
+    """
+    Ubah "where health<30 order by level desc limit 20" jadi Query.
+    Semua bagian opsional; order by boleh pakai field stat atau "name".
+    """
+    match = _QUERY.match(text or "")
+    if not match:
+        raise QueryError("Usage: [where COND and COND] [order by FIELD [asc|desc]] [limit N]")
+    conditions = parse_where(match["where"]) if match["where"] else []
+    order_by = match["order"].lower() if match["order"] else None
+    if order_by is not None and order_by != "name" and order_by not in PET_FIELDS:
+        raise QueryError(f"Unknown field '{order_by}'. Use name or one of: {', '.join(PET_FIELDS)}")
+    descending = (match["dir"] or "asc").lower() == "desc"
+    limit = int(match["limit"]) if match["limit"] else None
+    return Query(conditions, order_by, descending, limit)
+
+
+def execute(data, query, indexes=None):
+    """
+    Jalankan query ke data. Return list (nama, attrs).
+
+    Kalau ada index (pet_index.PetIndexes) untuk field yang dipakai:
+      - kondisi range (<, <=, >, >=, =) -> ambil potongan index pakai bisect
+      - order by field ter-index + limit -> jalan urut index, berhenti di limit
+    Sisanya (misal kondisi !=, field tanpa index) difilter biasa.
+    """
+    conditions, order_by, descending, limit = query
+    fields = {field for field, _, _ in conditions} | {order_by}
+    if indexes is not None and any(field in indexes.fields for field in fields):
+        indexes.ensure(data)
+    else:
+        indexes = None
+
+    # Kondisi ter-index dengan range paling kecil
+    best = None
+    for pos, (field, op, value) in enumerate(conditions):
+        index = indexes.get(field) if indexes else None
+        bounds = index.bounds(op, value) if index else None
+        if bounds and (best is None or bounds[1] - bounds[0] < best[2] - best[1]):
+            best = (pos, *bounds, index)
+
+    order_index = indexes.get(order_by) if indexes and order_by else None
+    if best is not None and best[3] is order_index:
+        # Kondisi & order by di field yang sama: range-nya sudah urut
+        pos, lo, hi, index = best
+        rest = conditions[:pos] + conditions[pos + 1:]
+        return _take(data, index.names(lo, hi, descending), rest, limit)
+
+    if order_index is not None and limit is not None and (
+        best is None or best[2] - best[1] > limit * RANGE_PREFERENCE
+    ):
+        return _take(data, order_index.names(descending=descending), conditions, limit)
+
+    if best is not None:
+        pos, lo, hi, index = best
+        rest = conditions[:pos] + conditions[pos + 1:]
+        rows = _take(data, index.names(lo, hi), rest, None)
+    else:
+        rows = ((name, attrs) for name, attrs in data.items() if matches(attrs, conditions))
+        if order_by is None:
+            return list(islice(rows, limit))  # cukup baca sampai dapat `limit` pet
+    return _order(rows, order_by, descending, limit)
+
+
+def _take(data, names, conditions, limit):
+    # Ambil pet sesuai urutan `names` yang lolos kondisi, berhenti di limit
+    rows = []
+    for name in names:
+        attrs = data[name]
+        if matches(attrs, conditions):
+            rows.append((name, attrs))
+            if limit is not None and len(rows) >= limit:
+                break
+    return rows
+
+
+def _order(rows, order_by, descending, limit):
+    if order_by is None:
+        return list(islice(rows, limit))
+    if order_by == "name":
+        key = lambda row: row[0]
+    else:
+        key = lambda row: (row[1][order_by], row[0])
+    if limit is None:
+        return sorted(rows, key=key, reverse=descending)
+    pick = heapq.nlargest if descending else heapq.nsmallest
+    return pick(limit, rows, key=key)
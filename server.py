@@ -0,0 +1,320 @@
+# ============================================================================
+# SERVER - Mode multi-user (asyncio TCP / Unix socket)
+# ============================================================================
+# Jalankan: python main.py serve [--host 127.0.0.1] [--port 8765] [--unix PATH] [--tenants DIR]
+#
+# Protokol teks sederhana: client kirim satu perintah per baris (sama persis
+# dengan perintah di REPL), server balas output perintah itu lalu satu baris
+# "." sebagai penanda balasan selesai. Coba pakai: nc 127.0.0.1 8765
+# Nggak ada prompt interaktif: tulis argumen lengkap (misal 'delete maww --yes').
+#
+# Semua client berbagi satu PetManager (data, storage, autosave), tapi tiap
+# koneksi punya Session sendiri: pet yang dipilih & UI-nya terpisah.
+#
+# Dengan --tenants DIR setiap pemilik punya store sendiri di DIR (lihat
+# tenants.py). Client pilih pemiliknya dulu dengan 'login <owner>'; perintah
+# berikutnya jalan di PetManager pemilik itu, yang di-load dari cache LRU.
+
+import asyncio
+import inspect
+import io
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from autosave import AUTOSAVE_INTERVAL
+from metrics import exporter_from_env
+from pet_manager import PetError
+from tenants import TenantCache, TenantError, check_owner
+from ui import HeadlessUI
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+WORKERS = 8
+# Antrian koneksi yang belum di-accept (default asyncio 100 kekecilan buat 1k client)
+BACKLOG = 1024
+# Server selalu autosave di background; interval 0 dinaikkan ke nilai ini
+MIN_AUTOSAVE_INTERVAL = 0.1
+
+# Penanda akhir balasan untuk setiap perintah
+END_OF_REPLY = "."
+
+# Perintah yang cuma menyentuh pet yang sedang dipilih session -> cukup lock per pet
+PET_COMMANDS = ("feed", "play", "sleep", "heal", "status")
+# Perintah yang menyebut nama pet target di argumen pertama
+NAMED_COMMANDS = ("delete", "rename")
+# Nggak boleh lewat jaringan: 'run', 'export' & 'import' baca/tulis file di mesin server, 'profile' mengubah
+# profiler bersama untuk semua client (dan cProfile nggak cocok dengan thread pool),
+# 'undo'/'redo'/'goto' bisa membatalkan perubahan client lain (history-nya satu untuk semua)
+BLOCKED_COMMANDS = ("run", "profile", "undo", "redo", "goto", "export", "import")
+
+
+class Session:
+    """
+    PetManager versi per-client: current_pet & ui milik session sendiri,
+    sisanya (data, lock, storage, autosave, ...) diteruskan ke manager bersama.
+
+    Method PetManager dipanggil dengan self = session, jadi create_pet, feed,
+    dst. bisa dipakai tanpa diubah. Atribut yang di-set method (misal
+    _full_pending) ikut ditulis ke manager.
+
+    Mode tenant: owner = pemilik yang dipilih 'login', manager-nya dipasang
+    ulang (bind) tiap perintah karena bisa di-evict di antara dua perintah.
+    """
+
+    LOCAL = ("current_pet", "ui", "owner")
+
+    def __init__(self, manager, ui=None):
+        object.__setattr__(self, "_manager", manager)
+        object.__setattr__(self, "current_pet", None)
+        object.__setattr__(self, "ui", ui or HeadlessUI(io.StringIO()))
+        object.__setattr__(self, "owner", None)
+
+    def bind(self, manager):
+        object.__setattr__(self, "_manager", manager)
+
+    def __getattr__(self, name):
+        value = getattr(type(self._manager), name, None)
+        if inspect.isfunction(value):
+            return value.__get__(self)  # bind method ke session
+        return getattr(self._manager, name)
+
+    def __setattr__(self, name, value):
+        if name in self.LOCAL:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._manager, name, value)
+
+
+class PetLocks:
+    """
+    Satu lock per nama pet, dibuat saat pertama kali dibutuhkan.
+    """
+
+    def __init__(self):
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def get(self, name):
+        with self._guard:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.Lock()
+            return lock
+
+    def acquire_all(self, names):
+        # Urutan tetap (sorted) biar dua perintah rename nggak saling deadlock
+        locks = [self.get(name) for name in sorted(set(names))]
+        for lock in locks:
+            lock.acquire()
+        return locks
+
+
+class PetServer:
+    """
+    Server asyncio: baca perintah dari banyak koneksi, eksekusi di thread pool.
+
+    Urutan lock selalu: lock pet dulu, baru manager.lock (global).
+    - feed/play/sleep/heal/status -> lock pet yang dipilih session
+      (update dari dua client ke pet yang sama jalan bergantian, nggak ada yang hilang)
+    - delete/rename -> lock pet target + manager.lock
+    - perintah lain (list, create, tick, --all, ...) -> manager.lock
+
+    tenants: TenantCache untuk mode tenant (manager diabaikan, boleh None).
+    """
+
+    def __init__(self, manager=None, workers=WORKERS, tenants=None):
+        # Import di sini biar main.py bisa import server tanpa circular import
+        from main import handle_command, resolve_command
+
+        self.manager = manager
+        self.tenants = tenants
+        if tenants is None and manager.saver is None:
+            # Perintah global jalan sambil pegang manager.lock; kalau save dilakukan
+            # langsung di situ, urutan lock-nya kebalik dengan save_data() -> bisa deadlock.
+            # Jadi di server penulisan selalu lewat AutoSaver (TenantCache juga begitu).
+            manager.start_autosave(server_autosave_interval())
+        self.locks = PetLocks()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pet-cmd")
+        self._handle_command = handle_command
+        self._resolve_command = resolve_command
+        self._server = None
+        self.sessions = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self._client, path=unix_path, backlog=BACKLOG)
+        else:
+            self._server = await asyncio.start_server(self._client, host, port, backlog=BACKLOG)
+        return self._server
+
+    @property
+    def address(self):
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def _client(self, reader, writer):
+        session = Session(self.manager)
+        loop = asyncio.get_running_loop()
+        self.sessions += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break  # client tutup koneksi
+                command = line.decode("utf-8", "replace").strip()
+                if not command:
+                    continue
+                reply, keep_going = await loop.run_in_executor(
+                    self.executor, self.execute, session, command
+                )
+                writer.write(f"{reply}{END_OF_REPLY}\n".encode("utf-8"))
+                await writer.drain()
+                if not keep_going:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    def execute(self, session, command):
+        """
+        Jalankan satu perintah untuk session (dipanggil di thread pool).
+
+        Returns:
+            (output teks, False kalau client minta keluar)
+        """
+        out = io.StringIO()
+        session.ui = HeadlessUI(out)
+        session.ui.answers = iter(())  # prompt interaktif dijawab kosong
+
+        parts = command.replace("'", "").replace('"', "").split()
+        cmd = self._resolve_command(parts[0].lower())  # alias (misal 'ls') -> nama asli
+        args = [a for a in parts[1:] if a not in ("--yes", "-y")]
+
+        if cmd in ("exit", "quit"):
+            # Data disimpan autosave, nggak perlu snapshot penuh tiap client keluar
+            return "Goodbye! 👋\n", False
+        if cmd in BLOCKED_COMMANDS:
+            session.ui.say(f"'{cmd}' is not available in server mode.", "red")
+            return out.getvalue(), True
+
+        if self.tenants is None:
+            self._run(session, self.manager, command, cmd, args)
+        elif cmd == "login":
+            self._login(session, args)
+        elif session.owner is None:
+            session.ui.say("Log in first with 'login <owner>'.", "red")
+        else:
+            try:
+                with self.tenants.use(session.owner) as manager:
+                    session.bind(manager)
+                    self._run(session, manager, command, cmd, args)
+            except Exception as e:
+                # Gagal load / flush store (file rusak, disk penuh, ...)
+                session.ui.say(f"Error: {e}", "red")
+        return out.getvalue(), True
+
+    def _login(self, session, args):
+        try:
+            owner = check_owner(args[0] if len(args) == 1 else "")
+        except TenantError as e:
+            session.ui.say(f"Usage: login <owner>. {e}", "red")
+            return
+        session.owner = owner
+        session.current_pet = None  # pet pemilik lama nggak ikut terpilih
+        session.ui.say(f"Logged in as {owner} ✅", "green")
+
+    def _run(self, session, manager, command, cmd, args):
+        if cmd in PET_COMMANDS and not (args and args[0] in ("--all", "--where")):
+            pets, use_global = [session.current_pet] if session.current_pet else [], False
+        elif cmd in NAMED_COMMANDS and args:
+            pets, use_global = [_target(manager, args[0])], True
+        else:
+            pets, use_global = [], True
+
+        # Mode tenant: nama pet yang sama milik pemilik lain = lock lain
+        held = self.locks.acquire_all([(session.owner, name) for name in pets])
+        try:
+            if use_global:
+                with manager.lock:
+                    self._handle_command(session, session.ui, command)
+            else:
+                self._handle_command(session, session.ui, command)
+        except Exception as e:
+            session.ui.say(f"Error: {e}", "red")
+        finally:
+            for lock in reversed(held):
+                lock.release()
+
+
+def _target(manager, name):
+    # 'delete mi*' -> kunci pet yang benar-benar kena, bukan "mi*"
+    if not name.endswith("*"):
+        return name
+    try:
+        return manager.find_pet(name)
+    except PetError:
+        return name
+
+
+def server_autosave_interval():
+    return max(AUTOSAVE_INTERVAL, MIN_AUTOSAVE_INTERVAL)
+
+
+def serve_main(argv):
+    """
+    Mode "python main.py serve [--host H] [--port P] [--unix PATH] [--tenants DIR]".
+    """
+    from pet_manager import PetManager
+
+    usage = "Usage: main.py serve [--host H] [--port P] [--unix PATH] [--tenants DIR]"
+    options = {"--host": DEFAULT_HOST, "--port": str(DEFAULT_PORT), "--unix": None, "--tenants": None}
+    args = [a for a in argv if a != "--headless"]
+    while args:
+        flag = args.pop(0)
+        if flag not in options or not args:
+            print(usage, file=sys.stderr)
+            return 2
+        options[flag] = args.pop(0)
+    if not options["--port"].isdigit():
+        print(usage, file=sys.stderr)
+        return 2
+
+    ui = HeadlessUI()
+    if options["--tenants"]:
+        # Metrik & exporter per manager, jadi di mode tenant nggak ada exporter bersama
+        manager, exporter = None, None
+        tenants = TenantCache(options["--tenants"], autosave=server_autosave_interval())
+    else:
+        manager, tenants = PetManager(ui=ui), None
+        exporter = exporter_from_env(manager.metrics)
+
+    async def run():
+        server = PetServer(manager, tenants=tenants)
+        await server.start(options["--host"], int(options["--port"]), options["--unix"])
+        ui.say(f"Pet server listening on {options['--unix'] or server.address} (Ctrl+C to stop)")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        ui.say("\nStopping server...")
+    finally:
+        (tenants or manager).close()
+        if exporter is not None:
+            exporter.stop()
+    return 0
@@ -0,0 +1,500 @@
+# ============================================================================
+# SHARD - Roster dibagi ke beberapa proses worker (satu file per shard)
+# ============================================================================
+# Aktifkan dengan env PET_SHARDS=4 (REPL & mode 'run'; server belum didukung).
+#
+# Pet dibagi berdasarkan hash nama (crc32 % jumlah shard). Setiap worker adalah
+# proses terpisah dengan PetManager & file snapshot/journal sendiri di folder
+# pet_shards/ (shard-00.json, shard-01.json, ...). ShardedManager di proses
+# utama jadi koordinator:
+#   - perintah satu pet (create, select, feed, status, ...) -> shard pemilik
+#   - list / stats / tick / bulk / save -> dikirim ke semua shard sekaligus,
+#     dikerjakan paralel (beda proses = beda core, nggak kena GIL), lalu digabung
+#
+# Jumlah shard dicatat di pet_shards/shards.json; kalau roster sudah dibagi ke
+# N shard, PET_SHARDS harus tetap N (hash-nya ikut jumlah shard).
+
+import heapq
+import io
+import json
+import os
+import zlib
+from itertools import chain, islice
+
+from data_handler import DATA_FILE, JsonStorage
+from metrics import Metrics
+from name_index import SUGGEST_LIMIT, COMPLETE_LIMIT
+from pet_manager import PetManager, PetError, list_lines, stats_lines, pick_name
+from query import parse_query, parse_where, QueryError
+from ui import HeadlessUI
+
+SHARDS_ENV = "PET_SHARDS"
+SHARD_DIR_ENV = "PET_SHARD_DIR"
+DEFAULT_SHARD_DIR = "pet_shards"
+META_FILE = "shards.json"
+
+
+def shard_of(name, shards):
+    """
+    Nomor shard pemilik pet `name` (stabil antar proses, beda dengan hash()).
+    """
+    return zlib.crc32(name.encode("utf-8")) % shards
+
+
+def shard_path(folder, index):
+    return os.path.join(folder, f"shard-{index:02d}.json")
+
+
+# ============================================================================
+# WORKER (jalan di proses shard)
+# ============================================================================
+
+# Hasil method yang boleh dikirim balik ke koordinator (sisanya, misal AutoSaver, nggak bisa di-pickle)
+_RESULT_TYPES = (type(None), bool, int, float, str, list, tuple, dict)
+
+
+def _call(manager, method, *args):
+    # Method "command" PetManager; hasilnya dikirim balik kalau tipe data biasa (misal verify -> ok)
+    result = getattr(manager, method)(*args)
+    return result if isinstance(result, _RESULT_TYPES) else None
+
+
+def _rows(manager, query):
+    # Pet di shard ini untuk list/stats, dalam bentuk dict biasa (bisa di-pickle)
+    with manager.lock:
+        rows = manager.data.items() if query is None else manager.run_query(query)
+        return [(name, dict(attrs)) for name, attrs in rows]
+
+
+def _get(manager, name):
+    with manager.lock:
+        attrs = manager.data.get(name)
+        return None if attrs is None else dict(attrs)
+
+
+def _put(manager, rows):
+    # Masukkan pet apa adanya (pindahan dari shard lain / import roster lama)
+    with manager.lock:
+        for name, attrs in rows:
+            manager.data[name] = attrs
+            manager._mark(name)
+    manager._commit()
+
+
+def _set_autosave(manager, flag):
+    manager.autosave = flag
+
+
+# Operasi yang bisa diminta koordinator: nama -> fungsi(manager, *args)
+WORKER_OPS = {
+    "call": _call,
+    "rows": _rows,
+    "get": _get,
+    "put": _put,
+    "has": lambda manager, name: name in manager.data,
+    "names": lambda manager, pattern: manager.match_names(pattern),
+    "complete": lambda manager, prefix, limit: manager.complete_names(prefix, limit),
+    "world": lambda manager, *args: manager._run_world(*args),
+    "autosave": _set_autosave,
+}
+
+
+def _worker_main(path, conn):
+    """
+    Loop proses shard: terima (op, current_pet, args), balas
+    (status, hasil, output teks, current_pet).
+    """
+    out = io.StringIO()
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(out))
+    while True:
+        try:
+            op, current, args = conn.recv()
+        except EOFError:
+            break
+        if op == "close":
+            manager.close()
+            conn.send(("ok", None, "", None))
+            break
+        manager.current_pet = current
+        try:
+            reply = ("ok", WORKER_OPS[op](manager, *args))
+        except Exception as e:
+            reply = ("error", e)
+        conn.send(reply + (out.getvalue(), manager.current_pet))
+        out.seek(0)
+        out.truncate()
+    conn.close()
+
+
+# ============================================================================
+# KOORDINATOR
+# ============================================================================
+
+class ShardedManager:
+    """
+    Pengganti PetManager untuk main.py yang membagi roster ke beberapa proses.
+    Interface-nya sama dengan method "command" PetManager (create_pet, feed,
+    list_pets, tick, ...), jadi handle_command & run_script tetap jalan.
+    """
+
+    def __init__(self, shards, folder=None, ui=None):
+        from ui import get_ui
+
+        if shards < 1:
+            raise ValueError("Need at least one shard.")
+        self.ui = ui or get_ui()
+        self.shards = shards
+        self.folder = folder or os.environ.get(SHARD_DIR_ENV, DEFAULT_SHARD_DIR)
+        self.metrics = Metrics()
+        self.profiler = None
+        self.current_pet = None
+        self._autosave = True
+
+        import multiprocessing  # cuma dimuat kalau mode shard benar-benar dipakai
+
+        fresh = self._check_meta()
+        # spawn: proses worker bersih (nggak mewarisi thread/lock proses utama)
+        context = multiprocessing.get_context("spawn")
+        self._conns = []
+        self._procs = []
+        for index in range(shards):
+            parent, child = context.Pipe()
+            proc = context.Process(
+                target=_worker_main, args=(shard_path(self.folder, index), child),
+                name=f"pet-shard-{index}", daemon=True,
+            )
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+        if fresh:
+            self._import_roster()
+
+    # ------------------------------------------------------------------------
+    # Komunikasi dengan worker
+    # ------------------------------------------------------------------------
+
+    def _ask(self, index, op, *args, show=True):
+        """
+        Kirim satu operasi ke satu shard & tunggu hasilnya.
+        Output teks dari worker langsung ditampilkan (show=True).
+        """
+        self._conns[index].send((op, self.current_pet, args))
+        return self._receive(index, show)
+
+    def _ask_all(self, op, *args, show=True):
+        """
+        Kirim operasi ke semua shard dulu (jalan paralel), baru kumpulkan hasilnya.
+        """
+        for conn in self._conns:
+            conn.send((op, None, args))
+        # Semua balasan dibaca dulu walau ada yang error, biar pipe tetap sinkron
+        replies = [self._conns[index].recv() for index in range(self.shards)]
+        return [self._unpack(reply, show) for reply in replies]
+
+    def _receive(self, index, show):
+        return self._unpack(self._conns[index].recv(), show)
+
+    def _unpack(self, reply, show):
+        status, value, output, current = reply
+        if show and output:
+            self.ui.say(output.rstrip("\n"))
+        if status == "error":
+            raise value
+        return value, current
+
+    def _owner(self, name):
+        return shard_of(name, self.shards)
+
+    def _call(self, name, method, *args):
+        # Jalankan method PetManager di shard pemilik `name`, ikut update current_pet
+        _, current = self._ask(self._owner(name), "call", method, *args)
+        return current
+
+    # ------------------------------------------------------------------------
+    # Setup: metadata jumlah shard & import roster lama
+    # ------------------------------------------------------------------------
+
+    def _check_meta(self):
+        """
+        Pastikan folder shard cocok dengan jumlah shard. Return True kalau baru dibuat.
+        """
+        meta = os.path.join(self.folder, META_FILE)
+        if os.path.exists(meta):
+            with open(meta, encoding="utf-8") as f:
+                existing = json.load(f)["shards"]
+            if existing != self.shards:
+                raise ValueError(
+                    f"{self.folder} holds a roster split into {existing} shards; "
+                    f"run with {SHARDS_ENV}={existing}."
+                )
+            return False
+        os.makedirs(self.folder, exist_ok=True)
+        with open(meta, "w", encoding="utf-8") as f:
+            json.dump({"shards": self.shards}, f)
+        return True
+
+    def _import_roster(self):
+        # Pertama kali sharding: pet dari pet_data.json dibagi ke shard-shard
+        if not os.path.exists(DATA_FILE):
+            return
+        storage = JsonStorage(DATA_FILE, lazy=False)
+        data = storage.load()
+        storage.close()
+        parts = [[] for _ in range(self.shards)]
+        for name, attrs in data.items():
+            parts[self._owner(name)].append((name, dict(attrs)))
+        for index, rows in enumerate(parts):
+            self._ask(index, "put", rows, show=False)
+        self._ask_all("call", "save_data", True, show=False)
+        if data:
+            self.ui.say(f"Imported {len(data):,} pets from {DATA_FILE} into {self.shards} shards.", "yellow")
+
+    # ------------------------------------------------------------------------
+    # Perintah satu pet -> shard pemilik
+    # ------------------------------------------------------------------------
+
+    def create_pet(self, name):
+        self._call(name.strip(), "create_pet", name)
+
+    def find_pet(self, pattern):
+        """
+        Sama dengan PetManager.find_pet. Nama persis cukup ditanya ke shard
+        pemiliknya; prefix "mi*" & saran typo dicari di semua shard lalu digabung.
+        """
+        pattern = pattern.strip()
+        if not pattern:
+            raise PetError("Name required.")
+        if self._ask(self._owner(pattern), "has", pattern, show=False)[0]:
+            return pattern
+        replies = [value for value, _ in self._ask_all("names", pattern, show=False)]
+        exact = next((reply[0] for reply in replies if reply[0] is not None), None)
+        matches = list(islice(heapq.merge(*(reply[1] for reply in replies)), SUGGEST_LIMIT))
+        total = sum(reply[2] for reply in replies)
+        # Tiap shard kasih saran dengan jarak terdekat di shard itu; digabung urut abjad
+        # (jaraknya bisa beda antar shard, cukup untuk "did you mean")
+        suggestions = sorted(chain.from_iterable(reply[3] for reply in replies))[:SUGGEST_LIMIT]
+        return pick_name(pattern, (exact, matches, total, suggestions))
+
+    def complete_names(self, prefix, limit=COMPLETE_LIMIT):
+        replies = self._ask_all("complete", prefix, limit, show=False)
+        return list(islice(heapq.merge(*(value for value, _ in replies)), limit))
+
+    def select_pet(self, name):
+        try:
+            name = self.find_pet(name)
+        except PetError as e:
+            self.ui.say(str(e), "red")
+            return
+        self.current_pet = self._call(name, "select_pet", name)
+
+    def show_status(self):
+        if self._ensure_selected():
+            self.current_pet = self._call(self.current_pet, "show_status")
+
+    def _interact(self, action):
+        if self._ensure_selected():
+            self.current_pet = self._call(self.current_pet, action)
+
+    def feed(self):
+        self._interact("feed")
+
+    def play(self):
+        self._interact("play")
+
+    def sleep(self):
+        self._interact("sleep")
+
+    def heal(self):
+        self._interact("heal")
+
+    def delete(self, name, confirm=None):
+        name = name.strip()
+        if not name:
+            self.ui.say("Name required.", "red")
+            return
+        try:
+            name = self.find_pet(name)
+        except PetError as e:
+            self.ui.say(str(e), "red")
+            return
+        # Konfirmasi ditanya di sini (worker nggak punya terminal)
+        if confirm is None:
+            answer = self.ui.ask(f"Are you sure to delete '{name}'? (y/n): ", "red")
+            confirm = answer.strip().lower() == "y"
+        current = self._call(name, "delete", name, confirm)
+        if self.current_pet == name:
+            self.current_pet = current
+
+    def rename(self, old_name, new_name):
+        old_name, new_name = old_name.strip(), new_name.strip()
+        if old_name and new_name:
+            try:
+                old_name = self.find_pet(old_name)
+            except PetError as e:
+                self.ui.say(str(e), "red")
+                return
+        old_shard, new_shard = self._owner(old_name), self._owner(new_name)
+        if not old_name or not new_name or old_shard == new_shard:
+            # Satu shard: validasi & pesan ditangani PetManager di worker
+            current = self._call(old_name, "rename", old_name, new_name)
+            if self.current_pet == old_name:
+                self.current_pet = current
+            return
+
+        attrs = self._ask(old_shard, "get", old_name)[0]
+        if attrs is None:
+            self.ui.say("Pet not found.", "red")
+            return
+        if self._ask(new_shard, "has", new_name)[0]:
+            self.ui.say("New name already used by another pet.", "red")
+            return
+        # Tulis di shard baru dulu, baru hapus yang lama: kalau crash di tengah,
+        # pet-nya dobel (bisa dihapus), bukan hilang
+        self._ask(new_shard, "put", [(new_name, attrs)])
+        self._ask(old_shard, "call", "remove_pet", old_name)
+        if self.current_pet == old_name:
+            self.current_pet = new_name
+        self.ui.say(f"Renamed '{old_name}' to '{new_name}' ✅", "green")
+
+    # ------------------------------------------------------------------------
+    # Perintah semua pet -> semua shard paralel
+    # ------------------------------------------------------------------------
+
+    def _gather_rows(self, query):
+        """
+        Ambil pet dari semua shard & gabungkan sesuai order by / limit.
+        Return None (setelah tampilkan pesan) kalau query salah / nggak ada hasil.
+        """
+        try:
+            parsed = parse_query(query) if query else None
+        except QueryError as e:
+            self.ui.say(str(e), "red")
+            return None
+        parts = [rows for rows, _ in self._ask_all("rows", parsed)]
+        if not any(parts):
+            self.ui.say("No pets matched." if query else "No pets found.", "red")
+            return None
+        if parsed is None or parsed.order_by is None:
+            rows = chain.from_iterable(parts)
+        else:
+            # Tiap shard sudah urut -> cukup merge (urutan sama dengan query.execute)
+            if parsed.order_by == "name":
+                key = lambda row: row[0]
+            else:
+                key = lambda row, field=parsed.order_by: (row[1][field], row[0])
+            rows = heapq.merge(*parts, key=key, reverse=parsed.descending)
+        limit = parsed.limit if parsed else None
+        return list(islice(rows, limit))
+
+    def list_pets(self, query=None):
+        rows = self._gather_rows(query)
+        if rows is not None:
+            self.ui.page(list_lines(rows))
+
+    def stats_all(self, query=None):
+        rows = self._gather_rows(query)
+        if rows is not None:
+            self.ui.page(stats_lines(rows))
+
+    def _run_world(self, action, conditions, ticks=1):
+        # Jalan di semua shard sekaligus, hasilnya dijumlahkan
+        total = {}
+        for result, _ in self._ask_all("world", action, conditions, ticks, show=False):
+            for key, count in result.items():
+                total[key] = total.get(key, 0) + count
+        return total
+
+    def bulk(self, action, where=None):
+        try:
+            conditions = parse_where(where) if where else ()
+        except QueryError as e:
+            self.ui.say(str(e), "red")
+            return
+        result = self._run_world(action, conditions)
+        if not result["pets"]:
+            self.ui.say("No pets matched.", "red")
+            return
+        self.ui.say(f"{action.capitalize()} applied to {result['pets']:,} pets ✅", "green")
+        PetManager._print_world_result(self, result)
+
+    def tick(self, ticks=1):
+        result = self._run_world("tick", (), ticks)
+        if not result["pets"]:
+            self.ui.say("No pets found.", "red")
+            return
+        self.ui.say(f"⏳ World advanced {ticks} tick(s) for {result['pets']:,} pets.", "cyan")
+        PetManager._print_world_result(self, result)
+
+    # ------------------------------------------------------------------------
+    # Undo / redo / history: urutan operasi antar shard nggak tercatat
+    # ------------------------------------------------------------------------
+
+    def _no_history(self, *args):
+        self.ui.say("Undo, redo and history are not available with sharded rosters.", "red")
+
+    undo = redo = goto = show_history = _no_history
+
+    def _no_transfer(self, *args):
+        # Export/import per chunk butuh satu roster; belum dibagi ke shard
+        self.ui.say("Export and import are not available with sharded rosters.", "red")
+
+    export_pets = import_pets = _no_transfer
+
+    # ------------------------------------------------------------------------
+    # Save, autosave & tutup
+    # ------------------------------------------------------------------------
+
+    @property
+    def autosave(self):
+        return self._autosave
+
+    @autosave.setter
+    def autosave(self, flag):
+        # Dipakai run_script: matikan save per perintah di semua shard
+        self._autosave = flag
+        self._ask_all("autosave", flag, show=False)
+
+    def save_data(self, full=False):
+        self._ask_all("call", "save_data", full, show=False)
+
+    def convert(self, fmt):
+        # Semua shard dikonversi, tapi pesan sukses/gagal cukup dari shard pertama
+        for index in range(self.shards):
+            self._ask(index, "call", "convert", fmt, show=index == 0)
+
+    def backup(self, full=False):
+        # Tiap shard punya folder backup sendiri (pet_shards/shard-00.json.backups, ...), dibuat paralel
+        self._ask_all("call", "backup", full)
+
+    def verify(self):
+        ok = True
+        for index in range(self.shards):
+            self.ui.say(f"Shard {index}:", "cyan")
+            ok = self._ask(index, "call", "verify")[0] and ok
+        return ok
+
+    def start_autosave(self, interval=None, threshold=None):
+        self._ask_all("call", "start_autosave", interval, threshold, show=False)
+
+    def close(self):
+        for conn in self._conns:
+            conn.send(("close", None, ()))
+        for index in range(self.shards):
+            self._receive(index, show=False)
+        for proc in self._procs:
+            proc.join()
+
+    def _ensure_selected(self):
+        if not self.current_pet:
+            self.ui.say("Select a pet first using 'select [name]'.", "red")
+            return False
+        return True
+
+
+def shards_from_env():
+    """
+    Jumlah shard dari env PET_SHARDS (0 / kosong = tanpa sharding).
+    """
+    value = os.environ.get(SHARDS_ENV, "").strip()
+    return int(value) if value.isdigit() else 0
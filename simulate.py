@@ -0,0 +1,136 @@
+# ============================================================================
+# SIMULATE - Simulasi Monte Carlo untuk balancing (vectorized NumPy)
+# ============================================================================
+# Jalankan: python main.py simulate --pets 1000000 --steps 200 --seed 1
+#
+# Sejumlah pet virtual (bukan roster asli, nggak ada yang disimpan) mulai dari
+# NEW_PET_STATS. Setiap step, tiap pet memilih satu interaksi secara acak
+# sesuai --mix, lalu setiap --tick-every step ada satu world tick. Aturannya
+# persis world._step_rows (efek, level up, tabel event di events.py), jadi
+# ubah angka di pet_manager.py / events.py lalu jalankan ulang untuk lihat
+# efeknya ke kurva level & tingkat kelaparan.
+
+import sys
+import time
+
+import world
+from pet_manager import NEW_PET_STATS, ACTION_EFFECTS
+from pet_table import FIELD_TYPES
+from events import HAZARD_EVENTS
+
+np = world.np
+
+# Campuran interaksi default (bobot, nggak harus berjumlah 100)
+DEFAULT_MIX = {action: 1 for action in ACTION_EFFECTS}
+
+# Jumlah baris ringkasan kurva level yang ditampilkan
+CHECKPOINTS = 10
+
+
+def parse_mix(text):
+    """
+    "feed=40,play=30,sleep=20,heal=10" -> {action: bobot}. Lempar ValueError kalau salah.
+    """
+    mix = {}
+    for part in filter(None, text.split(",")):
+        action, _, weight = part.partition("=")
+        action = action.strip().lower()
+        if action not in ACTION_EFFECTS or not weight.strip().isdigit():
+            raise ValueError(f"Bad mix entry '{part}'. Use e.g. feed=40,play=30,sleep=20,heal=10")
+        mix[action] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("Mix needs at least one action with weight > 0.")
+    return mix
+
+
+def simulate(pets, steps, mix=None, tick_every=1, seed=None, checkpoints=CHECKPOINTS):
+    """
+    Jalankan simulasi. Return dict:
+        curve   : list (step, rata-rata level, p10, p50, p90, % pet health 0)
+        result  : total counter seperti world.run (level_ups, bonus, starving, ...)
+        rates   : counter hazard per pet per step (misal starving)
+        elapsed : detik
+    """
+    if np is None:
+        raise RuntimeError("The simulator needs NumPy (pip install numpy).")
+    if pets < 1:
+        raise ValueError("The simulation needs at least one pet.")
+    mix = mix or DEFAULT_MIX
+    actions = [action for action, weight in mix.items() if weight > 0]
+    # Batas kumulatif bobot: action pet = posisi angka acak 0..1 di sini
+    bounds = np.cumsum([mix[action] for action in actions], dtype=float)
+    bounds /= bounds[-1]
+
+    rng = np.random.default_rng(seed)
+    cols = {
+        field: np.full(pets, value, dtype=world._NP_TYPES[FIELD_TYPES[field]])
+        for field, value in NEW_PET_STATS.items()
+    }
+    everyone = np.arange(pets)
+    result = world.new_result()
+    result["pets"] = pets
+    every = max(1, steps // checkpoints)
+    curve = []
+
+    start = time.perf_counter()
+    for step in range(1, steps + 1):
+        choice = np.searchsorted(bounds, rng.random(pets), side="right")
+        for i, action in enumerate(actions):
+            rows = np.flatnonzero(choice == i)
+            if rows.size:
+                world._step_rows(cols, rows, action, rng, result)
+        if tick_every and step % tick_every == 0:
+            world._step_rows(cols, everyone, "tick", rng, result)
+        if step % every == 0 or step == steps:
+            p10, p50, p90 = np.percentile(cols["level"], (10, 50, 90))
+            dead = float(np.count_nonzero(cols["health"] == 0)) / pets * 100
+            curve.append((step, float(cols["level"].mean()), p10, p50, p90, dead))
+    elapsed = time.perf_counter() - start
+
+    pet_steps = pets * steps or 1
+    rates = {hazard.name: result[hazard.name] / pet_steps for hazard in HAZARD_EVENTS}
+    return {"curve": curve, "result": result, "rates": rates, "elapsed": elapsed}
+
+
+def simulate_main(argv):
+    """
+    Mode "python main.py simulate [--pets N] [--steps S] [--mix ...] [--tick-every K] [--seed X]".
+    """
+    usage = ("Usage: main.py simulate [--pets N] [--steps S] [--mix feed=1,play=1,sleep=1,heal=1] "
+             "[--tick-every K] [--seed X]")
+    options = {"--pets": "100000", "--steps": "100", "--mix": None, "--tick-every": "1", "--seed": None}
+    args = [a for a in argv if a != "--headless"]
+    while args:
+        flag = args.pop(0)
+        if flag not in options or not args:
+            print(usage, file=sys.stderr)
+            return 2
+        options[flag] = args.pop(0)
+    numbers = ("--pets", "--steps", "--tick-every") + (("--seed",) if options["--seed"] else ())
+    # --pets & --tick-every minimal 1 (0 pet = nggak ada yang disimulasikan, tick tiap 0 step nggak masuk akal)
+    if not all(options[flag].isdigit() for flag in numbers) or \
+            int(options["--pets"]) < 1 or int(options["--tick-every"]) < 1:
+        print(usage, file=sys.stderr)
+        return 2
+
+    try:
+        mix = parse_mix(options["--mix"]) if options["--mix"] else None
+        report = simulate(
+            int(options["--pets"]), int(options["--steps"]), mix,
+            int(options["--tick-every"]), int(options["--seed"]) if options["--seed"] else None,
+        )
+    except (ValueError, RuntimeError) as e:
+        print(e, file=sys.stderr)
+        return 1
+
+    pets, steps = int(options["--pets"]), int(options["--steps"])
+    print(f"Simulated {pets:,} pets x {steps:,} steps in {report['elapsed']:.2f}s "
+          f"({pets * steps / max(report['elapsed'], 1e-9):,.0f} interactions/sec)")
+    print(f"{'step':>6} | {'avg lv':>7} | {'p10':>5} | {'p50':>5} | {'p90':>5} | {'health 0':>8}")
+    for step, avg, p10, p50, p90, dead in report["curve"]:
+        print(f"{step:>6} | {avg:>7.2f} | {p10:>5.0f} | {p50:>5.0f} | {p90:>5.0f} | {dead:>7.2f}%")
+    result = report["result"]
+    print(f"Level ups: {result['level_ups']:,} | Bonus events: {result['bonus']:,}")
+    for name, rate in report["rates"].items():
+        print(f"{name.capitalize()}: {result[name]:,} ({rate * 100:.3f}% of pet-steps)")
+    return 0
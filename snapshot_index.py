@@ -0,0 +1,171 @@
+# ============================================================================
+# SNAPSHOT INDEX - Index offset pet di dalam pet_data.json
+# ============================================================================
+# Buat roster besar, pet_data.json nggak dibaca utuh saat start. Yang dibaca
+# cuma file index kecil di sebelahnya (pet_data.json.idx):
+#
+#   header | entry (fixed 28 byte) x jumlah pet, urut nama | blok nama (UTF-8)
+#   entry = (offset nama di blok, panjang nama, offset record, panjang record, crc32 record)
+#
+# Karena entry urut nama & ukurannya tetap, cari satu pet = binary search
+# langsung di file (sekitar log2(n) kali baca), tanpa load index ke memori.
+# Header menyimpan ukuran & mtime snapshot; kalau nggak cocok, index dibangun
+# ulang dengan sekali scan streaming (cuma terjadi sekali, saat pertama dibuka).
+# crc32 per record dipakai 'verify' untuk cek isi snapshot tanpa parse JSON.
+
+import json
+import mmap
+import os
+import re
+import struct
+import zlib
+
+INDEX_SUFFIX = ".idx"
+
+_MAGIC = b"PETIDX02"
+_HEADER = struct.Struct("<8sQQQ")   # magic, ukuran snapshot, mtime_ns snapshot, jumlah pet
+_ENTRY = struct.Struct("<QIQII")    # offset nama, panjang nama, offset record, panjang record, crc32
+
+# Satu pet di JSON snapshot: "nama": { ...stat tanpa object bersarang... }
+RECORD_RE = re.compile(rb'"((?:[^"\\]|\\.)*)"\s*:\s*(\{[^{}]*\})')
+
+# Ukuran potongan file yang dibaca sekali jalan saat scan
+CHUNK_SIZE = 1 << 20
+
+
+def decode_key(raw):
+    # Kebanyakan nama nggak punya escape, jadi cukup decode UTF-8 biasa
+    if b"\\" in raw:
+        return json.loads(b'"' + raw + b'"')
+    return raw.decode("utf-8")
+
+
+def scan_records(f):
+    """
+    Baca snapshot JSON sepotong-sepotong (CHUNK_SIZE) dan yield
+    (key mentah, offset record, bytes record) untuk setiap pet, urut file.
+    Memori yang dipakai nggak tergantung besar file.
+    """
+    base = f.tell()  # offset file untuk byte pertama di `buf`
+    buf = b""
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        buf += chunk
+        end = 0
+        for match in RECORD_RE.finditer(buf):
+            yield match.group(1), base + match.start(2), match.group(2)
+            end = match.end()
+        if not chunk:
+            return
+        # Sisa setelah record utuh terakhir disambung dengan potongan berikutnya
+        buf = buf[end:]
+        base += end
+
+
+def write_index(snapshot_path, entries, index_path=None):
+    """
+    Tulis index untuk snapshot. entries: iterable (nama, offset record, panjang record, crc32 record).
+    Ditulis atomik (file sementara + os.replace) seperti snapshot. Return path index.
+
+    index_path: default snapshot_path + ".idx". Compaction menulis index untuk
+    snapshot .tmp dulu, lalu menukar keduanya sekaligus.
+    """
+    entries = sorted((name.encode("utf-8"), offset, length, crc) for name, offset, length, crc in entries)
+    stat = os.stat(snapshot_path)
+    path = index_path or snapshot_path + INDEX_SUFFIX
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, stat.st_size, stat.st_mtime_ns, len(entries)))
+        name_pos = 0
+        for name, offset, length, crc in entries:
+            f.write(_ENTRY.pack(name_pos, len(name), offset, length, crc))
+            name_pos += len(name)
+        for name, _, _, _ in entries:
+            f.write(name)
+    os.replace(tmp, path)
+    return path
+
+
+def build_index(snapshot_path):
+    """
+    Scan snapshot sekali dan tulis index-nya. Return jumlah pet.
+    Lempar ValueError kalau snapshot-nya kelihatan terpotong / bukan object JSON.
+    """
+    entries = []
+    with open(snapshot_path, "rb") as f:
+        _check_ends(f)
+        for raw, offset, record in scan_records(f):
+            entries.append((decode_key(raw), offset, len(record), zlib.crc32(record)))
+    write_index(snapshot_path, entries)
+    return len(entries)
+
+
+def _check_ends(f):
+    # Scan regex nggak tahu kalau file terpotong: cukup cek object-nya ditutup.
+    # File kosong / {} nggak apa-apa. Posisi file dikembalikan ke awal.
+    head = f.read(CHUNK_SIZE).lstrip()
+    f.seek(max(0, f.seek(0, os.SEEK_END) - CHUNK_SIZE))
+    tail = f.read().rstrip()
+    f.seek(0)
+    if head and not (head.startswith(b"{") and tail.endswith(b"}")):
+        raise ValueError("snapshot is truncated or not a JSON object")
+
+
+def index_count(snapshot_path):
+    """
+    Jumlah pet menurut index, atau None kalau index belum ada / sudah basi.
+    """
+    try:
+        with open(snapshot_path + INDEX_SUFFIX, "rb") as f:
+            magic, size, mtime_ns, count = _HEADER.unpack(f.read(_HEADER.size))
+        stat = os.stat(snapshot_path)
+    except (OSError, struct.error):
+        return None
+    if magic != _MAGIC or size != stat.st_size or mtime_ns != stat.st_mtime_ns:
+        return None
+    return count
+
+
+def lookup(snapshot_path, count, name):
+    """
+    Binary search nama di file index. Return (offset, panjang) record, atau None.
+    """
+    target = name.encode("utf-8")
+    names_base = _HEADER.size + count * _ENTRY.size
+    lo, hi = 0, count
+    # buffering=0: tiap probe cuma baca beberapa byte, buffer 8 KB malah bikin lambat
+    with open(snapshot_path + INDEX_SUFFIX, "rb", buffering=0) as f:
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(_HEADER.size + mid * _ENTRY.size)
+            name_pos, name_len, offset, length, _ = _ENTRY.unpack(f.read(_ENTRY.size))
+            f.seek(names_base + name_pos)
+            probe = f.read(name_len)
+            if probe == target:
+                return offset, length
+            if probe < target:
+                lo = mid + 1
+            else:
+                hi = mid
+    return None
+
+
+def verify(snapshot_path, count):
+    """
+    Cocokkan crc32 setiap record snapshot dengan index (index harus masih
+    segar, lihat index_count). Record nggak di-parse. Return list nama pet
+    yang record-nya rusak.
+    """
+    with open(snapshot_path + INDEX_SUFFIX, "rb") as f:
+        f.seek(_HEADER.size)
+        entries = f.read(count * _ENTRY.size)
+        names = f.read()
+    bad = []
+    with open(snapshot_path, "rb") as f:
+        if not count or not os.fstat(f.fileno()).st_size:
+            return bad
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            for name_pos, name_len, offset, length, crc in _ENTRY.iter_unpack(entries):
+                if zlib.crc32(view[offset:offset + length]) != crc:
+                    bad.append(names[name_pos:name_pos + name_len].decode("utf-8", "replace"))
+    return bad
@@ -0,0 +1,263 @@
+# ============================================================================
+# TENANTS - Satu store per pemilik + cache LRU PetManager yang sedang dipakai
+# ============================================================================
+# Aktifkan di server: python main.py serve --tenants pet_tenants
+#
+# Setiap pemilik (owner) punya file sendiri di folder tenant:
+# pet_tenants/budi.json (+ budi.journal), atau budi.db kalau PET_STORAGE=sqlite.
+# Satu proses server melayani semua pemilik; PetManager pemilik yang aktif
+# disimpan di TenantCache (LRU). Kalau jumlahnya lewat PET_TENANT_MAX atau
+# perkiraan memorinya lewat PET_TENANT_MEMORY_MB, pemilik yang paling lama
+# nggak dipakai di-evict: perubahannya di-flush ke disk (manager.close()),
+# lalu manager-nya dibuang dari memori. Pemilik yang nggak aktif cuma makan disk.
+#
+# Manager yang sedang dipakai perintah ("pinned", lihat TenantCache.use) nggak
+# pernah di-evict, dan pemilik yang sedang di-flush baru boleh di-load lagi
+# setelah flush-nya selesai (biar nggak baca file sebelum perubahan terakhir masuk).
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from data_handler import LazyPetMap, open_storage
+from pet_manager import PetManager
+from pet_table import PetTable
+from ui import HeadlessUI
+
+TENANT_DIR = os.environ.get("PET_TENANT_DIR", "pet_tenants")
+# Maksimal PetManager yang di-load bersamaan & perkiraan memori totalnya
+TENANT_MAX = int(os.environ.get("PET_TENANT_MAX", "100"))
+TENANT_MEMORY_MB = float(os.environ.get("PET_TENANT_MEMORY_MB", "256"))
+
+# Perkiraan byte per pet di memori (lihat benchmarks.bench_memory; dibulatkan ke
+# atas untuk index & base merge). Cukup buat batas kasar, bukan pengukuran.
+PET_BYTES = {"dict": 450, "table": 200}
+# Overhead satu PetManager kosong (metrics, history, index, storage, ...)
+MANAGER_BYTES = 64 * 1024
+
+# Nama pemilik jadi nama file, jadi dibatasi ke karakter aman
+OWNER_PATTERN = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]{0,63}")
+
+
+class TenantError(ValueError):
+    """
+    Nama pemilik nggak valid.
+    """
+
+
+def check_owner(owner):
+    if not OWNER_PATTERN.fullmatch(owner or ""):
+        raise TenantError("Owner names use letters, digits, '_' or '-' (max 64 characters).")
+    return owner
+
+
+def tenant_path(folder, owner, backend=None):
+    """
+    File store milik `owner` di folder tenant (backend dari PET_STORAGE kalau kosong).
+    """
+    backend = (backend or os.environ.get("PET_STORAGE") or "json").lower()
+    ext = ".db" if backend == "sqlite" else ".json"
+    return os.path.join(folder, check_owner(owner) + ext)
+
+
+def estimate_bytes(manager):
+    """
+    Perkiraan memori roster satu manager dari jumlah pet yang ada di memori.
+    Backend lazy cuma dihitung pet yang sedang di-cache.
+    """
+    data = manager.data
+    if isinstance(data, PetTable):
+        return MANAGER_BYTES + data.capacity * PET_BYTES["table"]
+    if isinstance(data, LazyPetMap):
+        return MANAGER_BYTES + len(data.held()) * PET_BYTES["dict"]
+    return MANAGER_BYTES + len(data) * PET_BYTES["dict"]
+
+
+class _Slot:
+    # Satu pemilik di cache: manager-nya (None = belum / gagal di-load), jumlah
+    # pemakai yang sedang pegang, & perkiraan memorinya saat terakhir dilepas
+    def __init__(self):
+        self.lock = threading.Lock()  # dipegang selama load & flush
+        self.manager = None
+        self.pins = 0
+        self.bytes = 0
+
+
+class TenantCache:
+    """
+    Cache LRU PetManager per pemilik.
+
+    Pakai `with cache.use("budi") as manager: ...`; manager-nya di-load saat
+    pertama dipakai dan nggak di-evict selama masih di dalam blok with.
+    """
+
+    def __init__(self, folder=TENANT_DIR, max_tenants=TENANT_MAX, max_bytes=None,
+                 autosave=None, factory=None):
+        """
+        max_bytes: batas perkiraan memori (default PET_TENANT_MEMORY_MB).
+        autosave: interval AutoSaver tiap manager (None = tanpa thread autosave).
+        factory: factory(path) -> PetManager (default PetManager + HeadlessUI).
+        """
+        self.folder = folder
+        self.max_tenants = max(1, max_tenants)
+        self.max_bytes = int(TENANT_MEMORY_MB * 2**20) if max_bytes is None else max_bytes
+        self.autosave = autosave
+        self.factory = factory or _default_factory
+        self._slots = OrderedDict()  # pemilik -> _Slot, urutan LRU (terakhir = paling baru)
+        self._flushing = {}          # pemilik -> _Slot yang sedang di-evict
+        self._guard = threading.Lock()
+        self._bytes = 0  # jumlah slot.bytes semua pemilik di _slots
+        self.hits = self.misses = self.evictions = 0
+        os.makedirs(folder, exist_ok=True)
+
+    @contextmanager
+    def use(self, owner):
+        check_owner(owner)
+        slot = self._pin(owner)
+        try:
+            with slot.lock:
+                if slot.manager is None:
+                    self._load(owner, slot)
+            yield slot.manager
+        finally:
+            self._unpin(owner, slot)
+
+    def _pin(self, owner):
+        with self._guard:
+            slot = self._slots.get(owner)
+            if slot is None:
+                slot = self._slots[owner] = _Slot()
+                self.misses += 1
+            else:
+                self._slots.move_to_end(owner)
+                self.hits += 1
+            slot.pins += 1
+            return slot
+
+    def _load(self, owner, slot):
+        # Dipanggil dengan slot.lock dipegang. Tunggu flush pemilik yang sama selesai dulu
+        with self._guard:
+            flushing = self._flushing.get(owner)
+        if flushing is not None:
+            with flushing.lock:
+                pass
+            with self._guard:
+                if flushing.manager is not None and self._flushing.get(owner) is flushing:
+                    # Flush-nya gagal: pakai manager lama, perubahannya belum tersimpan
+                    del self._flushing[owner]
+                    slot.manager = flushing.manager
+                    self._start(slot.manager)
+                    return
+        slot.manager = self.factory(tenant_path(self.folder, owner))
+        self._start(slot.manager)
+
+    def _start(self, manager):
+        if self.autosave:
+            manager.start_autosave(self.autosave)
+
+    def _unpin(self, owner, slot):
+        manager = slot.manager
+        size = 0
+        if manager is not None:
+            with manager.lock:
+                size = estimate_bytes(manager)
+        with self._guard:
+            slot.pins -= 1
+            if self._slots.get(owner) is slot:
+                self._bytes += size - slot.bytes
+                if manager is None and not slot.pins:
+                    del self._slots[owner]  # load gagal, jangan disimpan di cache
+            slot.bytes = size
+            victims = self._pick_victims()
+        for victim_owner, victim in victims:
+            self._flush(victim_owner, victim)
+
+    def _pick_victims(self):
+        """
+        Keluarkan pemilik paling lama nggak dipakai sampai cache kembali di
+        bawah batas. Pemilik yang sedang dipakai dan yang paling baru nggak
+        pernah dipilih. Dipanggil dengan _guard dipegang.
+        """
+        victims = []
+        if len(self._slots) <= self.max_tenants and self._bytes <= self.max_bytes:
+            return victims
+        for owner in list(self._slots)[:-1]:
+            if len(self._slots) <= self.max_tenants and self._bytes <= self.max_bytes:
+                break
+            slot = self._slots[owner]
+            if slot.pins or slot.manager is None:
+                continue
+            self._remove(owner, slot)
+            victims.append((owner, slot))
+        return victims
+
+    def _remove(self, owner, slot):
+        # Pindahkan slot dari cache ke _flushing. Dipanggil dengan _guard dipegang
+        del self._slots[owner]
+        self._bytes -= slot.bytes
+        self._flushing[owner] = slot
+
+    def _flush(self, owner, slot):
+        # Simpan perubahan pending & tutup storage, di luar _guard (nulis ke disk)
+        with slot.lock:
+            try:
+                slot.manager.close()
+            except Exception:
+                # Gagal nulis: manager (dan perubahannya) balik ke cache, dicoba lagi nanti.
+                # Kalau pemilik ini sudah dibuka lagi, _load yang ambil alih manager-nya
+                with self._guard:
+                    if owner not in self._slots:
+                        del self._flushing[owner]
+                        self._slots[owner] = slot
+                        self._slots.move_to_end(owner, last=False)
+                        self._bytes += slot.bytes
+                        self._start(slot.manager)
+                raise
+            slot.manager = None
+        with self._guard:
+            if self._flushing.get(owner) is slot:
+                del self._flushing[owner]
+            self.evictions += 1
+
+    def evict(self, owner):
+        """
+        Flush & buang manager pemilik ini sekarang (kalau sedang nggak dipakai).
+        Return True kalau ada yang di-evict.
+        """
+        with self._guard:
+            slot = self._slots.get(owner)
+            if slot is None or slot.pins or slot.manager is None:
+                return False
+            self._remove(owner, slot)
+        self._flush(owner, slot)
+        return True
+
+    def loaded(self):
+        # Pemilik yang manager-nya ada di memori, paling lama nggak dipakai dulu
+        with self._guard:
+            return [owner for owner, slot in self._slots.items() if slot.manager is not None]
+
+    @property
+    def bytes(self):
+        # Perkiraan memori semua manager di cache (diperbarui tiap kali manager dilepas)
+        return self._bytes
+
+    def close(self):
+        """
+        Flush & tutup semua manager (dipanggil saat server berhenti).
+        """
+        with self._guard:
+            slots = list(self._slots.items())
+            self._slots.clear()
+            self._bytes = 0
+        for owner, slot in slots:
+            with slot.lock:
+                if slot.manager is not None:
+                    slot.manager.close()
+                    slot.manager = None
+
+
+def _default_factory(path):
+    return PetManager(storage=open_storage(path), ui=HeadlessUI())
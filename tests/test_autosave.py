@@ -0,0 +1,85 @@
+# ============================================================================
+# TEST AUTOSAVE - Penulisan background: interval, threshold & flush saat stop
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+import time
+
+from data_handler import JsonStorage
+from pet_manager import PetManager
+from ui import HeadlessUI
+
+
+def open_manager(path):
+    out = io.StringIO()
+    return PetManager(storage=JsonStorage(path), ui=HeadlessUI(out)), out
+
+
+def on_disk(path):
+    storage = JsonStorage(path)
+    try:
+        return sorted(storage.load())
+    finally:
+        storage.close()
+
+
+def wait_for(check, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if check():
+            return True
+        time.sleep(0.01)
+    return check()
+
+
+def test_threshold_wakes_writer(tmp_path):
+    path = str(tmp_path / "pets.json")
+    manager, _ = open_manager(path)
+    manager.start_autosave(interval=60, threshold=2)
+    manager.create_pet("rex")
+    time.sleep(0.1)
+    assert on_disk(path) == []  # baru 1 pet dirty, interval masih lama
+    manager.create_pet("fido")
+    assert wait_for(lambda: on_disk(path) == ["fido", "rex"])
+    manager.close()
+
+
+def test_interval_flushes(tmp_path):
+    path = str(tmp_path / "pets.json")
+    manager, _ = open_manager(path)
+    manager.start_autosave(interval=0.05, threshold=1000)
+    manager.create_pet("rex")
+    assert wait_for(lambda: on_disk(path) == ["rex"])
+    manager.close()
+
+
+def test_stop_does_final_save(tmp_path):
+    path = str(tmp_path / "pets.json")
+    manager, _ = open_manager(path)
+    manager.start_autosave(interval=60, threshold=1000)
+    manager.create_pet("rex")
+    assert on_disk(path) == []
+    manager.close()
+    assert on_disk(path) == ["rex"]
+    assert manager.saver is None
+
+
+def test_failed_save_is_retried(tmp_path):
+    path = str(tmp_path / "pets.json")
+    manager, out = open_manager(path)
+    real_save = manager.save_data
+    calls = []
+
+    def flaky_save(full=False):
+        calls.append(full)
+        if len(calls) == 1:
+            raise OSError("disk full")
+        real_save(full)
+
+    manager.save_data = flaky_save
+    manager.start_autosave(interval=0.05, threshold=1000)
+    manager.create_pet("rex")
+    assert wait_for(lambda: on_disk(path) == ["rex"])
+    assert "Autosave failed: disk full" in out.getvalue()
+    manager.close()
@@ -0,0 +1,127 @@
+# ============================================================================
+# TEST BACKUP - Backup incremental, verify, prune & restore saat store rusak
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+import os
+
+import backup
+from backup import BackupError, BackupStore, encode_records
+from data_handler import JsonStorage
+from pet_manager import PetManager
+from ui import HeadlessUI
+
+
+def make_pet(hunger=50):
+    return {"hunger": hunger, "energy": 50, "happy": 50, "health": 100, "level": 1, "exp": 0, "ts": 0}
+
+
+def roster(count, hunger=50):
+    return {f"pet{i}": make_pet(hunger) for i in range(count)}
+
+
+def corrupt(path):
+    # Balik satu byte di tengah file (isi tetap ada, checksum-nya yang salah)
+    with open(path, "r+b") as f:
+        f.seek(os.path.getsize(path) // 2)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+
+def test_incremental_backup_restores_latest(tmp_path):
+    store = BackupStore(str(tmp_path / "backups"))
+    data = roster(100)
+    store.write(encode_records(data.items()), full=True)
+    data["pet1"] = make_pet(10)
+    del data["pet2"]
+    manifest = store.write(encode_records([("pet1", data["pet1"]), ("pet2", None)]), full=False)
+
+    assert manifest["written"] == 2  # cuma bucket pet1 & pet2 yang ditulis ulang
+    assert store.verify() == (manifest, [])
+    assert store.restore_latest() == (manifest, data)
+
+
+def test_corrupt_chunk_falls_back_to_previous_backup(tmp_path):
+    store = BackupStore(str(tmp_path / "backups"))
+    first = roster(50)
+    store.write(encode_records(first.items()), full=True)
+    store.write(encode_records([("pet0", make_pet(1))]), full=False)
+
+    # Chunk yang cuma dipakai backup terbaru (bucket berisi pet0 yang baru)
+    old_chunks = set(store.manifest(1)["chunks"])
+    new_chunk = next(digest for digest in store.manifest(2)["chunks"] if digest not in old_chunks)
+    corrupt(store._chunk_path(new_chunk))
+
+    _, problems = store.verify()
+    assert problems and new_chunk[:12] in problems[0]
+    manifest, data = store.restore_latest()
+    assert manifest["seq"] == 1 and data == first
+
+
+def test_corrupt_manifest_falls_back_to_previous_backup(tmp_path):
+    store = BackupStore(str(tmp_path / "backups"))
+    first = roster(20)
+    store.write(encode_records(first.items()), full=True)
+    store.write(encode_records([("pet0", make_pet(1))]), full=False)
+    with open(store._manifest_path(2), "wb") as f:
+        f.write(b'{"seq": 2, "chunks": [')
+
+    manifest, data = store.restore_latest()
+    assert manifest["seq"] == 1 and data == first
+
+
+def test_incremental_backup_on_corrupt_base_fails(tmp_path):
+    store = BackupStore(str(tmp_path / "backups"))
+    store.write(encode_records(roster(20).items()), full=True)
+    for digest in set(store.manifest(1)["chunks"]):
+        corrupt(store._chunk_path(digest))
+    try:
+        store.write(encode_records([("pet0", make_pet(1))]), full=False)
+    except BackupError:
+        pass
+    else:
+        raise AssertionError("incremental backup on a corrupt base should fail")
+
+
+def test_prune_keeps_chunks_still_in_use(tmp_path, monkeypatch):
+    monkeypatch.setattr(backup, "BACKUP_KEEP", 2)
+    store = BackupStore(str(tmp_path / "backups"))
+    data = roster(300)
+    store.write(encode_records(data.items()), full=True)
+    for i in range(4):
+        data[f"pet{i}"] = make_pet(i)
+        store.write(encode_records([(f"pet{i}", data[f"pet{i}"])]), full=False)
+
+    assert store.sequences() == [4, 5]
+    # Backup #4 & #5 masih pakai chunk dari backup penuh #1 -> nggak boleh ikut dihapus
+    for seq in store.sequences():
+        assert store.verify(seq)[1] == []
+    assert store.restore_latest()[1] == data
+    used = set(store.manifest(4)["chunks"]) | set(store.manifest(5)["chunks"])
+    on_disk = {name for _, _, names in os.walk(store.chunk_dir) for name in names}
+    assert on_disk == used
+
+
+def test_corrupt_snapshot_is_restored_from_backup(tmp_path):
+    path = str(tmp_path / "pets.json")
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(io.StringIO()))
+    manager.autosave = False
+    for name in ("alpha", "beta"):
+        manager.create_pet(name)
+    manager.save_data(full=True)
+    manager.backup_data(full=True)
+    saved = {name: dict(attrs) for name, attrs in manager.data.items()}
+    manager.storage.close()
+
+    with open(path, "wb") as f:
+        f.write(b'{"alpha": {"hunger": ')
+    out = io.StringIO()
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(out))
+
+    assert {name: dict(attrs) for name, attrs in manager.data.items()} == saved
+    manifest, damaged = manager.storage.restored
+    assert manifest["seq"] == 1 and os.path.exists(damaged)
+    assert "was corrupt" in out.getvalue()
+    manager.storage.close()
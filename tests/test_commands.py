@@ -0,0 +1,70 @@
+# ============================================================================
+# TEST COMMANDS - Registry perintah main.py: alias & parse_args
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+
+import pytest
+
+from data_handler import JsonStorage
+from main import COMMANDS, handle_command, parse_args, resolve_command
+from pet_manager import PetManager
+from ui import HeadlessUI
+
+
+def open_manager(path):
+    out = io.StringIO()
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(out))
+    manager.autosave = False
+    return manager, out
+
+
+def test_aliases_share_one_entry():
+    assert COMMANDS["ls"] is COMMANDS["list"]
+    assert COMMANDS["?"] is COMMANDS["help"]
+    assert COMMANDS["quit"] is COMMANDS["exit"]
+    assert resolve_command("ls") == "list"
+    assert resolve_command("?") == "help"
+    assert resolve_command("feed") == "feed"
+    assert resolve_command("dance") == "dance"  # nggak dikenal: apa adanya
+
+
+@pytest.mark.parametrize("command, args, expected", [
+    ("status", ["ignored"], ()),
+    ("delete", ["rex", "--yes"], (["rex", "--yes"],)),
+    ("list", ["where", "level>1"], ("where level>1",)),
+    ("list", [], (None,)),
+    ("create", ["big", "rex"], ("big rex",)),
+    ("tick", [], (1,)),
+    ("tick", ["12"], (12,)),
+    ("tick", ["abc"], None),
+    ("undo", ["-1"], None),
+    ("redo", ["2.5"], None),
+])
+def test_parse_args(command, args, expected):
+    assert parse_args(COMMANDS[command], args, HeadlessUI(io.StringIO())) == expected
+
+
+def test_name_argument_asks_when_missing():
+    ui = HeadlessUI(io.StringIO())
+    ui.answers = iter(["  mochi  "])
+    assert parse_args(COMMANDS["select"], [], ui) == ("mochi",)
+
+
+def test_handle_command_uses_registry(tmp_path):
+    manager, out = open_manager(str(tmp_path / "pets.json"))
+    assert handle_command(manager, manager.ui, "create rex")
+    assert handle_command(manager, manager.ui, "ls")
+    assert " - rex " in out.getvalue()
+
+    assert handle_command(manager, manager.ui, "tick abc")
+    assert "Usage: tick [n]" in out.getvalue()
+    assert handle_command(manager, manager.ui, "dance")
+    assert "Unknown command!" in out.getvalue()
+    assert handle_command(manager, manager.ui, "quit") is False
+
+    # Alias dicatat di metrics pakai nama aslinya
+    rendered = manager.metrics.render()
+    assert 'command="list"' in rendered and 'command="ls"' not in rendered
+    assert 'command="unknown"' in rendered
@@ -0,0 +1,74 @@
+# ============================================================================
+# TEST DECAY - Decay offline ikut dipakai query list/stats (where / order by)
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+import time
+
+import pytest
+
+from data_handler import JsonStorage
+from pet_manager import DECAY_STEP, NEW_PET_STATS, PetManager
+from ui import HeadlessUI
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LAYOUTS = ["dict", pytest.param("table", marks=pytest.mark.skipif(numpy is None, reason="needs NumPy"))]
+
+pytestmark = pytest.mark.skipif(DECAY_STEP <= 0, reason="decay dimatikan lewat PET_DECAY_STEP")
+
+
+def open_manager(path, layout="dict"):
+    out = io.StringIO()
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(out), layout=layout)
+    manager.autosave = False
+    return manager, out
+
+
+def names(rows):
+    return [name for name, _ in rows]
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_query_filters_and_orders_on_decayed_stats(tmp_path, layout):
+    path = str(tmp_path / "pets.json")
+    manager, out = open_manager(path, layout)
+    now = int(time.time())
+    # a ditinggal 20 step: hunger 100 -> 40, energy & happy 50 -> 10
+    manager.data["a"] = {**NEW_PET_STATS, "hunger": 100, "ts": now - 20 * DECAY_STEP}
+    manager.data["b"] = {**NEW_PET_STATS, "hunger": 70, "ts": now}
+    manager.data["c"] = {**NEW_PET_STATS, "hunger": 80, "ts": 0}  # data lama, jam decay belum jalan
+    manager.save_data(full=True)
+    # Index sekunder (termasuk hunger) dibangun dulu dari nilai tersimpan, harus ikut di-update
+    assert names(manager.find_pets("where level>=1 order by level")) == ["a", "b", "c"]
+    assert manager.data["a"]["hunger"] == 100
+
+    assert names(manager.find_pets("where hunger>=60")) == ["b", "c"]
+    assert names(manager.find_pets("where hunger<50")) == ["a"]
+    assert names(manager.find_pets("order by hunger limit 2")) == ["a", "b"]
+    assert names(manager.find_pets("where energy<=10")) == ["a"]
+
+    manager.list_pets("where hunger<50")
+    assert " - a (Lv 1)" in out.getvalue()
+    assert "No pets matched." not in out.getvalue()
+
+    # Decay-nya ditulis ke data (ts maju per step penuh) dan ikut tersimpan di save berikutnya
+    assert manager._changes == {"a"} or manager._full_pending
+    manager.save_data()
+    reloaded, _ = open_manager(path)
+    assert dict(reloaded.data["a"]) == {**NEW_PET_STATS, "hunger": 40, "energy": 10, "happy": 10, "ts": now}
+    assert dict(reloaded.data["c"])["hunger"] == 80
+
+
+def test_query_without_decay_fields_does_not_write(tmp_path):
+    manager, _ = open_manager(str(tmp_path / "pets.json"))
+    old = int(time.time()) - 5 * DECAY_STEP
+    manager.data["a"] = {**NEW_PET_STATS, "ts": old}
+
+    assert names(manager.find_pets("where level=1 order by health")) == ["a"]
+    assert manager.data["a"]["ts"] == old
+    assert not manager._changes
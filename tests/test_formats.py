@@ -0,0 +1,41 @@
+# ============================================================================
+# TEST FORMATS - Round trip snapshot di semua format (nama aneh, format struct lama)
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import struct
+
+import pytest
+
+import formats
+
+DATA = {
+    "a\0b": {"hunger": 10, "energy": 20, "ts": 1700000000},
+    "a": {"hunger": 30, "energy": 40, "ts": 1700000001},
+    "kucing 🐱": {"hunger": 50, "energy": 60, "ts": 1700000002},
+    'quote "\\': {"hunger": 70, "energy": 80, "ts": 1700000003},
+}
+
+
+@pytest.mark.parametrize("fmt", formats.available_formats())
+def test_round_trip_keeps_every_name(fmt):
+    data, detected = formats.decode(formats.encode(DATA, fmt))
+    assert detected == ("json" if fmt == "json-pretty" else fmt)
+    assert {name: dict(pet) for name, pet in data.items()} == DATA
+
+
+@pytest.mark.parametrize("fmt", formats.available_formats())
+def test_round_trip_empty(fmt):
+    data, _ = formats.decode(formats.encode({}, fmt))
+    assert dict(data) == {}
+
+
+def test_struct_v1_snapshot_still_loads():
+    # Snapshot lama (PETS\x01): nama dipisah "\0"
+    names = "a\0b".encode("utf-8")
+    fields = b"hunger:i"
+    payload = (struct.pack("<5sIII", b"PETS\x01", 2, len(fields), len(names))
+               + fields + names + struct.pack("<2i", 5, 6))
+    data, detected = formats.decode(payload)
+    assert detected == "struct"
+    assert {name: dict(pet) for name, pet in data.items()} == {"a": {"hunger": 5}, "b": {"hunger": 6}}
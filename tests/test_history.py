@@ -0,0 +1,143 @@
+# ============================================================================
+# TEST HISTORY - Undo / redo / goto bolak-balik harus kembali ke isi yang sama
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+import random
+
+import pytest
+
+from data_handler import JsonStorage
+from pet_manager import PetError, PetManager
+from ui import HeadlessUI
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+LAYOUTS = ["dict", pytest.param("table", marks=pytest.mark.skipif(numpy is None, reason="needs NumPy"))]
+
+
+def open_manager(tmp_path, layout="dict", **history):
+    manager = PetManager(storage=JsonStorage(str(tmp_path / "pets.json")),
+                         ui=HeadlessUI(io.StringIO()), layout=layout, seed=7)
+    manager.autosave = False
+    for key, value in history.items():
+        setattr(manager.history, key, value)
+    return manager
+
+
+def snapshot(manager):
+    return {name: dict(attrs) for name, attrs in manager.data.items()}
+
+
+def play(manager, steps=40, seed=3):
+    """
+    Jalankan campuran operasi acak; return isi roster sebelum & sesudah tiap operasi.
+    """
+    rng = random.Random(seed)
+    states = [snapshot(manager)]
+    for i in range(steps):
+        names = list(manager.data)
+        roll = rng.random()
+        if roll < 0.25 or not names:
+            manager.create_pet(f"pet{i}")
+        elif roll < 0.35:
+            manager.remove_pet(rng.choice(names))
+        elif roll < 0.45:
+            manager.rename(rng.choice(names), f"renamed{i}")
+        elif roll < 0.7:
+            manager.apply_action(rng.choice(("feed", "play", "sleep", "heal")), rng.choice(names))
+        elif roll < 0.85:
+            manager.tick(2)
+        else:
+            manager.bulk("play", "level>=1")
+        states.append(snapshot(manager))
+    return states
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+@pytest.mark.parametrize("checkpoints", [0, 3])
+def test_undo_redo_round_trip(tmp_path, layout, checkpoints):
+    manager = open_manager(tmp_path, layout, checkpoints=checkpoints, checkpoint_every=2)
+    states = play(manager)
+    assert len(manager.history.done) == len(states) - 1
+
+    for state in reversed(states[:-1]):
+        manager.undo_op()
+        assert snapshot(manager) == state
+    with pytest.raises(PetError):
+        manager.undo_op()
+    for state in states[1:]:
+        manager.redo_op()
+        assert snapshot(manager) == state
+    with pytest.raises(PetError):
+        manager.redo_op()
+
+
+@pytest.mark.parametrize("layout", LAYOUTS)
+def test_goto_uses_checkpoints_and_matches_every_state(tmp_path, layout):
+    manager = open_manager(tmp_path, layout, checkpoints=3, checkpoint_every=2)
+    states = play(manager, steps=60)
+    seqs = [op.seq for op in manager.history.done]
+    assert manager.history._saved
+
+    restored = []
+    restore = manager._restore_checkpoint
+    manager._restore_checkpoint = lambda checkpoint: (restored.append(checkpoint), restore(checkpoint))
+    rng = random.Random(1)
+    for _ in range(40):
+        index = rng.randrange(len(states))
+        manager.goto(seqs[index - 1] if index else 0)
+        assert snapshot(manager) == states[index]
+    assert restored  # lompatan jauh mulai dari checkpoint
+
+    # Lompat balik lalu tersimpan: isi di disk sama dengan posisi history sekarang
+    manager.goto(seqs[len(seqs) // 2])
+    manager.save_data(full=True)
+    assert snapshot(open_manager(tmp_path, layout)) == states[len(seqs) // 2 + 1]
+
+
+def test_bulk_ops_keep_earlier_history_without_checkpoints(tmp_path):
+    manager = open_manager(tmp_path, checkpoints=0)
+    manager.create_pet("rex")
+    manager.apply_action("feed", "rex")
+    manager.tick(3)
+    manager.bulk("heal", None)
+    assert [op.kind for op in manager.history.done] == ["create", "feed", "world", "world"]
+    manager.undo(4)
+    assert not manager.data
+
+
+def test_new_change_after_undo_drops_redo(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.create_pet("rex")
+    manager.create_pet("fido")
+    manager.undo()
+    manager.create_pet("milo")
+    with pytest.raises(PetError):
+        manager.redo_op()
+    assert sorted(manager.data) == ["milo", "rex"]
+
+
+def test_history_limits_drop_oldest_ops(tmp_path):
+    manager = open_manager(tmp_path, limit=3, max_changes=6)
+    for i in range(5):
+        manager.create_pet(f"pet{i}")
+    assert [op.label for op in manager.history.done] == ["create pet2", "create pet3", "create pet4"]
+    manager.tick(1)  # 5 pet -> 5 perubahan, total lewat max_changes (3 op terakhir = 7)
+    assert [op.label for op in manager.history.done] == ["create pet4", "tick 1"]
+    manager.undo(5)
+    assert sorted(manager.data) == ["pet0", "pet1", "pet2", "pet3"]
+
+
+def test_history_filters_by_pet_through_renames(tmp_path):
+    manager = open_manager(tmp_path)
+    manager.create_pet("rex")
+    manager.create_pet("fido")
+    manager.rename("rex", "max")
+    manager.apply_action("feed", "max")
+    labels = [op.label for op, _ in manager.history.entries("max")]
+    assert labels == ["feed max", "rename rex -> max", "create rex"]
@@ -0,0 +1,85 @@
+# ============================================================================
+# TEST JOURNAL - Replay journal yang ekornya terpotong & compaction lalu reload
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import os
+
+import data_handler
+from data_handler import JsonStorage
+
+
+def pet(hunger):
+    return {"hunger": hunger, "energy": 50, "happy": 50, "health": 100, "level": 1, "exp": 0, "ts": 0}
+
+
+def open_store(tmp_path):
+    storage = JsonStorage(str(tmp_path / "pets.json"))
+    return storage, storage.load()
+
+
+def plain(data):
+    return {name: dict(attrs) for name, attrs in data.items()}
+
+
+def test_replay_ignores_and_trims_truncated_last_line(tmp_path):
+    storage, data = open_store(tmp_path)
+    for name, hunger in (("a", 10), ("b", 20)):
+        data[name] = pet(hunger)
+        storage.save(data, {name: data[name]})
+    good_size = os.path.getsize(storage.journal_path)
+    # Crash di tengah nulis record ketiga: baris terakhir tanpa "\n"
+    with open(storage.journal_path, "ab") as f:
+        f.write(b'{"op": "put", "name": "c", "v": 1, "pet": {"hung')
+
+    storage, data = open_store(tmp_path)
+    assert plain(data) == {"a": pet(10), "b": pet(20)}
+    assert os.path.getsize(storage.journal_path) == good_size
+
+    # Append berikutnya mulai dari baris yang utuh, jadi tetap terbaca
+    data["c"] = pet(30)
+    storage.save(data, {"c": data["c"]})
+    _, data = open_store(tmp_path)
+    assert plain(data) == {"a": pet(10), "b": pet(20), "c": pet(30)}
+
+
+def test_replay_stops_at_corrupt_record(tmp_path):
+    storage, data = open_store(tmp_path)
+    data["a"] = pet(10)
+    storage.save(data, {"a": data["a"]})
+    with open(storage.journal_path, "ab") as f:
+        f.write(b"not json\n")
+        f.write(b'{"op": "put", "name": "b", "v": 1, "pet": {"hunger": 1}}\n')
+
+    _, data = open_store(tmp_path)
+    assert plain(data) == {"a": pet(10)}
+
+
+def test_compaction_then_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_handler, "COMPACT_EVERY", 5)
+    storage, data = open_store(tmp_path)
+    for i in range(12):
+        name = f"p{i % 4}"
+        data[name] = pet(i)
+        storage.save(data, {name: data[name]})
+    del data["p0"]
+    storage.save(data, {"p0": None})
+    storage.close()  # tunggu compaction background selesai
+
+    expected = {"p1": pet(9), "p2": pet(10), "p3": pet(11)}
+    storage, reloaded = open_store(tmp_path)
+    assert plain(reloaded) == expected
+    assert not os.path.exists(storage.old_journal_path)
+
+    # Compaction eksplisit: journal kosong, semuanya ada di snapshot
+    storage.compact(reloaded)
+    assert not os.path.exists(storage.journal_path)
+    storage.close()
+    storage, reloaded = open_store(tmp_path)
+    assert plain(reloaded) == expected
+
+    # Versi tetap naik setelah compaction: save berikutnya nggak dianggap konflik
+    reloaded["p1"] = pet(99)
+    storage.save(reloaded, {"p1": reloaded["p1"]})
+    _, again = open_store(tmp_path)
+    assert dict(again["p1"]) == pet(99)
@@ -0,0 +1,110 @@
+# ============================================================================
+# TEST MERGE - Beberapa PetManager / proses di store yang sama (merge_pet & lock)
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+import threading
+
+from data_handler import JsonStorage
+from pet_manager import PetManager, merge_pet
+from ui import HeadlessUI
+
+BASE = {"hunger": 50, "energy": 50, "happy": 50, "health": 100, "level": 1, "exp": 90, "ts": 10}
+
+
+def open_manager(path):
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(io.StringIO()))
+    manager.autosave = False
+    return manager
+
+
+def bump(manager, name, **deltas):
+    # Ubah stat pet langsung (tanpa random event), dicatat seperti perubahan biasa
+    with manager.lock:
+        manager._remember(name)
+        pet = dict(manager.data[name])
+        for field, delta in deltas.items():
+            pet[field] += delta
+        manager.data[name] = pet
+        manager._mark(name)
+
+
+def total_exp(pet):
+    return (pet["level"] - 1) * 100 + pet["exp"]
+
+
+def test_merge_pet_adds_both_sides():
+    ours = {**BASE, "hunger": 60, "exp": 95}
+    theirs = {**BASE, "hunger": 45, "exp": 99, "ts": 20}
+    merged = merge_pet(BASE, ours, theirs)
+    assert merged["hunger"] == 55
+    # 90 + 5 + 9 EXP -> level up sekali, nggak ada yang hilang
+    assert (merged["level"], merged["exp"]) == (2, 4)
+    assert merged["ts"] == 20
+
+
+def test_merge_pet_clamps_stats_and_delete_wins():
+    ours = {**BASE, "hunger": 95}
+    theirs = {**BASE, "hunger": 90}
+    assert merge_pet(BASE, ours, theirs)["hunger"] == 100
+    assert merge_pet(BASE, ours, None) is None
+    assert merge_pet(BASE, None, theirs) is None
+    assert merge_pet(BASE, BASE, theirs) == theirs
+    assert merge_pet(None, ours, theirs) == theirs  # dua-duanya bikin pet baru: yang duluan tersimpan menang
+
+
+def test_two_managers_merge_on_save(tmp_path):
+    path = str(tmp_path / "pets.json")
+    first = open_manager(path)
+    first.create_pet("rex")
+    first.save_data(full=True)
+    second = open_manager(path)
+
+    bump(first, "rex", hunger=10, exp=5)
+    bump(second, "rex", hunger=-20, exp=7)
+    first.save_data()
+    second.save_data()  # conflict -> digabung dengan versi first
+
+    start = dict(open_manager(path).data["rex"])
+    assert start == dict(second.data["rex"])
+    assert start["hunger"] == 50 + 10 - 20
+    assert total_exp(start) == 5 + 7
+    # first ikut dapat perubahan second saat save berikutnya
+    bump(first, "rex", exp=1)
+    first.save_data()
+    assert total_exp(first.data["rex"]) == 5 + 7 + 1
+    assert dict(first.data["rex"]) == dict(open_manager(path).data["rex"])
+    for manager in (first, second):
+        manager.storage.close()
+
+
+def test_concurrent_saves_do_not_lose_updates(tmp_path):
+    path = str(tmp_path / "pets.json")
+    setup = open_manager(path)
+    setup.create_pet("rex")
+    setup.save_data(full=True)
+    setup.storage.close()
+
+    workers, rounds = 4, 25
+    managers = [open_manager(path) for _ in range(workers)]
+    errors = []
+
+    def work(manager):
+        try:
+            for _ in range(rounds):
+                bump(manager, "rex", exp=1)
+                manager.save_data()
+        except Exception as e:  # pragma: no cover - dilaporkan lewat assert di bawah
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(manager,)) for manager in managers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert total_exp(dict(open_manager(path).data["rex"])) == workers * rounds
+    for manager in managers:
+        manager.storage.close()
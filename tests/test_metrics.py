@@ -0,0 +1,75 @@
+# ============================================================================
+# TEST METRICS - Format teks Prometheus, histogram & exporter file / HTTP
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from metrics import LATENCY_BUCKETS, Metrics, MetricsExporter, exporter_from_env
+
+
+def test_render_counters_gauges_and_histograms():
+    metrics = Metrics()
+    metrics.inc("pet_events_total", event="bonus", action="feed")
+    metrics.inc("pet_events_total", 2, action="feed", event="bonus")  # urutan label bebas
+    metrics.set("pet_roster_size", 3)
+    for value in (0.0001, 0.003, 0.003, 99):
+        metrics.observe("pet_command_duration_seconds", value, command="feed")
+    metrics.collectors.append(lambda: [("pet_storage_written_bytes_total", {"file": "journal"}, 512)])
+    metrics.inc("not_in_help", 1)  # metrik tanpa HELP nggak ditampilkan
+
+    lines = metrics.render().splitlines()
+    assert "# TYPE pet_events_total counter" in lines
+    assert 'pet_events_total{action="feed",event="bonus"} 3' in lines
+    assert "pet_roster_size 3" in lines
+    assert 'pet_storage_written_bytes_total{file="journal"} 512' in lines
+    assert not any("not_in_help" in line for line in lines)
+
+    # Bucket kumulatif: 1 nilai <= 0.0005, 3 nilai <= 0.005, +Inf = semua
+    assert 'pet_command_duration_seconds_bucket{command="feed",le="0.0005"} 1' in lines
+    assert 'pet_command_duration_seconds_bucket{command="feed",le="0.005"} 3' in lines
+    assert f'pet_command_duration_seconds_bucket{{command="feed",le="{LATENCY_BUCKETS[-1]:g}"}} 3' in lines
+    assert 'pet_command_duration_seconds_bucket{command="feed",le="+Inf"} 4' in lines
+    assert 'pet_command_duration_seconds_count{command="feed"} 4' in lines
+
+
+def test_label_values_are_escaped():
+    metrics = Metrics()
+    metrics.inc("pet_events_total", event='say "hi"\\now')
+    assert 'pet_events_total{event="say \\"hi\\"\\\\now"} 1' in metrics.render()
+
+
+def test_timer_observes_duration():
+    metrics = Metrics()
+    with metrics.timer("pet_save_duration_seconds", kind="journal"):
+        pass
+    assert 'pet_save_duration_seconds_count{kind="journal"} 1' in metrics.render()
+
+
+def test_file_and_http_exporters(tmp_path):
+    metrics = Metrics()
+    metrics.set("pet_roster_size", 1)
+    path = tmp_path / "pets.prom"
+    exporter = MetricsExporter(metrics, str(path), port=0, interval=60).start()
+    try:
+        host, port = exporter.address[:2]
+        with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "pet_roster_size 1" in response.read().decode("utf-8")
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://{host}:{port}/other", timeout=5)
+        metrics.set("pet_roster_size", 2)
+    finally:
+        exporter.stop()
+    # stop() menulis angka terakhir ke file
+    assert "pet_roster_size 2" in path.read_text(encoding="utf-8")
+    assert not (tmp_path / "pets.prom.tmp").exists()
+
+
+def test_exporter_from_env_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("PET_METRICS_FILE", raising=False)
+    monkeypatch.delenv("PET_METRICS_PORT", raising=False)
+    assert exporter_from_env(Metrics()) is None
@@ -0,0 +1,95 @@
+# ============================================================================
+# TEST NAME INDEX - Prefix "mi*", tab completion & "did you mean"
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+import random
+
+import pytest
+
+from data_handler import JsonStorage
+from name_index import NameIndex
+from pet_manager import PetError, PetManager
+from ui import HeadlessUI
+
+NAMES = ["mochi", "momo", "mimi", "milo", "kopi", "kiki", "a", "ab", "abc", "😺cat"]
+
+
+def build(names):
+    index = NameIndex()
+    index.ensure(dict.fromkeys(names))
+    return index
+
+
+def levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        prev, row[0] = row[0], i
+        for j, cb in enumerate(b, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (ca != cb))
+    return row[-1]
+
+
+def test_prefix_edges():
+    index = build(NAMES)
+    assert index.prefix("") == sorted(NAMES)
+    assert index.prefix("", limit=3) == sorted(NAMES)[:3]
+    assert index.count_prefix("") == len(NAMES)
+    assert index.prefix("mo") == ["mochi", "momo"]
+    assert index.prefix("a") == ["a", "ab", "abc"]  # nama = prefix ikut
+    assert index.prefix("zzz") == [] and index.count_prefix("zzz") == 0
+    assert index.prefix("😺") == ["😺cat"]
+    assert build([]).prefix("") == [] and build([]).suggest("mochi") == []
+
+
+def test_suggest_matches_brute_force():
+    rng = random.Random(5)
+    names = sorted({"".join(rng.choice("abcd") for _ in range(rng.randint(1, 6))) for _ in range(300)})
+    index = build(names)
+    for word in ["abc", "dddd", "a", "bacdab", "zz"] + rng.sample(names, 20):
+        limit_distance = 1 if len(word) <= 4 else 2
+        expected = []
+        for distance in range(1, limit_distance + 1):
+            expected = [n for n in names if n != word and levenshtein(n, word) <= distance]
+            if expected:
+                break
+        assert index.suggest(word, limit=len(names)) == expected, word
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = PetManager(storage=JsonStorage(str(tmp_path / "pets.json")), ui=HeadlessUI(io.StringIO()))
+    manager.autosave = False
+    for name in ("mochi", "momo", "kopi"):
+        manager.create_pet(name)
+    manager.complete_names("")  # index sudah dibangun sebelum roster berubah
+    return manager
+
+
+def test_names_follow_rename_and_delete(manager):
+    with pytest.raises(PetError, match="Did you mean: momo\\?"):
+        manager.find_pet("momoo")
+    manager.rename("momo", "kiko")
+    manager.delete("kopi", True)
+    assert manager.complete_names("") == ["kiko", "mochi"]
+    assert manager.complete_names("mo") == ["mochi"]
+    assert manager.find_pet("mo*") == "mochi"  # sekarang cuma satu yang cocok
+    assert manager.find_pet("k*") == "kiko"
+    with pytest.raises(PetError, match="No pet name starts with 'kop'"):
+        manager.find_pet("kop*")
+    # Nama yang sudah hilang nggak disarankan lagi
+    for typo in ("momoo", "kopy"):
+        with pytest.raises(PetError, match="^Pet not found.$"):
+            manager.find_pet(typo)
+    with pytest.raises(PetError, match="Did you mean: kiko\\?"):
+        manager.find_pet("kiki")
+
+
+def test_prefix_matching_many(manager):
+    with pytest.raises(PetError, match="2 pets match 'mo\\*': mochi, momo"):
+        manager.find_pet("mo*")
+    with pytest.raises(PetError, match="Name required"):
+        manager.find_pet("   ")
+    with pytest.raises(PetError, match="3 pets match"):
+        manager.find_pet("*")  # prefix kosong = semua pet
@@ -0,0 +1,92 @@
+# ============================================================================
+# TEST PET INDEX - Index sekunder tetap konsisten setelah add/remove/update
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import random
+
+import pytest
+
+from pet_index import PetIndexes, StatIndex
+from query import parse_query, execute, matches
+
+OPS = ["<", "<=", ">", ">=", "=", "=="]
+
+
+def brute_bounds(keys, op, value):
+    hits = [i for i, (v, _) in enumerate(keys) if matches({"x": v}, [("x", op, value)])]
+    return (hits[0], hits[-1] + 1) if hits else None
+
+
+def check(index, expected):
+    keys = sorted(expected)
+    assert len(index) == len(keys)
+    assert list(index) == keys
+    assert list(index.names()) == [name for _, name in keys]
+    assert list(index.names(descending=True)) == [name for _, name in reversed(keys)]
+    for value in range(-1, 12):
+        for op in OPS:
+            lo, hi = index.bounds(op, value)
+            brute = brute_bounds(keys, op, value)
+            if brute is None:
+                assert lo == hi
+            else:
+                assert (lo, hi) == brute
+            assert list(index.names(lo, hi, True)) == [name for _, name in keys[lo:hi]][::-1]
+    assert index.bounds("!=", 3) is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_blocks_stay_sorted_through_random_updates(seed):
+    rng = random.Random(seed)
+    index = StatIndex("level", chunk_size=4)  # blok kecil biar sering pecah / habis
+    expected = set()
+    for step in range(400):
+        if expected and rng.random() < 0.45:
+            key = rng.choice(sorted(expected))
+            index.remove(key[1], key[0])
+            expected.discard(key)
+        else:
+            key = (rng.randint(0, 10), f"p{rng.randint(0, 80)}")
+            if key not in expected:
+                index.add(key[1], key[0])
+                expected.add(key)
+        if step % 40 == 0:
+            check(index, expected)
+    check(index, expected)
+    for value, name in sorted(expected):
+        index.remove(name, value)
+    check(index, set())
+
+
+def test_remove_missing_key_is_ignored():
+    index = StatIndex("level", [(1, "a"), (2, "b")], chunk_size=1)
+    index.remove("a", 2)
+    index.remove("zzz", 9)
+    check(index, {(1, "a"), (2, "b")})
+
+
+def test_indexes_follow_data_after_touch():
+    data = {f"p{i}": {"level": i % 5, "health": 100 - i, "hunger": i} for i in range(50)}
+    indexes = PetIndexes()
+    query = parse_query("where level>=3 order by health desc limit 7")
+    assert execute(data, query, indexes) == execute(data, query)
+
+    data["p1"] = {**data["p1"], "level": 4, "health": 200}   # update
+    indexes.touch(data, "p1")
+    del data["p3"]                                          # delete
+    indexes.touch(data, "p3")
+    data["new"] = {"level": 3, "health": 150, "hunger": 0}  # create
+    indexes.touch(data, "new")
+
+    for text in ["where level>=3 order by health desc limit 7", "where hunger<10",
+                 "order by level limit 5", "where level=4 and health>90", "where health!=200"]:
+        query = parse_query(text)
+        got, want = execute(data, query, indexes), execute(data, query)
+        if query.order_by is None:  # tanpa order by urutannya bebas
+            got, want = sorted(got), sorted(want)
+        assert got == want, text
+    fresh = PetIndexes()
+    fresh.ensure(data)
+    for field in indexes.fields:
+        assert list(indexes.get(field)) == list(fresh.get(field))
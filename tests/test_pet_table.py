@@ -0,0 +1,58 @@
+# ============================================================================
+# TEST PET TABLE - Roster columnar: PetView, hapus & pakai ulang baris, copy
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import pytest
+
+from data_handler import PET_FIELDS
+from pet_table import PetTable, PetView
+
+PET = {"hunger": 10, "energy": 20, "happy": 30, "health": 40, "level": 5, "exp": 60, "ts": 2**40}
+
+
+def test_view_reads_and_writes_columns():
+    table = PetTable.from_mapping({"rex": PET})
+    view = table["rex"]
+    assert isinstance(view, PetView)
+    assert dict(view) == PET and list(view) == list(PET_FIELDS) and len(view) == len(PET_FIELDS)
+    view["hunger"] += 5
+    assert table.columns["hunger"][table.row_of("rex")] == 15
+    with pytest.raises(KeyError):
+        view["mood"] = 1
+    with pytest.raises(TypeError):
+        del view["hunger"]
+
+
+def test_missing_fields_get_defaults():
+    table = PetTable()
+    table["old"] = {"hunger": 1, "energy": 2, "happy": 3, "health": 4}
+    assert dict(table["old"]) == {"hunger": 1, "energy": 2, "happy": 3, "health": 4, "level": 1, "exp": 0, "ts": 0}
+
+
+def test_deleted_rows_are_reused():
+    table = PetTable.from_mapping({name: PET for name in ("a", "b", "c")})
+    row = table.row_of("b")
+    assert table.pop("b") == PET
+    assert table.pop("b", None) is None
+    with pytest.raises(KeyError):
+        table.pop("b")
+    assert "b" not in table and len(table) == 2
+    assert table.alive[row] == 0 and table.name_at(row) is None
+    assert table.live_rows() == [0, 2]
+
+    table["d"] = {**PET, "level": 9}
+    assert table.row_of("d") == row and table.capacity == 3  # nggak nambah baris
+    assert table.names_at([0, 1, 2]) == ["a", "d", "c"]
+    assert table["d"]["level"] == 9 and table["a"]["level"] == 5
+
+
+def test_copy_is_independent():
+    table = PetTable.from_mapping({"a": PET, "b": PET})
+    del table["a"]
+    clone = table.copy()
+    clone["b"]["hunger"] = 99
+    clone["new"] = PET
+    assert table["b"]["hunger"] == 10 and "new" not in table
+    assert clone.row_of("new") == 0 and table.capacity == 2
+    assert {name: dict(view) for name, view in clone.items()} == {"b": {**PET, "hunger": 99}, "new": PET}
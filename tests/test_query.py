@@ -0,0 +1,49 @@
+# ============================================================================
+# TEST QUERY - Parser where / order by / limit untuk list & stats
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import pytest
+
+from query import Query, QueryError, parse_query, parse_where
+
+
+def test_empty_query_means_everything():
+    assert parse_query("") == Query([], None, False, None)
+    assert parse_query(None) == Query([], None, False, None)
+
+
+def test_full_query():
+    query = parse_query("where Health<30 AND level>=2 order by LEVEL desc limit 20")
+    assert query == Query([("health", "<", 30), ("level", ">=", 2)], "level", True, 20)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("order by name", Query([], "name", False, None)),
+    ("order by hunger asc", Query([], "hunger", False, None)),
+    ("limit 3", Query([], None, False, 3)),
+    ("where exp != -5", Query([("exp", "!=", -5)], None, False, None)),
+    ("where level==1 limit 0", Query([("level", "==", 1)], None, False, 0)),
+])
+def test_optional_parts(text, expected):
+    assert parse_query(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "where level>>3",
+    "where mood>1",
+    "where level>abc",
+    "order by mood",
+    "limit -1",
+    "limit 5 where level>1",
+    "where",
+])
+def test_invalid_queries_raise(text):
+    with pytest.raises(QueryError):
+        parse_query(text)
+
+
+def test_parse_where_splits_on_and():
+    assert parse_where("level>=3 and health<50") == [("level", ">=", 3), ("health", "<", 50)]
+    with pytest.raises(QueryError, match="Invalid condition"):
+        parse_where("level>=3 or health<50")
@@ -0,0 +1,48 @@
+# ============================================================================
+# TEST SCRIPT - Mode batch (run_script): sekali load, save di akhir
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+
+import pytest
+
+from data_handler import JsonStorage
+from main import run_script
+from pet_manager import PetManager
+from ui import HeadlessUI
+
+
+def open_manager(path, out=None):
+    return PetManager(storage=JsonStorage(path), ui=HeadlessUI(out or io.StringIO()))
+
+
+def test_script_saves_once_at_the_end(tmp_path):
+    path = str(tmp_path / "pets.json")
+    manager = open_manager(path)
+    ui = manager.ui
+    lines = ["# komentar", "", "create rex", "create fido", "rename", "fido", "max", "feed --all"]
+
+    count, elapsed = run_script(manager, ui, lines)
+
+    assert count == 4  # komentar & baris kosong dilewati, jawaban prompt bukan perintah
+    assert sorted(open_manager(path).data) == ["max", "rex"]
+    assert manager.autosave and ui.answers is None
+
+
+def test_failing_script_still_saves_and_restores_state(tmp_path):
+    path = str(tmp_path / "pets.json")
+    manager = open_manager(path)
+    ui = manager.ui
+
+    def boom(ticks=1):
+        raise RuntimeError("tick failed")
+
+    manager.tick = boom
+    with pytest.raises(RuntimeError):
+        run_script(manager, ui, ["create rex", "tick", "create fido"])
+
+    # Perubahan sebelum error tetap tersimpan, autosave & jawaban prompt dibalikin
+    assert manager.autosave is True
+    assert ui.answers is None
+    assert list(open_manager(path).data) == ["rex"]
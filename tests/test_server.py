@@ -0,0 +1,94 @@
+# ============================================================================
+# TEST SERVER - Dua client bareng di pet yang sama & perintah yang diblokir
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import asyncio
+import io
+
+import pytest
+
+from data_handler import JsonStorage
+from pet_manager import ACTION_EFFECTS, LEVEL_UP_EXP, PetManager
+from server import BLOCKED_COMMANDS, END_OF_REPLY, PetServer
+from ui import HeadlessUI
+
+FEEDS = 25
+
+
+async def send(reader, writer, command):
+    """
+    Kirim satu perintah, return balasannya (tanpa baris END_OF_REPLY).
+    """
+    writer.write(f"{command}\n".encode("utf-8"))
+    await writer.drain()
+    lines = []
+    while True:
+        line = (await reader.readline()).decode("utf-8")
+        assert line, "server closed the connection"
+        if line.rstrip("\n") == END_OF_REPLY:
+            return "".join(lines)
+        lines.append(line)
+
+
+def run_with_server(path, scenario):
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(io.StringIO()), seed=3)
+
+    async def main():
+        server = PetServer(manager, workers=4)
+        await server.start("127.0.0.1", 0)
+        try:
+            return await scenario(*server.address[:2])
+        finally:
+            await server.close()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        manager.close()
+
+
+def test_two_clients_feeding_same_pet_lose_no_updates(tmp_path):
+    path = str(tmp_path / "pets.json")
+
+    async def client(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        assert "You selected mochi" in await send(reader, writer, "select mochi")
+        for _ in range(FEEDS):
+            await send(reader, writer, "feed")
+        await send(reader, writer, "exit")
+        writer.close()
+
+    async def scenario(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        await send(reader, writer, "create mochi")
+        await asyncio.gather(client(host, port), client(host, port))
+        listing = await send(reader, writer, "list")
+        writer.close()
+        return listing
+
+    listing = run_with_server(path, scenario)
+    assert "mochi" in listing
+
+    pet = dict(PetManager(storage=JsonStorage(path), ui=HeadlessUI(io.StringIO())).data["mochi"])
+    gained = (pet["level"] - 1) * LEVEL_UP_EXP + pet["exp"]
+    assert gained == 2 * FEEDS * ACTION_EFFECTS["feed"][1]
+
+
+@pytest.mark.parametrize("command", BLOCKED_COMMANDS)
+def test_blocked_commands_are_refused(tmp_path, command):
+    path = str(tmp_path / "pets.json")
+
+    async def scenario(host, port):
+        reader, writer = await asyncio.open_connection(host, port)
+        await send(reader, writer, "create mochi")
+        reply = await send(reader, writer, f"{command} {tmp_path / 'x.txt'}")
+        # Koneksi tetap hidup setelah ditolak
+        after = await send(reader, writer, "list")
+        writer.close()
+        return reply, after
+
+    reply, after = run_with_server(path, scenario)
+    assert f"'{command}' is not available in server mode." in reply
+    assert "mochi" in after
+    assert not (tmp_path / "x.txt").exists()
@@ -0,0 +1,83 @@
+# ============================================================================
+# TEST SHARD - Dua shard (proses spawn): create, routing, list & save
+# ============================================================================
+# Jalankan: python -m pytest -q
+# Worker jalan lewat multiprocessing "spawn", jadi target-nya harus fungsi yang
+# bisa di-import (shard._worker_main), bukan fungsi lokal di file test ini.
+
+import io
+
+import pytest
+
+from data_handler import JsonStorage
+from shard import ShardedManager, shard_of, shard_path
+from ui import HeadlessUI
+
+SHARDS = 2
+
+
+def names_for_each_shard(count):
+    # Beberapa nama untuk tiap shard, biar routing ke dua-duanya kepakai
+    picked = {index: [] for index in range(SHARDS)}
+    i = 0
+    while any(len(names) < count for names in picked.values()):
+        name = f"pet{i}"
+        if len(picked[shard_of(name, SHARDS)]) < count:
+            picked[shard_of(name, SHARDS)].append(name)
+        i += 1
+    return picked
+
+
+def open_sharded(folder):
+    out = io.StringIO()
+    manager = ShardedManager(SHARDS, folder=folder, ui=HeadlessUI(out))
+    return manager, out
+
+
+def test_two_shards_create_route_list_and_save(tmp_path, monkeypatch):
+    # Folder kerja kosong: nggak ada pet_data.json yang ikut di-import
+    monkeypatch.chdir(tmp_path)
+    folder = str(tmp_path / "shards")
+    picked = names_for_each_shard(2)
+    everyone = sorted(name for names in picked.values() for name in names)
+
+    manager, out = open_sharded(folder)
+    try:
+        manager.autosave = False
+        for name in everyone:
+            manager.create_pet(name)
+        target = picked[1][0]
+        manager.select_pet(target)
+        assert manager.current_pet == target
+        manager.feed()
+
+        out.seek(0)
+        out.truncate()
+        manager.list_pets()
+        listing = out.getvalue()
+        assert all(f" - {name} " in listing for name in everyone)
+
+        # order by dari dua shard digabung jadi satu urutan
+        assert [name for name, _ in manager._gather_rows("order by name limit 3")] == everyone[:3]
+        fed = manager._gather_rows("order by exp desc limit 1")
+        assert fed[0][0] == target and fed[0][1]["exp"] > 0
+        manager.save_data()
+    finally:
+        manager.close()
+
+    # Tiap pet tersimpan di file shard pemiliknya
+    for index, names in picked.items():
+        storage = JsonStorage(shard_path(folder, index))
+        assert sorted(storage.load()) == sorted(names)
+        storage.close()
+
+    manager, out = open_sharded(folder)
+    try:
+        manager.select_pet(target)
+        assert manager.current_pet == target
+        assert sorted(name for name, _ in manager._gather_rows(None)) == everyone
+    finally:
+        manager.close()
+
+    with pytest.raises(ValueError, match="split into 2 shards"):
+        ShardedManager(3, folder=folder, ui=HeadlessUI(io.StringIO()))
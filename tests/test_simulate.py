@@ -0,0 +1,40 @@
+# ============================================================================
+# TEST SIMULATE - Argumen simulator balancing & hasil yang bisa diulang (seed)
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import pytest
+
+from simulate import simulate, simulate_main
+
+numpy = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("argv", [
+    ["--pets", "0", "--steps", "5"],
+    ["--pets", "10", "--tick-every", "0"],
+    ["--pets", "-3"],
+    ["--steps"],
+])
+def test_bad_arguments_print_usage(argv, capsys):
+    assert simulate_main(argv) == 2
+    assert capsys.readouterr().err.startswith("Usage: main.py simulate")
+
+
+def test_zero_pets_is_rejected():
+    with pytest.raises(ValueError):
+        simulate(0, 5)
+
+
+def test_same_seed_gives_same_report():
+    first = simulate(500, 20, seed=11)
+    second = simulate(500, 20, seed=11)
+    assert first["curve"] == second["curve"]
+    assert first["result"] == second["result"]
+    assert first["result"]["pets"] == 500
+    assert first["curve"][-1][0] == 20
+
+
+def test_small_run_prints_report(capsys):
+    assert simulate_main(["--pets", "20", "--steps", "3", "--seed", "1"]) == 0
+    assert "Simulated 20 pets x 3 steps" in capsys.readouterr().out
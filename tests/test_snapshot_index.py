@@ -0,0 +1,130 @@
+# ============================================================================
+# TEST SNAPSHOT INDEX - Load lazy lewat index offset (.idx), checksum & convert format
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+import os
+
+import snapshot_index
+from data_handler import JsonStorage, LazyPetMap, convert_file
+from pet_manager import PetManager
+from ui import HeadlessUI
+
+
+def make_pet(i):
+    return {"hunger": i % 100, "energy": 50, "happy": 50, "health": 100, "level": 1 + i % 5, "exp": i % 100, "ts": 0}
+
+
+def roster(count):
+    # Nama dengan escape & non-ASCII ikut dicoba
+    data = {f"pet{i}": make_pet(i) for i in range(count)}
+    data['quote "q"'] = make_pet(1)
+    data["kucing🐱"] = make_pet(2)
+    return data
+
+
+def write_snapshot(path, data):
+    storage = JsonStorage(path, lazy=False)
+    # Dibaca dulu: isi snapshot lama yang belum pernah dilihat dianggap perubahan proses lain
+    storage.load()
+    storage.save(data)
+    storage.close()
+
+
+def as_dict(data):
+    return {name: dict(attrs) for name, attrs in data.items()}
+
+
+def test_lazy_load_round_trips_through_index(tmp_path):
+    path = str(tmp_path / "pets.json")
+    data = roster(200)
+    write_snapshot(path, data)
+
+    storage = JsonStorage(path, lazy=True)
+    lazy = storage.load()
+    assert isinstance(lazy, LazyPetMap)
+    assert os.path.exists(path + snapshot_index.INDEX_SUFFIX)
+    assert len(lazy) == len(data)
+    for name in ("pet0", "pet199", 'quote "q"', "kucing🐱"):
+        assert dict(lazy[name]) == data[name]
+    assert "nobody" not in lazy
+    assert as_dict(lazy) == data
+
+    # Perubahan lewat journal lalu compaction: snapshot & index baru tetap cocok
+    lazy["pet0"] = {**data["pet0"], "hunger": 1}
+    del lazy["pet1"]
+    storage.save(lazy)
+    storage.close()
+    data["pet0"]["hunger"] = 1
+    del data["pet1"]
+    assert as_dict(JsonStorage(path, lazy=True).load()) == data
+    assert as_dict(JsonStorage(path, lazy=False).load()) == data
+
+
+def test_stale_index_is_rebuilt(tmp_path):
+    path = str(tmp_path / "pets.json")
+    write_snapshot(path, roster(50))
+    JsonStorage(path, lazy=True).load()
+    assert snapshot_index.index_count(path) == 52
+
+    # Snapshot ditulis ulang tanpa mode lazy -> index lama dibuang, dibangun ulang saat dibuka lazy
+    data = roster(80)
+    write_snapshot(path, data)
+    assert snapshot_index.index_count(path) is None
+    assert as_dict(JsonStorage(path, lazy=True).load()) == data
+    assert snapshot_index.index_count(path) == 82
+
+
+def test_checksum_mismatch_is_reported(tmp_path):
+    path = str(tmp_path / "pets.json")
+    write_snapshot(path, roster(50))
+    JsonStorage(path, lazy=True).load()
+    count = snapshot_index.index_count(path)
+    assert snapshot_index.verify(path, count) == []
+    assert all(ok for _, ok, _ in JsonStorage(path, lazy=True).verify())
+
+    # Satu byte di record pet7 diganti, ukuran & mtime dibuat sama -> index tetap dianggap segar
+    offset, length = snapshot_index.lookup(path, count, "pet7")
+    stat = os.stat(path)
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        record = f.read(length)
+        f.seek(offset)
+        f.write(record.replace(b"50", b"51", 1))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert snapshot_index.index_count(path) == count
+    assert snapshot_index.verify(path, count) == ["pet7"]
+    results = dict((part, ok) for part, ok, _ in JsonStorage(path, lazy=True).verify())
+    assert results["snapshot"] is False
+
+
+def test_lazy_roster_converts_to_msgpack(tmp_path):
+    path = str(tmp_path / "pets.json")
+    data = roster(100)
+    write_snapshot(path, data)
+    manager = PetManager(storage=JsonStorage(path, lazy=True), ui=HeadlessUI(io.StringIO()))
+    manager.autosave = False
+    manager.create_pet("newbie")
+    data["newbie"] = dict(manager.data["newbie"])
+
+    manager.convert("msgpack")
+
+    assert manager.storage.format == "msgpack"
+    assert not os.path.exists(path + snapshot_index.INDEX_SUFFIX)
+    assert as_dict(JsonStorage(path).load()) == data
+    manager.storage.close()
+
+
+def test_convert_file_ignores_lazy_mode(tmp_path, monkeypatch):
+    monkeypatch.setenv("PET_LAZY", "1")
+    path = str(tmp_path / "pets.json")
+    data = roster(100)
+    write_snapshot(path, data)
+
+    old_fmt, _, _ = convert_file(path, "struct")
+
+    assert old_fmt == "json"
+    assert as_dict(JsonStorage(path).load()) == data
+    assert not os.path.exists(path + snapshot_index.INDEX_SUFFIX)
@@ -0,0 +1,81 @@
+# ============================================================================
+# TEST SQLITE - Round trip backend SQLite & keyset pagination (lazy load)
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import pytest
+
+from data_handler import ConflictError, LazyPetMap, SqliteStorage
+
+
+def pet(hunger):
+    return {"hunger": hunger, "energy": 50, "happy": 50, "health": 100, "level": 2, "exp": 7, "ts": 123}
+
+
+def plain(data):
+    return {name: dict(attrs) for name, attrs in data.items()}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "pets.db")
+    storage = SqliteStorage(path)
+    storage.save({"b": pet(2), "a": pet(1), "c": pet(3)})
+    storage.close()
+
+    storage = SqliteStorage(path)
+    data = storage.load()
+    assert isinstance(data, LazyPetMap)
+    assert plain(data) == {"a": pet(1), "b": pet(2), "c": pet(3)}
+    assert list(data) == ["a", "b", "c"]  # urut nama
+
+    # Perubahan lewat LazyPetMap: cuma yang pending yang ditulis
+    data["a"]["hunger"] = 90
+    data["d"] = pet(4)
+    del data["b"]
+    assert len(data) == 3
+    storage.save(data)
+    storage.close()
+
+    storage = SqliteStorage(path)
+    assert plain(storage.load()) == {"a": pet(90), "c": pet(3), "d": pet(4)}
+    storage.close()
+
+
+def test_paging_continues_past_deleted_key(tmp_path):
+    path = str(tmp_path / "pets.db")
+    names = [f"p{i:02}" for i in range(7)]
+    storage = SqliteStorage(path)
+    storage.save({name: pet(i) for i, name in enumerate(names)})
+
+    other = SqliteStorage(path)
+    other.load()
+    pages = storage.pages(page_size=3)
+    first = next(pages)
+    assert [name for name, _ in first] == names[:3]
+    # Proses lain menghapus key terakhir halaman ini (acuan keyset) + satu di halaman depan
+    other.save(other.load(), {"p02": None, "p04": None})
+    rest = [name for page in pages for name, _ in page]
+    assert rest == ["p03", "p05", "p06"]
+    other.close()
+
+    # Lazy map: pet yang dihapus di memori dilewati, pet baru ikut di akhir
+    data = storage.load()
+    del data["p00"]
+    data["zz"] = pet(9)
+    assert list(data) == ["p01", "p03", "p05", "p06", "zz"]
+    assert len(data) == 5
+    storage.close()
+
+
+def test_stale_write_is_a_conflict(tmp_path):
+    path = str(tmp_path / "pets.db")
+    mine, theirs = SqliteStorage(path), SqliteStorage(path)
+    mine.save({"a": pet(1)})
+    data, their_data = mine.load(), theirs.load()
+    data["a"]["hunger"] = 10
+    their_data["a"]["hunger"] = 20
+    theirs.save(their_data)
+    with pytest.raises(ConflictError):
+        mine.save(data)
+    mine.close()
+    theirs.close()
@@ -0,0 +1,91 @@
+# ============================================================================
+# TEST TENANTS - Cache LRU per pemilik: urutan evict & flush saat di-evict
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+
+import pytest
+
+from data_handler import JsonStorage
+from pet_manager import PetManager
+from tenants import TenantCache, TenantError, tenant_path
+from ui import HeadlessUI
+
+
+def make_cache(tmp_path, **kwargs):
+    def factory(path):
+        manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(io.StringIO()))
+        manager.autosave = False  # perubahan cuma tersimpan waktu di-flush
+        return manager
+    return TenantCache(str(tmp_path), factory=factory, **kwargs)
+
+
+def saved_pets(tmp_path, owner):
+    storage = JsonStorage(tenant_path(str(tmp_path), owner, "json"))
+    try:
+        return sorted(storage.load())
+    finally:
+        storage.close()
+
+
+def test_least_recently_used_owner_is_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_tenants=2)
+    for owner in ("ana", "budi", "ana", "cici"):
+        with cache.use(owner):
+            pass
+    # budi paling lama nggak dipakai (ana dipakai lagi sebelum cici)
+    assert cache.loaded() == ["ana", "cici"]
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 3, 1)
+    cache.close()
+
+
+def test_evicted_owner_is_flushed_and_reloaded(tmp_path):
+    cache = make_cache(tmp_path, max_tenants=1)
+    with cache.use("ana") as manager:
+        manager.create_pet("mochi")
+        assert saved_pets(tmp_path, "ana") == []  # belum di-flush
+    with cache.use("budi") as manager:
+        manager.create_pet("kopi")
+
+    assert cache.loaded() == ["budi"]
+    assert saved_pets(tmp_path, "ana") == ["mochi"]
+    with cache.use("ana") as manager:
+        assert "mochi" in manager.data
+    assert saved_pets(tmp_path, "budi") == ["kopi"]
+    cache.close()
+
+
+def test_pinned_owner_is_not_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_tenants=1)
+    with cache.use("ana") as ana:
+        with cache.use("budi"):
+            pass
+        ana.create_pet("mochi")  # masih dipakai, jadi masih manager yang sama
+        assert cache.loaded() == ["ana", "budi"]
+    # Setelah dilepas ana yang paling lama (dipakai sejak sebelum budi) -> di-flush
+    assert cache.loaded() == ["budi"]
+    assert saved_pets(tmp_path, "ana") == ["mochi"]
+    cache.close()
+
+
+def test_memory_budget_and_manual_evict(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=1)  # selalu lewat batas: cuma yang terbaru tersisa
+    with cache.use("ana") as manager:
+        manager.create_pet("mochi")
+    with cache.use("budi"):
+        pass
+    assert cache.loaded() == ["budi"]
+    assert cache.evict("budi")
+    assert not cache.evict("budi")
+    assert cache.loaded() == [] and cache.bytes == 0
+    assert saved_pets(tmp_path, "ana") == ["mochi"]
+    cache.close()
+
+
+@pytest.mark.parametrize("owner", ["", "../etc", "a b", "x" * 65])
+def test_bad_owner_names_are_rejected(tmp_path, owner):
+    cache = make_cache(tmp_path)
+    with pytest.raises(TenantError):
+        with cache.use(owner):
+            pass
@@ -0,0 +1,85 @@
+# ============================================================================
+# TEST TRANSFER - Export lalu import lagi (CSV, Parquet / Arrow kalau ada pyarrow)
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import importlib.util
+import io
+
+import pytest
+
+import transfer
+from data_handler import JsonStorage
+from pet_manager import PetManager
+from ui import HeadlessUI
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+PETS = {
+    "mochi": {"hunger": 10, "energy": 20, "happy": 30, "health": 40, "level": 7, "exp": 55, "ts": 1700000000},
+    "a, b": {"hunger": 0, "energy": 100, "happy": 1, "health": 99, "level": 1, "exp": 0, "ts": 0},
+    'kata "kutip"': {"hunger": 5, "energy": 5, "happy": 5, "health": 5, "level": 2**31 - 1, "exp": 99, "ts": 2**40},
+    "kucing 🐱": {"hunger": 50, "energy": 50, "happy": 50, "health": 100, "level": 3, "exp": 1, "ts": 1},
+}
+
+
+def open_manager(path):
+    out = io.StringIO()
+    manager = PetManager(storage=JsonStorage(path), ui=HeadlessUI(out))
+    manager.autosave = False
+    return manager, out
+
+
+def plain(data):
+    return {name: dict(attrs) for name, attrs in data.items()}
+
+
+@pytest.mark.parametrize("ext", [
+    ".csv",
+    pytest.param(".parquet", marks=pytest.mark.skipif(not HAS_PYARROW, reason="needs pyarrow")),
+    pytest.param(".arrow", marks=pytest.mark.skipif(not HAS_PYARROW, reason="needs pyarrow")),
+])
+def test_export_import_round_trip(tmp_path, monkeypatch, ext):
+    monkeypatch.setattr(transfer, "CHUNK_ROWS", 3)  # beberapa chunk walau cuma 4 pet
+    source, out = open_manager(str(tmp_path / "source.json"))
+    source.data.update({name: dict(attrs) for name, attrs in PETS.items()})
+    path = str(tmp_path / f"roster{ext}")
+    source.export_pets(path)
+    assert f"Exported {len(PETS)} pets" in out.getvalue()
+
+    target, out = open_manager(str(tmp_path / "target.json"))
+    target.import_pets(path)
+    assert f"Imported {len(PETS)} pets" in out.getvalue()
+    assert plain(target.data) == PETS
+
+    # Tersimpan juga setelah reload
+    target.save_data()
+    reloaded, _ = open_manager(str(tmp_path / "target.json"))
+    assert plain(reloaded.data) == PETS
+
+
+def test_csv_import_skips_invalid_rows(tmp_path):
+    path = tmp_path / "roster.csv"
+    path.write_text("name,hunger,level\nok,10,2\n,5,1\nbad,abc,1\nbig,101,1\nshort\n", encoding="utf-8")
+    manager, out = open_manager(str(tmp_path / "pets.json"))
+    manager.import_pets(str(path))
+    assert list(manager.data) == ["ok"]
+    assert manager.data["ok"]["hunger"] == 10 and manager.data["ok"]["level"] == 2
+    assert "Skipped 4 invalid rows (row 2:" in out.getvalue()
+
+
+def test_unknown_extension_and_missing_column(tmp_path):
+    with pytest.raises(transfer.TransferError, match="Unknown file type"):
+        transfer.write_pets(str(tmp_path / "roster.xlsx"), [])
+    path = tmp_path / "roster.csv"
+    path.write_text("nama,hunger\nx,1\n", encoding="utf-8")
+    with pytest.raises(transfer.TransferError, match="no 'name' column"):
+        list(transfer.read_pets(str(path)))
+
+
+@pytest.mark.skipif(HAS_PYARROW, reason="pyarrow is installed")
+def test_arrow_formats_need_pyarrow(tmp_path):
+    path = tmp_path / "roster.parquet"
+    with pytest.raises(transfer.TransferError, match="pip install pyarrow"):
+        transfer.write_pets(str(path), PETS.items())
+    assert not path.exists() and not (tmp_path / "roster.parquet.tmp").exists()
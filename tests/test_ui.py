@@ -0,0 +1,114 @@
+# ============================================================================
+# TEST UI - HeadlessUI, write_chunks & pager untuk output panjang
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import io
+import os
+import shlex
+import sys
+
+import pytest
+
+import ui
+from ui import ConsoleUI, HeadlessUI, get_ui, headless_requested, write_chunks
+
+
+class CountingOut(io.StringIO):
+    # Stream palsu: hitung jumlah write & bisa pura-pura jadi terminal
+    def __init__(self, tty=False):
+        super().__init__()
+        self.tty = tty
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+    def isatty(self):
+        return self.tty
+
+
+def test_headless_output_has_no_colors_or_delays(monkeypatch):
+    monkeypatch.setattr(ui.time, "sleep", lambda seconds: pytest.fail("HeadlessUI must not sleep"))
+    out = io.StringIO()
+    headless = HeadlessUI(out)
+    headless.say("hello", "red")
+    headless.slow_print("slow", "green", delay=5)
+    headless.animate(["(o.o)", "(-.-)"], 5, "cyan")
+    headless.pause(10)
+    headless.say_lines([("a", "red"), ("b", None)])
+    headless.page([("c", "blue")])
+    assert out.getvalue() == "hello\nslow\na\nb\nc\n"
+
+
+def test_answers_feed_ask_until_exhausted(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda text: pytest.fail("must not read stdin"))
+    headless = HeadlessUI(io.StringIO())
+    headless.answers = iter(["  rex  "])
+    assert headless.ask("Name: ") == "rex"
+    assert headless.ask("Again: ") == ""  # jawaban habis = kosong, bukan nunggu input
+
+
+@pytest.mark.parametrize("argv, env, expected", [
+    (["--headless"], "", True),
+    ([], "1", True),
+    ([], "yes", True),
+    ([], "0", False),
+    (["run", "x.txt"], "", False),
+])
+def test_headless_requested(monkeypatch, argv, env, expected):
+    monkeypatch.setenv(ui.HEADLESS_ENV, env)
+    assert headless_requested(argv) is expected
+
+
+def test_get_ui_headless():
+    assert type(get_ui(headless=True)) is HeadlessUI
+
+
+def test_write_chunks_batches_lines(monkeypatch):
+    monkeypatch.setattr(ui, "WRITE_CHUNK", 10)
+    out = CountingOut()
+    lines = [f"line {i}" for i in range(20)]  # 7 karakter + newline per baris
+    write_chunks(out, lines)
+    assert out.getvalue() == "".join(f"{line}\n" for line in lines)
+    assert out.writes == 10  # dua baris per write, bukan satu write per baris
+
+    empty = CountingOut()
+    write_chunks(empty, [])
+    assert empty.getvalue() == "" and empty.writes == 0
+
+
+def paged_console(monkeypatch, tmp_path, rows, pager):
+    # ConsoleUI ke "terminal" 5 baris; pager menulis semua input-nya ke file
+    pytest.importorskip("colorama")
+    monkeypatch.setattr("shutil.get_terminal_size", lambda *args: os.terminal_size((80, 5)))
+    monkeypatch.setenv("PAGER", pager)
+    out = CountingOut(tty=True)
+    console = ConsoleUI(out)
+    console.page((f"row {i}", None) for i in range(rows))
+    return out
+
+
+def copy_pager(target):
+    script = f"import sys; open({str(target)!r}, 'w').write(sys.stdin.read())"
+    return f"{shlex.quote(sys.executable)} -c {shlex.quote(script)}"
+
+
+def test_long_output_goes_to_pager(monkeypatch, tmp_path):
+    target = tmp_path / "paged.txt"
+    out = paged_console(monkeypatch, tmp_path, 50, copy_pager(target))
+    assert out.getvalue() == ""
+    assert target.read_text(encoding="utf-8") == "".join(f"row {i}\n" for i in range(50))
+
+
+def test_short_output_skips_pager(monkeypatch, tmp_path):
+    target = tmp_path / "paged.txt"
+    out = paged_console(monkeypatch, tmp_path, 3, copy_pager(target))
+    assert out.getvalue() == "row 0\nrow 1\nrow 2\n"
+    assert not target.exists()
+
+
+def test_missing_pager_falls_back_to_output(monkeypatch, tmp_path):
+    out = paged_console(monkeypatch, tmp_path, 20, str(tmp_path / "no-such-pager"))
+    assert out.getvalue() == "".join(f"row {i}\n" for i in range(20))
@@ -0,0 +1,76 @@
+# ============================================================================
+# TEST WORLD - Jalur vectorized (NumPy + PetTable) sama dengan loop Python
+# ============================================================================
+# Jalankan: python -m pytest -q
+
+import random
+
+import pytest
+
+import events
+import world
+from pet_manager import DECAY_STEP
+from pet_table import PetTable
+
+pytest.importorskip("numpy")
+
+NOW = 1_700_000_000
+
+
+def roster(seed, count=300):
+    rng = random.Random(seed)
+    data = {}
+    for i in range(count):
+        data[f"pet{i}"] = {
+            "hunger": rng.choice([0, 3, 10, 11, rng.randint(0, 100), 100]),
+            "energy": rng.randint(0, 100),
+            "happy": rng.randint(0, 100),
+            "health": rng.choice([0, 5, rng.randint(0, 100), 100]),
+            "level": rng.randint(1, 40),
+            "exp": rng.choice([0, 85, 99, rng.randint(0, 99)]),
+            # Campuran: belum ada ts, baru saja, & lama ditinggal (decay offline)
+            "ts": rng.choice([0, NOW, NOW - rng.randint(0, 50) * max(DECAY_STEP, 1) - 7]),
+        }
+    return data
+
+
+@pytest.fixture(params=[0, 100], ids=["events-never", "events-always"])
+def fixed_events(request, monkeypatch):
+    # RNG loop & NumPy beda, jadi peluang event dibuat 0% / 100% biar hasilnya pasti
+    chance = request.param
+    bonus = {action: event._replace(chance=chance) for action, event in events.BONUS_EVENTS.items()}
+    hazards = tuple(hazard._replace(chance=chance) for hazard in events.HAZARD_EVENTS)
+    for module in (events, world):
+        monkeypatch.setattr(module, "BONUS_EVENTS", bonus)
+        monkeypatch.setattr(module, "HAZARD_EVENTS", hazards)
+
+
+@pytest.mark.parametrize("action, conditions, ticks", [
+    ("tick", (), 1),
+    ("tick", (), 7),
+    ("feed", (), 1),
+    ("play", (("hunger", "<=", 50),), 2),
+    ("sleep", (("level", ">=", 10), ("energy", "<", 60)), 1),
+    ("heal", (("health", "!=", 100),), 3),
+    ("feed", (("level", ">", 1000),), 1),
+])
+def test_vectorized_matches_loop(fixed_events, action, conditions, ticks):
+    data = roster(ticks)
+    table = PetTable.from_mapping(data)
+
+    loop_result, changed = world.run(data, action, conditions, ticks, random.Random(1), now=NOW)
+    table_result, none = world.run(table, action, conditions, ticks, random.Random(1), now=NOW)
+
+    assert none is None
+    assert table_result == loop_result
+    assert {name: dict(table[name]) for name in table} == data
+    assert len(changed) == loop_result["pets"]
+
+
+def test_settle_decay_matches_loop():
+    data = roster(9)
+    table = PetTable.from_mapping(data)
+    changed = world.settle_decay(data, now=NOW)
+    assert changed or DECAY_STEP <= 0
+    assert world.settle_decay(table, now=NOW) == (None if changed else [])
+    assert {name: dict(table[name]) for name in table} == data
@@ -0,0 +1,217 @@
+# ============================================================================
+# TRANSFER - Export / import roster ke CSV & Parquet / Arrow (buat analisis)
+# ============================================================================
+# Format dipilih dari ekstensi file:
+#   - .csv                      : teks, bisa dibuka spreadsheet / pandas
+#   - .parquet / .pq            : kolom terkompresi (butuh: pip install pyarrow)
+#   - .arrow / .feather / .ipc  : Arrow IPC, kolom tanpa kompresi (butuh pyarrow)
+#
+# Kolomnya: name + PET_FIELDS (hunger, energy, happy, health, level, exp, ts),
+# tipe kolom Parquet/Arrow ikut PetTable (int16 untuk stat, int32, int64).
+# Baca & tulis jalan per chunk CHUNK_ROWS pet, jadi file 1M pet nggak pernah
+# ditampung utuh di memori (selain roster-nya sendiri).
+
+import csv
+import os
+from itertools import islice
+from operator import itemgetter
+
+from data_handler import PET_FIELDS
+from pet_table import FIELD_TYPES
+
+# Jumlah pet per chunk (satu record batch Parquet/Arrow, satu writerows CSV)
+CHUNK_ROWS = 65_536
+
+COLUMNS = ("name",) + PET_FIELDS
+
+# Ekstensi file -> format
+EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+# Typecode array PetTable -> tipe kolom Arrow
+_ARROW_TYPES = {"h": "int16", "i": "int32", "q": "int64"}
+
+# pyarrow opsional & berat di-import: baru dimuat saat Parquet/Arrow dipakai
+pa = None
+
+
+class TransferError(ValueError):
+    """
+    File export/import nggak bisa dipakai (format nggak dikenal, kolom kurang,
+    pyarrow belum terpasang, ...). Pesannya siap ditampilkan ke user.
+    """
+
+
+def _arrow():
+    global pa
+    if pa is None:
+        try:
+            import pyarrow as module
+        except ImportError:
+            raise TransferError("Parquet/Arrow files need the pyarrow package (pip install pyarrow).") from None
+        pa = module
+    return pa
+
+
+def file_format(path):
+    """
+    Format file dari ekstensinya. Lempar TransferError kalau nggak dikenal.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXTENSIONS:
+        raise TransferError(f"Unknown file type '{ext or path}' (use {', '.join(EXTENSIONS)}).")
+    return EXTENSIONS[ext]
+
+
+def _chunks(rows, size=CHUNK_ROWS):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+def write_pets(path, rows):
+    """
+    Tulis (nama, attrs) ke `path`. Ditulis ke file sementara dulu lalu
+    di-rename, jadi file lama nggak rusak kalau export gagal di tengah.
+    Return jumlah pet yang ditulis.
+    """
+    fmt = file_format(path)
+    if fmt != "csv":
+        _arrow()  # cek pyarrow sebelum bikin file apa pun
+    values = itemgetter(*PET_FIELDS)
+    records = ((name,) + values(attrs) for name, attrs in rows)
+    tmp = path + ".tmp"
+    try:
+        if fmt == "csv":
+            count = _write_csv(tmp, records)
+        else:
+            count = _write_arrow(tmp, records, fmt)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return count
+
+
+def _write_csv(path, records):
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for chunk in _chunks(records):
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def _schema():
+    fields = [("name", pa.string())]
+    fields += [(field, getattr(pa, _ARROW_TYPES[FIELD_TYPES[field]])()) for field in PET_FIELDS]
+    return pa.schema(fields)
+
+
+def _write_arrow(path, records, fmt):
+    schema = _schema()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        writer = pq.ParquetWriter(path, schema)
+    else:
+        writer = pa.ipc.new_file(path, schema)
+    count = 0
+    with writer:
+        for chunk in _chunks(records):
+            # Satu chunk = satu record batch: baris -> kolom
+            columns = [pa.array(column, type=field.type) for column, field in zip(zip(*chunk), schema)]
+            writer.write_batch(pa.record_batch(columns, schema=schema))
+            count += len(chunk)
+    return count
+
+
+# ============================================================================
+# IMPORT
+# ============================================================================
+
+def read_pets(path):
+    """
+    Baca pet dari `path` per chunk. Yield (nomor baris pertama, list nama,
+    {field: list nilai}) -- per kolom, jadi bisa divalidasi sekaligus
+    (pet_manager.check_pets). Kolom cuma yang ada di file, nilainya belum
+    divalidasi (CSV masih string). Baris dihitung dari 1 tanpa header.
+    """
+    fmt = file_format(path)
+    if fmt == "csv":
+        return _checked(path, _read_csv(path))
+    _arrow()
+    return _checked(path, _read_arrow(path, fmt))
+
+
+def _checked(path, chunks):
+    # Error parser CSV / pyarrow (file rusak, encoding salah) -> TransferError
+    errors = (csv.Error, UnicodeDecodeError) + ((pa.ArrowException,) if pa is not None else ())
+    try:
+        yield from chunks
+    except errors as e:
+        raise TransferError(f"{path}: {e}") from None
+
+
+def _fields_of(columns, path):
+    if "name" not in columns:
+        raise TransferError(f"{path} has no 'name' column.")
+    return [field for field in PET_FIELDS if field in columns]
+
+
+def _read_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise TransferError(f"{path} is empty.")
+        header = [column.strip() for column in header]
+        fields = _fields_of(header, path)
+        width = len(header)
+        number = 1
+        for chunk in _chunks(reader):
+            # Baris yang kurang kolom diisi sel kosong (nanti ditolak validasi)
+            padded = [row if len(row) >= width else row + [""] * (width - len(row)) for row in chunk]
+            columns = dict(zip(header, map(list, zip(*padded))))
+            yield number, columns["name"], {field: columns[field] for field in fields}
+            number += len(chunk)
+
+
+def _batches(path, fmt):
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        yield from pq.ParquetFile(path).iter_batches(batch_size=CHUNK_ROWS)
+        return
+    # Arrow IPC di-memory-map: batch dibaca langsung dari file, nggak di-copy semua
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+
+def _read_arrow(path, fmt):
+    number = 1
+    for batch in _batches(path, fmt):
+        fields = _fields_of(batch.schema.names, path)
+        # Batch dari tool lain bisa jauh lebih besar dari CHUNK_ROWS -> dipotong
+        for start in range(0, batch.num_rows, CHUNK_ROWS):
+            part = batch.slice(start, CHUNK_ROWS)
+            yield number, part.column("name").to_pylist(), {
+                field: part.column(field).to_pylist() for field in fields
+            }
+            number += part.num_rows
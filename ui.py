@@ -0,0 +1,211 @@
+# ============================================================================
+# UI - Semua output terminal (warna, animasi, input) ada di sini
+# ============================================================================
+# PetManager nggak print langsung, tapi lewat object UI:
+#   - ConsoleUI  : tampilan biasa (colorama + animasi + delay)
+#   - HeadlessUI : tanpa warna & tanpa delay, buat script / test / server
+# Jadi logika state pet bisa dipakai tanpa terminal sama sekali.
+
+import os
+import sys
+import time
+from itertools import chain, islice
+
+# Env var untuk menyalakan mode headless (PET_HEADLESS=1)
+HEADLESS_ENV = "PET_HEADLESS"
+
+# Output panjang (list/stats) dikumpulkan dulu lalu ditulis per chunk sebesar ini
+WRITE_CHUNK = 64 * 1024
+
+# Pager untuk output yang lebih panjang dari layar (bisa diganti lewat env PAGER,
+# misal PAGER=cat untuk mematikan)
+DEFAULT_PAGER = "more" if os.name == "nt" else "less -R"
+
+
+def headless_requested(argv=None):
+    """
+    True kalau user minta mode headless lewat flag --headless atau env PET_HEADLESS.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if "--headless" in argv:
+        return True
+    return os.environ.get(HEADLESS_ENV, "").lower() in ("1", "true", "yes", "on")
+
+
+def get_ui(headless=None):
+    """
+    Pilih UI yang cocok. headless=None -> ikut flag/env.
+    """
+    if headless is None:
+        headless = headless_requested()
+    return HeadlessUI() if headless else ConsoleUI()
+
+
+class HeadlessUI:
+    """
+    UI tanpa warna, tanpa animasi, tanpa sleep. Teks tetap dicetak apa adanya.
+    """
+
+    def __init__(self, out=None):
+        self.out = out or sys.stdout
+        # Iterator jawaban untuk ask() (dipakai mode script); None = tanya ke user
+        self.answers = None
+
+    def say(self, text="", color=None):
+        # color diabaikan, cuma ada biar interface-nya sama dengan ConsoleUI
+        self.out.write(f"{text}\n")
+
+    def slow_print(self, text, color=None, delay=0.03):
+        self.say(text, color)
+
+    def animate(self, frames, delay, color=None):
+        pass  # animasi di-skip total
+
+    def pause(self, seconds):
+        pass
+
+    def prompt(self, text):
+        return input(text)
+
+    def ask(self, text, color=None):
+        if self.answers is not None:
+            return next(self.answers, "").strip()
+        return input(text)
+
+    def say_lines(self, lines, out=None):
+        """
+        Tulis banyak baris (teks, warna) sekaligus. Baris digabung ke buffer dan
+        ditulis per WRITE_CHUNK karakter, bukan satu write per baris.
+        """
+        write_chunks(out or self.out, (self._render(text, color) for text, color in lines))
+
+    def page(self, lines):
+        # Mode headless nggak pakai pager
+        self.say_lines(lines)
+
+    def _render(self, text, color):
+        return text
+
+
+class ConsoleUI(HeadlessUI):
+    """
+    UI terminal interaktif: teks berwarna (colorama), animasi frame & delay.
+    """
+
+    def __init__(self, out=None):
+        # colorama di-import di sini biar mode headless nggak perlu memuatnya
+        from colorama import Fore, init
+
+        # Inisiasi colorama agar warna otomatis reset setelah digunakan
+        init(autoreset=True)
+        super().__init__(out)
+        self._fore = Fore
+
+    def _color(self, color):
+        # "red" -> Fore.RED, "lightgreen" -> Fore.LIGHTGREEN_EX
+        if not color:
+            return ""
+        name = color.upper()
+        if name.startswith("LIGHT"):
+            name += "_EX"
+        return getattr(self._fore, name)
+
+    def say(self, text="", color=None):
+        print(self._color(color) + text, file=self.out)
+
+    def _render(self, text, color):
+        # Warna ditutup reset sendiri (autoreset colorama cuma jalan per print)
+        if not color:
+            return text
+        return self._color(color) + text + self._fore.RESET
+
+    def page(self, lines):
+        """
+        Seperti say_lines, tapi kalau lebih panjang dari tinggi terminal,
+        output di-stream ke pager (less / more) sambil dirender.
+        """
+        lines = iter(lines)
+        if not self.out.isatty():
+            return self.say_lines(lines)
+
+        import shutil
+
+        height = shutil.get_terminal_size().lines
+        head = list(islice(lines, height - 1))
+        if len(head) < height - 1:
+            return self.say_lines(head)  # muat satu layar
+
+        pager = open_pager()
+        if pager is None:
+            return self.say_lines(chain(head, lines))
+        try:
+            self.say_lines(chain(head, lines), pager.stdin)
+        except BrokenPipeError:
+            pass  # user keluar dari pager sebelum output habis
+        finally:
+            try:
+                pager.stdin.close()
+            except BrokenPipeError:
+                pass
+            pager.wait()
+
+    def slow_print(self, text, color=None, delay=0.03):
+        # Menampilkan teks karakter demi karakter
+        self.out.write(self._color(color))
+        for char in text:
+            self.out.write(char)  # tulis satu karakter ke terminal tanpa newline
+            self.out.flush()      # untuk memastikan karakter langsung muncul
+            time.sleep(delay)     # delay antar karakter
+        self.out.write("\n")
+
+    def animate(self, frames, delay, color=None):
+        for frame in frames:
+            print(self._color(color) + frame, end="\r", flush=True, file=self.out)
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        time.sleep(seconds)
+
+    def prompt(self, text):
+        return input(self._fore.GREEN + text)
+
+    def ask(self, text, color=None):
+        if self.answers is not None:
+            return super().ask(text, color)
+        return input(self._color(color) + text)
+
+
+def write_chunks(out, texts):
+    """
+    Gabungkan potongan teks (satu baris per item) lalu tulis per WRITE_CHUNK.
+    """
+    buffer, size = [], 0
+    for text in texts:
+        buffer.append(text)
+        size += len(text) + 1
+        if size >= WRITE_CHUNK:
+            buffer.append("")  # biar join menambah newline di baris terakhir
+            out.write("\n".join(buffer))
+            buffer, size = [], 0
+    if buffer:
+        buffer.append("")
+        out.write("\n".join(buffer))
+    out.flush()
+
+
+def open_pager():
+    """
+    Jalankan pager (env PAGER atau DEFAULT_PAGER). Return Popen, atau None
+    kalau pager-nya nggak ada.
+    """
+    # shlex & subprocess cuma dibutuhkan di sini, jadi nggak ikut memperlambat startup
+    import shlex
+    import subprocess
+
+    command = os.environ.get("PAGER") or DEFAULT_PAGER
+    try:
+        return subprocess.Popen(
+            shlex.split(command), stdin=subprocess.PIPE, text=True, encoding="utf-8"
+        )
+    except OSError:
+        return None
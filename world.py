@@ -0,0 +1,307 @@
+# ============================================================================
+# WORLD - Interaksi massal & world tick untuk banyak pet sekaligus
+# ============================================================================
+# Aturan game-nya sama persis dengan interaksi satu pet di PetManager
+# (ACTION_EFFECTS, level up, tabel event di events.py), bedanya di sini
+# diterapkan ke banyak pet dalam satu kali jalan tanpa animasi & print per pet.
+#
+# Kalau roster berbentuk PetTable dan NumPy terpasang, semua dihitung
+# vectorized langsung di atas kolom array. Kalau tidak, fallback ke loop Python.
+#
+# Seperti interaksi satu pet, decay offline (pet_manager.decay_update) dihitung
+# dulu sebelum filter --where & aturan game, dan ts pet ikut di-stamp.
+
+import random
+import time
+
+from pet_manager import (
+    MAX_STAT, ACTION_EFFECTS, LEVEL_UP_EXP, LEVEL_UP_BONUS, TICK_DECAY, TICK_EXP,
+    DECAY_STEP, decay_update,
+)
+from events import BONUS_EVENTS, HAZARD_EVENTS, roll_events, event_name
+from pet_table import PetTable
+from query import OPERATORS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy opsional, tanpa NumPy tetap jalan (lebih lambat)
+    np = None
+
+# Typecode array.array -> dtype NumPy
+_NP_TYPES = {"h": "int16", "i": "int32", "q": "int64"}
+
+
+def new_result():
+    # Ringkasan hasil operasi massal (plus satu counter per hazard, misal "starving")
+    result = {"pets": 0, "level_ups": 0, "bonus": 0}
+    result.update((hazard.name, 0) for hazard in HAZARD_EVENTS)
+    return result
+
+
+def run(data, action, conditions=(), ticks=1, rng=None, bases=None, now=None, deltas=None):
+    """
+    Terapkan `action` ke semua pet di `data` yang memenuhi `conditions`.
+    action: "feed"/"play"/"sleep"/"heal", atau "tick" untuk world tick.
+    rng: random.Random (misal PetManager.rng); jalur vectorized memakai
+    generator NumPy yang di-seed dari rng ini, jadi tetap deterministik.
+    bases: dict opsional (jalur loop), diisi salinan pet sebelum diubah
+    untuk nama yang belum ada di dalamnya (lihat PetManager._bases).
+    now: waktu untuk decay offline (default time.time()).
+    deltas: list opsional (jalur vectorized), ditambah satu ColumnDelta berisi
+    kolom pet yang berubah sebelum & sesudahnya (buat undo).
+    Return (result, changed) — changed = list nama pet yang berubah, atau
+    None kalau semua pet yang cocok bisa saja berubah (jalur vectorized).
+    """
+    now = time.time() if now is None else now
+    if np is not None and isinstance(data, PetTable):
+        seed = rng.getrandbits(64) if rng is not None else None
+        return _run_vectorized(data, action, conditions, ticks, np.random.default_rng(seed), now, deltas), None
+    return _run_loop(data, action, conditions, ticks, rng or random, bases, now)
+
+
+def settle_decay(data, bases=None, now=None, prepare=None):
+    """
+    Tulis decay offline ke semua pet yang sudah kena, tanpa aturan game lain
+    (dipakai sebelum query list/stats di hunger / energy / happy, biar filter &
+    index pakai nilai yang sama dengan tampilan). bases & now sama seperti run.
+    prepare: fungsi opsional (jalur vectorized), dipanggil sekali sebelum kolom
+    diubah, cuma kalau ada pet yang kena.
+    Return list nama pet yang berubah, atau None kalau ada yang berubah di
+    jalur vectorized.
+    """
+    now = time.time() if now is None else now
+    if DECAY_STEP <= 0:
+        return []
+    if np is not None and isinstance(data, PetTable):
+        return None if _settle_vectorized(data, int(now), prepare) else []
+    changed = []
+    for name, pet in list(data.items()):
+        update = decay_update(pet, now)
+        if not update:
+            continue
+        if bases is not None and name not in bases:
+            bases[name] = dict(pet)
+        data[name] = {**pet, **update}
+        changed.append(name)
+    return changed
+
+
+# ============================================================================
+# JALUR LOOP (dict / backend lazy / tanpa NumPy)
+# ============================================================================
+
+def _clamp(value):
+    return max(0, min(MAX_STAT, value))
+
+
+def _step_pet(pet, action, rng, result):
+    """
+    Satu langkah aturan game untuk satu pet (tanpa output apa pun).
+    """
+    if action == "tick":
+        stats, exp = TICK_DECAY, TICK_EXP
+    else:
+        stats, exp = ACTION_EFFECTS[action]
+    for stat, delta in stats.items():
+        pet[stat] = _clamp(pet[stat] + delta)
+
+    # Level up (sama seperti PetManager._gain_exp)
+    pet["exp"] = pet.get("exp", 0) + exp
+    while pet["exp"] >= LEVEL_UP_EXP:
+        pet["exp"] -= LEVEL_UP_EXP
+        pet["level"] = pet.get("level", 1) + 1
+        for stat, delta in LEVEL_UP_BONUS.items():
+            pet[stat] = _clamp(pet[stat] + delta)
+        result["level_ups"] += 1
+
+    # Random event (sama seperti PetManager._random_event)
+    for event in roll_events(pet, action, rng, MAX_STAT):
+        result[event_name(event)] += 1
+
+
+def _run_loop(data, action, conditions, ticks, rng, bases=None, now=None):
+    result = new_result()
+    changed = []
+    now = time.time() if now is None else now
+    for name, pet in list(data.items()):
+        # Filter pakai nilai setelah decay (pet yang sudah lama lapar ikut kena)
+        update = decay_update(pet, now)
+        view = {**pet, **update} if update else pet
+        if conditions and not all(OPERATORS[op](view[f], v) for f, op, v in conditions):
+            continue
+        if bases is not None and name not in bases:
+            bases[name] = dict(pet)
+        # Sama seperti PetManager._apply_decay: decay dulu, pet tanpa ts mulai dihitung sekarang
+        pet.update(update)
+        if not pet.get("ts"):
+            pet["ts"] = int(now)
+        for _ in range(ticks):
+            _step_pet(pet, action, rng, result)
+        # Assign ulang supaya backend lazy (LazyPetMap) ikut nyimpen perubahan ini
+        data[name] = pet
+        changed.append(name)
+    result["pets"] = len(changed)
+    return result, changed
+
+
+# ============================================================================
+# JALUR VECTORIZED (PetTable + NumPy)
+# ============================================================================
+
+def _run_vectorized(table, action, conditions, ticks, rng, now=None, deltas=None):
+    rng = rng if rng is not None else np.random.default_rng()
+    now = int(time.time() if now is None else now)
+    result = new_result()
+    # np.frombuffer = view tanpa copy ke array.array, jadi update langsung ke tabel.
+    # Selama view masih ada, array-nya nggak boleh di-append -> dihapus di finally.
+    cols = {
+        field: np.frombuffer(col, dtype=_NP_TYPES[col.typecode])
+        for field, col in table.columns.items()
+    }
+    try:
+        mask = np.frombuffer(table.alive, dtype=np.uint8).astype(bool)
+        steps, decayed = _decay_columns(cols, now)
+        for field, op, value in conditions:
+            mask &= OPERATORS[op](decayed.get(field, cols[field]), value)
+        rows = np.flatnonzero(mask)
+        result["pets"] = int(rows.size)
+        if rows.size:
+            before = {field: col[rows] for field, col in cols.items()} if deltas is not None else None
+            # Decay offline cuma ditulis ke pet yang diubah (sisanya tetap dihitung saat dibaca)
+            for stat, values in decayed.items():
+                cols[stat][rows] = values[rows]
+            ts = cols["ts"]
+            if steps is not None:
+                ts[rows] += steps[rows] * DECAY_STEP
+            ts[rows[ts[rows] == 0]] = now
+            for _ in range(ticks):
+                _step_rows(cols, rows, action, rng, result)
+            if before is not None:
+                # Cuma kolom yang benar-benar berubah yang disimpan
+                after = {field: cols[field][rows] for field in before}
+                changed = [field for field in before if not np.array_equal(before[field], after[field])]
+                deltas.append(ColumnDelta(
+                    rows, table.names_at(rows.tolist()),
+                    {field: before[field] for field in changed}, {field: after[field] for field in changed},
+                ))
+    finally:
+        del cols
+    return result
+
+
+class ColumnDelta:
+    """
+    Perubahan satu operasi massal vectorized untuk history: baris & nama pet
+    yang kena + nilai kolom sebelum & sesudah (array NumPy, urutan sama dengan rows).
+    Kalau baris-baris itu sudah bukan milik pet yang sama (undo delete bisa
+    menaruh pet di baris lain), baris dicari lagi dari namanya.
+    """
+
+    __slots__ = ("rows", "names", "before", "after")
+
+    def __init__(self, rows, names, before, after):
+        self.rows = rows
+        self.names = names
+        self.before = before
+        self.after = after
+
+    def __len__(self):
+        return len(self.names)
+
+    def apply(self, table, undo):
+        """
+        Pasang nilai sebelum (undo) / sesudah (redo) ke PetTable.
+        """
+        values = self.before if undo else self.after
+        rows = self.rows
+        if rows.size and (rows.max() >= table.capacity or table.names_at(rows.tolist()) != self.names):
+            rows = np.fromiter(map(table.row_of, self.names), dtype=np.intp, count=len(self.names))
+        cols = {
+            field: np.frombuffer(table.columns[field], dtype=_NP_TYPES[table.columns[field].typecode])
+            for field in values
+        }
+        try:
+            for field, col in cols.items():
+                col[rows] = values[field]
+        finally:
+            del cols
+
+
+def _settle_vectorized(table, now, prepare=None):
+    # Return jumlah pet yang berubah
+    cols = {
+        field: np.frombuffer(col, dtype=_NP_TYPES[col.typecode])
+        for field, col in table.columns.items()
+    }
+    try:
+        steps, decayed = _decay_columns(cols, now)
+        if steps is None:
+            return 0
+        rows = np.flatnonzero(np.frombuffer(table.alive, dtype=np.uint8).astype(bool) & (steps > 0))
+        if rows.size:
+            if prepare is not None:
+                prepare()
+            for stat, values in decayed.items():
+                cols[stat][rows] = values[rows]
+            cols["ts"][rows] += steps[rows] * DECAY_STEP
+        return int(rows.size)
+    finally:
+        del cols
+
+
+def _decay_columns(cols, now):
+    """
+    decay_update untuk semua baris sekaligus: (steps per baris, {stat: nilai
+    setelah decay}) tanpa mengubah kolom. (None, {}) kalau decay mati / belum
+    ada pet yang punya ts.
+    """
+    ts = cols["ts"]
+    if DECAY_STEP <= 0 or not ts.any():
+        return None, {}
+    steps = np.where(ts > 0, (now - ts) // DECAY_STEP, 0)
+    np.maximum(steps, 0, out=steps)
+    decayed = {
+        stat: np.clip(cols[stat].astype(np.int64) + delta * steps, 0, MAX_STAT).astype(cols[stat].dtype)
+        for stat, delta in TICK_DECAY.items()
+    }
+    return steps, decayed
+
+
+def _add(cols, stat, rows, delta):
+    # Tambah/kurangi stat lalu clamp ke 0..MAX_STAT (pakai int32 biar nggak overflow)
+    values = cols[stat][rows].astype(np.int32) + delta
+    cols[stat][rows] = np.clip(values, 0, MAX_STAT)
+
+
+def _step_rows(cols, rows, action, rng, result):
+    if action == "tick":
+        stats, exp = TICK_DECAY, TICK_EXP
+    else:
+        stats, exp = ACTION_EFFECTS[action]
+    for stat, delta in stats.items():
+        _add(cols, stat, rows, delta)
+
+    # Level up: bisa naik beberapa level sekaligus, efeknya dikali jumlah level
+    total = cols["exp"][rows] + exp
+    gained = total // LEVEL_UP_EXP
+    cols["exp"][rows] = total % LEVEL_UP_EXP
+    cols["level"][rows] += gained.astype(cols["level"].dtype)
+    if gained.any():
+        for stat, delta in LEVEL_UP_BONUS.items():
+            _add(cols, stat, rows, gained * delta)
+        result["level_ups"] += int(gained.sum())
+
+    # Random event positif
+    chance = rng.integers(1, 101, size=rows.size)
+    bonus = BONUS_EVENTS.get(action)
+    if bonus is not None:
+        hit = rows[chance <= bonus.chance]
+        _add(cols, bonus.stat, hit, bonus.amount)
+        result["bonus"] += int(hit.size)
+
+    # Event negatif (kelaparan, ...)
+    for hazard in HAZARD_EVENTS:
+        exposed = rows[cols[hazard.field][rows] <= hazard.limit]
+        hit = exposed[rng.integers(1, 101, size=exposed.size) <= hazard.chance]
+        _add(cols, hazard.stat, hit, hazard.amount)
+        result[hazard.name] += int(hit.size)